@@ -0,0 +1,97 @@
+"""
+Relocation Benchmark
+Compare FileManager.relocate_file copies against shutil.copy2 for large files
+
+Usage:
+    python benchmarks/bench_relocate.py --size-mb 512 --source-dir /tmp --dest-dir /mnt/nfs/downloads
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from src.utils.file_manager import FileManager
+
+
+def _write_fixture(path, size_mb):
+    chunk = os.urandom(1024 * 1024)
+    with open(path, 'wb') as f:
+        for _ in range(size_mb):
+            f.write(chunk)
+
+
+def _force_cross_device(func):
+    """Run func with os.replace raising EXDEV for file moves, as on another filesystem."""
+    real_replace = os.replace
+
+    def fake_replace(src, dst):
+        if not str(src).endswith(".relocating"):
+            raise OSError(18, "Invalid cross-device link")
+        return real_replace(src, dst)
+
+    os.replace = fake_replace
+    try:
+        return func()
+    finally:
+        os.replace = real_replace
+
+
+def _copy2_and_unlink(source, destination):
+    shutil.copy2(source, destination)
+    with open(destination, 'rb+') as f:
+        os.fsync(f.fileno())
+    os.remove(source)
+
+
+def run(size_mb, source_dir, dest_dir, rounds):
+    results = {}
+    strategies = {
+        "relocate_file": lambda s, d: FileManager.relocate_file(s, d),
+        "shutil.copy2": _copy2_and_unlink,
+    }
+
+    for name, strategy in strategies.items():
+        timings = []
+        for _ in range(rounds):
+            source = Path(source_dir) / "bench_source.bin"
+            destination = Path(dest_dir) / "bench_dest.bin"
+            _write_fixture(source, size_mb)
+            try:
+                started = time.perf_counter()
+                _force_cross_device(lambda: strategy(source, destination))
+                timings.append(time.perf_counter() - started)
+            finally:
+                for leftover in (source, destination):
+                    if leftover.exists():
+                        leftover.unlink()
+        best = min(timings)
+        results[name] = {"best_s": best, "mb_per_s": size_mb / best if best else 0.0}
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=256)
+    parser.add_argument("--source-dir", default=None)
+    parser.add_argument("--dest-dir", default=None)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        source_dir = args.source_dir or scratch
+        dest_dir = args.dest_dir or scratch
+        results = run(args.size_mb, source_dir, dest_dir, args.rounds)
+
+    print(f"Relocating {args.size_mb} MB ({args.rounds} rounds, best of)")
+    for name, stats in results.items():
+        print(f"  {name:<15} {stats['best_s']:.3f}s  {stats['mb_per_s']:.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+Fake TikTok Server
+Local HTTP server that serves fixture media with configurable latency,
+bandwidth, error rate and 429 throttling
+"""
+
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+@dataclass
+class ServerProfile:
+    """Network conditions the fake server simulates"""
+
+    latency: float = 0.0          # Seconds before the first byte of every response
+    bandwidth: float = 0.0        # Bytes/s per connection (0 = unlimited)
+    error_rate: float = 0.0       # Fraction of requests answered with HTTP 500
+    throttle_rate: float = 0.0    # Fraction of requests answered with HTTP 429
+    media_size: int = 2 * 1024 * 1024  # Typical fixture video size in bytes
+    size_spread: float = 0.0      # Each video's size varies by up to this fraction of media_size
+    profile_videos: int = 20      # Number of videos each fake profile lists
+    seed: int = 1234
+
+
+class _FixtureStore:
+    """Deterministic pseudo-random media bytes, generated once per size"""
+
+    def __init__(self):
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def get(self, size):
+        with self._lock:
+            if size not in self._cache:
+                block = hashlib.sha256(str(size).encode()).digest() * 2048
+                repeats = size // len(block) + 1
+                self._cache[size] = (block * repeats)[:size]
+            return self._cache[size]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "FakeTikTok/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_HEAD(self):
+        self._handle(send_body=False)
+
+    def do_GET(self):
+        self._handle(send_body=True)
+
+    def _handle(self, send_body):
+        server = self.server
+        profile = server.profile
+        server.count("requests")
+
+        if profile.latency:
+            time.sleep(profile.latency)
+
+        roll = server.random()
+        if roll < profile.throttle_rate:
+            server.count("throttled")
+            self._send_status(429, {"Retry-After": "1"})
+            return
+        if roll < profile.throttle_rate + profile.error_rate:
+            server.count("errors")
+            self._send_status(500)
+            return
+
+        path = self.path.split("?")[0]
+        media = re.fullmatch(r"/media/(\d+)\.mp4", path)
+        video_match = re.fullmatch(r"/api/video/(\d+)", path)
+        profile_match = re.fullmatch(r"/api/profile/([^/]+)", path)
+        if media:
+            self._send_media(media.group(1), send_body)
+        elif video_match:
+            self._send_json({
+                "title": f"Fixture video {video_match.group(1)}",
+                **server.video_details(video_match.group(1)),
+            }, send_body)
+        elif profile_match:
+            username = profile_match.group(1)
+            videos = [server_video_id(username, index) for index in range(server.profile.profile_videos)]
+            self._send_json({
+                "username": username,
+                "videos": videos,
+                "details": [server.video_details(video_id) for video_id in videos],
+            }, send_body)
+        else:
+            self._send_status(404)
+
+    def _send_status(self, code, headers=None):
+        self.send_response(code)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _send_json(self, payload, send_body):
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _send_media(self, video_id, send_body):
+        data = self.server.fixtures.get(self.server.media_size_for(video_id))
+        start, end = 0, len(data) - 1
+        range_header = self.headers.get("Range")
+        status = 200
+        if range_header:
+            match = re.fullmatch(r"bytes=(\d*)-(\d*)", range_header.strip())
+            if match:
+                if match.group(1):
+                    start = int(match.group(1))
+                    end = int(match.group(2)) if match.group(2) else end
+                else:
+                    start = max(0, len(data) - int(match.group(2)))
+                end = min(end, len(data) - 1)
+                status = 206
+
+        self.send_response(status)
+        self.send_header("Content-Type", "video/mp4")
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", str(end - start + 1))
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+        self.end_headers()
+        if not send_body:
+            return
+
+        payload = memoryview(data)[start:end + 1]
+        chunk = 64 * 1024
+        bandwidth = self.server.profile.bandwidth
+        started = time.perf_counter()
+        sent = 0
+        try:
+            while sent < len(payload):
+                piece = payload[sent:sent + chunk]
+                self.wfile.write(piece)
+                sent += len(piece)
+                if bandwidth:
+                    ahead = sent / bandwidth - (time.perf_counter() - started)
+                    if ahead > 0:
+                        time.sleep(ahead)
+        except (BrokenPipeError, ConnectionResetError):
+            return
+        self.server.count("bytes_sent", sent)
+
+
+def server_video_id(username, index):
+    """Stable 19-digit video ID for the index-th video of a fake profile."""
+    digest = int(hashlib.sha1(f"{username}:{index}".encode()).hexdigest(), 16)
+    return str(7_000_000_000_000_000_000 + digest % 1_000_000_000_000_000_000)
+
+
+class FakeTikTokServer(ThreadingHTTPServer):
+    """Threaded fake CDN; use as a context manager to run it in the background"""
+
+    daemon_threads = True
+
+    def __init__(self, profile=None, host="127.0.0.1", port=0):
+        super().__init__((host, port), _Handler)
+        self.profile = profile or ServerProfile()
+        self.fixtures = _FixtureStore()
+        self.stats = {}
+        self._random = random.Random(self.profile.seed)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def media_size_for(self, video_id):
+        """Deterministic per-video size within media_size * (1 +/- size_spread)"""
+        spread = self.profile.size_spread
+        if not spread:
+            return self.profile.media_size
+        unit = int(hashlib.sha1(str(video_id).encode()).hexdigest()[:8], 16) / 0xFFFFFFFF
+        return max(1024, int(self.profile.media_size * (1 + spread * (2 * unit - 1))))
+
+    def video_details(self, video_id):
+        """Metadata the API reports for a video; duration scales with size"""
+        size = self.media_size_for(video_id)
+        return {
+            "id": str(video_id),
+            "filesize": size,
+            "duration": round(15 * size / self.profile.media_size, 1),
+        }
+
+    def random(self):
+        with self._lock:
+            return self._random.random()
+
+    def count(self, key, value=1):
+        with self._lock:
+            self.stats[key] = self.stats.get(key, 0) + value
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.serve_forever, name="FakeTikTokServer", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,330 @@
+"""
+Benchmark Runner
+Measure downloader throughput offline against the fake TikTok server
+
+Usage:
+    python benchmarks/run_benchmarks.py --scenario all --items 20 --latency 0.05 --bandwidth-mb 20
+    python benchmarks/run_benchmarks.py --scenario batch --error-rate 0.05 --throttle-rate 0.05
+    python benchmarks/run_benchmarks.py --scenario single --media-mb 8 --bandwidth-mb 4 --segments 4
+    python benchmarks/run_benchmarks.py --scenario batch --size-spread 0.9 --order shortest_first
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/20240101_120000.json
+
+Results are stored as JSON in benchmarks/results/ for later comparison.
+"""
+
+import argparse
+import json
+import math
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+ROOT_DIR = BENCH_DIR.parent
+RESULTS_DIR = BENCH_DIR / "results"
+
+sys.path.insert(0, str(ROOT_DIR))
+
+
+def percentile(samples, percent):
+    """Nearest-rank percentile (0.0 for no samples)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, math.ceil(percent / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def summarise(scenario, latencies, succeeded, failed, elapsed, bytes_done, server, stages):
+    items = succeeded + failed
+    return {
+        "scenario": scenario,
+        "items": items,
+        "succeeded": succeeded,
+        "failed": failed,
+        "elapsed_s": elapsed,
+        "items_per_s": items / elapsed if elapsed else 0.0,
+        "mb_per_s": bytes_done / (1024 * 1024) / elapsed if elapsed else 0.0,
+        "latency_s": {
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+        },
+        "server": dict(server.stats),
+        "stages": stages,
+    }
+
+
+def video_urls(count, username="bench_user"):
+    from benchmarks.fake_server import server_video_id
+    return [
+        f"https://www.tiktok.com/@{username}/video/{server_video_id(username, index)}"
+        for index in range(count)
+    ]
+
+
+def run_single(context, items):
+    """Independent single-video downloads, as from the main window."""
+    from src.utils.timing import collect_stages
+
+    downloader = context["downloader"]
+    latencies, succeeded, failed, bytes_done = [], 0, 0, 0
+    started = time.perf_counter()
+    with collect_stages() as timer:
+        for url in video_urls(items, "single_user"):
+            item_started = time.perf_counter()
+            result = downloader.download_video(url, source="benchmark")
+            latencies.append(time.perf_counter() - item_started)
+            if result["success"]:
+                succeeded += 1
+                bytes_done += os.path.getsize(result["path"])
+            else:
+                failed += 1
+    return latencies, succeeded, failed, time.perf_counter() - started, bytes_done, timer.stats()
+
+
+def run_batch(context, items):
+    """
+    A mixed batch on BatchRunner: one profile task followed by loose links.
+
+    Latency here is the time from batch start until each loose link is done,
+    which is what fair-share scheduling is meant to keep low.
+    """
+    from src.core.app_models import BatchTask
+    from src.core.batch_runner import EVENT_ITEM_FINISHED, EVENT_TASK_FINISHED, BatchRunner
+    from src.utils.timing import collect_stages
+
+    link_count = max(1, items // 4)
+    tasks = [BatchTask(url="https://www.tiktok.com/@batch_profile", task_type="profile")]
+    tasks += [BatchTask(url=url, task_type="video") for url in video_urls(link_count, "batch_user")]
+    latencies, counts = [], {"bytes": 0}
+    lock = threading.Lock()
+
+    def on_event(event, outcome, result):
+        with lock:
+            if event == EVENT_ITEM_FINISHED and result.get("success"):
+                counts["bytes"] += os.path.getsize(result["path"])
+            elif event == EVENT_TASK_FINISHED and outcome.task.task_type == "video":
+                latencies.append(time.perf_counter() - started)
+
+    runner = BatchRunner(context["downloader"], context["scraper"], context["config"])
+    started = time.perf_counter()
+    with collect_stages() as timer:
+        outcomes = runner.run(tasks, profile_limit=items - link_count, skip_existing=False, on_event=on_event)
+    elapsed = time.perf_counter() - started
+    context["completion_curve"] = runner.completion_curve
+    succeeded = sum(outcome.downloaded for outcome in outcomes)
+    failed = sum(outcome.failed for outcome in outcomes)
+    return latencies, succeeded, failed, elapsed, counts["bytes"], timer.stats()
+
+
+def run_profile(context, items):
+    """One profile download through ProfileScraper."""
+    from src.utils.timing import collect_stages
+
+    scraper = context["scraper"]
+    latencies = []
+    marks = {"last": None}
+
+    def on_progress(message=None, current=None, total=None, video_name=None, status=None):
+        now = time.perf_counter()
+        if status == "downloading":
+            marks["last"] = now
+        elif status in {"success", "failed", "error"} and marks["last"] is not None:
+            latencies.append(now - marks["last"])
+
+    started = time.perf_counter()
+    with collect_stages() as timer:
+        result = scraper.download_from_profile(
+            "https://www.tiktok.com/@profile_user",
+            limit=items,
+            skip_existing=False,
+            progress_callback=on_progress,
+        )
+    elapsed = time.perf_counter() - started
+    output = Path(result["output_path"])
+    bytes_done = sum(f.stat().st_size for f in output.rglob("*.mp4"))
+    return latencies, result["downloaded"], result["failed"], elapsed, bytes_done, timer.stats()
+
+
+SCENARIOS = {
+    "single": run_single,
+    "batch": run_batch,
+    "profile": run_profile,
+}
+
+
+def run(args):
+    scratch = Path(tempfile.mkdtemp(prefix="tiktok-bench-"))
+    # Must be set before anything imports config.
+    os.environ["TIKTOK_DL_DATA_DIR"] = str(scratch / "data")
+
+    from benchmarks.fake_server import FakeTikTokServer, ServerProfile
+    from benchmarks.stub_extractor import make_stub_extractors
+    from src.core.downloader import TikTokDownloader
+    from src.core.media_backend import create_backend
+    from src.core.profile_scraper import ProfileScraper
+    from src.utils.config_manager import ConfigManager
+
+    conditions = ServerProfile(
+        latency=args.latency,
+        bandwidth=args.bandwidth_mb * 1024 * 1024,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        media_size=int(args.media_mb * 1024 * 1024),
+        size_spread=args.size_spread,
+        profile_videos=args.items,
+    )
+
+    ConfigManager().update_settings({
+        "download_path": str(scratch / "downloads"),
+        "save_history": True,
+        "metrics_export": False,
+        "auto_update_ytdlp": False,
+        "segmented_download": args.segments > 1,
+        "segment_connections": args.segments,
+        "segment_min_mb": args.segment_min_mb,
+        "bandwidth_limit_kb": int(args.cap_mb * 1024),
+        "max_concurrent_downloads": args.workers,
+        "batch_order": args.order,
+        "adaptive_concurrency": args.adaptive,
+        "concurrency_max": args.max_workers,
+        "per_profile_concurrency": args.per_profile,
+        "prefetch_window": args.prefetch,
+    })
+
+    scenarios = list(SCENARIOS) if args.scenario == "all" else [args.scenario]
+    results = []
+    try:
+        for name in scenarios:
+            with FakeTikTokServer(conditions) as server:
+                # Registered backends must accept info_extractors to run offline
+                backend = create_backend(
+                    args.backend,
+                    info_extractors=make_stub_extractors(server.base_url),
+                    config=ConfigManager(),
+                )
+                context = {
+                    "downloader": TikTokDownloader(backend=backend),
+                    "scraper": ProfileScraper(backend=backend),
+                    "config": ConfigManager(),
+                }
+                latencies, succeeded, failed, elapsed, bytes_done, stages = SCENARIOS[name](context, args.items)
+                result = summarise(name, latencies, succeeded, failed, elapsed, bytes_done, server, stages)
+                curve = context.get("completion_curve")
+                if curve:
+                    # Mean time to finish a video is what shortest-first minimises
+                    result["mean_completion_s"] = round(sum(point[0] for point in curve) / len(curve), 4)
+                    result["completion_curve"] = [
+                        {"t": round(t, 4), "items": done, "expected_bytes": expected, "actual_bytes": actual}
+                        for t, done, expected, actual in curve
+                    ]
+                results.append(result)
+            shutil.rmtree(scratch / "downloads", ignore_errors=True)
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "label": args.label,
+        "backend": args.backend,
+        "segments": args.segments,
+        "cap_mb": args.cap_mb,
+        "workers": args.workers,
+        "order": args.order,
+        "adaptive": args.adaptive,
+        "prefetch": args.prefetch,
+        "conditions": asdict(conditions),
+        "results": results,
+    }
+
+
+def print_report(report):
+    print(
+        f"Backend: {report.get('backend', 'yt-dlp')}  Segments: {report.get('segments', 1)}"
+        f"  Order: {report.get('order', 'fifo')}"
+    )
+    print(f"Conditions: {report['conditions']}")
+    print(f"{'scenario':<10}{'ok/total':>10}{'items/s':>10}{'MB/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for result in report["results"]:
+        latency = result["latency_s"]
+        print(
+            f"{result['scenario']:<10}{result['succeeded']:>5}/{result['items']:<4}"
+            f"{result['items_per_s']:>10.2f}{result['mb_per_s']:>9.2f}"
+            f"{latency['p50']:>8.3f}s{latency['p95']:>8.3f}s{latency['p99']:>8.3f}s"
+        )
+        if "mean_completion_s" in result:
+            print(f"{'':<10}mean video completion {result['mean_completion_s']:.3f}s")
+
+
+def print_comparison(baseline, current):
+    baseline_results = {r["scenario"]: r for r in baseline["results"]}
+    print(f"\nCompared with {baseline.get('label') or baseline['timestamp']}:")
+    for result in current["results"]:
+        before = baseline_results.get(result["scenario"])
+        if not before:
+            continue
+        for key in ("items_per_s", "mb_per_s"):
+            old, new = before[key], result[key]
+            change = (new - old) / old * 100 if old else 0.0
+            print(f"  {result['scenario']:<10}{key:<12}{old:>9.2f} -> {new:>9.2f} ({change:+.1f}%)")
+        old_p95, new_p95 = before["latency_s"]["p95"], result["latency_s"]["p95"]
+        print(f"  {result['scenario']:<10}{'p95 latency':<12}{old_p95:>8.3f}s -> {new_p95:>8.3f}s")
+        if "mean_completion_s" in before and "mean_completion_s" in result:
+            old_mean, new_mean = before["mean_completion_s"], result["mean_completion_s"]
+            print(f"  {result['scenario']:<10}{'mean done':<12}{old_mean:>8.3f}s -> {new_mean:>8.3f}s")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices=["all", *SCENARIOS], default="all")
+    parser.add_argument("--backend", default="yt-dlp", help="Registered media backend to measure")
+    parser.add_argument("--segments", type=int, default=1, help="Parallel Range connections per file (1 = off)")
+    parser.add_argument("--segment-min-mb", type=float, default=1.0, help="Segment files at least this large")
+    parser.add_argument("--cap-mb", type=float, default=0.0, help="Global bandwidth cap in MB/s (0 = unlimited)")
+    parser.add_argument("--workers", type=int, default=2, help="Concurrent downloads (scheduler slots)")
+    parser.add_argument("--adaptive", action="store_true", help="Let the AIMD controller pick the worker count")
+    parser.add_argument("--max-workers", type=int, default=6, help="Adaptive concurrency ceiling")
+    parser.add_argument("--per-profile", type=int, default=1, help="Batch downloads per creator (0 = no cap)")
+    parser.add_argument("--prefetch", type=int, default=4, help="Metadata lookahead window (0 = off)")
+    parser.add_argument("--order", choices=["fifo", "shortest_first"], default="fifo", help="Batch queue order")
+    parser.add_argument("--items", type=int, default=20)
+    parser.add_argument("--media-mb", type=float, default=2.0, help="Size of each fixture video")
+    parser.add_argument("--size-spread", type=float, default=0.0,
+                        help="Vary video sizes by up to this fraction of --media-mb")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds before every response")
+    parser.add_argument("--bandwidth-mb", type=float, default=0.0, help="MB/s per connection (0 = unlimited)")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of 429 responses")
+    parser.add_argument("--label", default="", help="Name stored with the results")
+    parser.add_argument("--compare", help="Previous results file to compare against")
+    parser.add_argument("--no-save", action="store_true", help="Do not write a results file")
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+
+    report = run(args)
+    print_report(report)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            print_comparison(json.load(f), report)
+
+    if not args.no_save:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        path = RESULTS_DIR / f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Stub Extractor
+yt-dlp extractors that resolve TikTok URLs against the local fake server
+"""
+
+from yt_dlp.extractor.common import InfoExtractor
+
+
+def make_stub_extractors(base_url):
+    """
+    Build extractor classes bound to a fake server
+
+    Args:
+        base_url: Base URL of a running FakeTikTokServer
+
+    Returns:
+        list: Extractor classes for YtDlpBackend(info_extractors=...)
+    """
+
+    class StubTikTokVideoIE(InfoExtractor):
+        IE_NAME = "stub:tiktok"
+        _VALID_URL = r'https?://(?:www\.)?tiktok\.com/@(?P<user>[\w.-]+)/video/(?P<id>\d+)'
+
+        def _real_extract(self, url):
+            user, video_id = self._match_valid_url(url).group('user', 'id')
+            meta = self._download_json(f"{base_url}/api/video/{video_id}", video_id, note=False)
+            return {
+                'id': video_id,
+                'title': meta.get('title') or video_id,
+                'url': f"{base_url}/media/{video_id}.mp4",
+                'ext': 'mp4',
+                'uploader_id': user,
+                'upload_date': '20240101',
+                'duration': meta.get('duration'),
+                'filesize': meta.get('filesize'),
+            }
+
+    class StubTikTokUserIE(InfoExtractor):
+        IE_NAME = "stub:tiktok:user"
+        _VALID_URL = r'https?://(?:www\.)?tiktok\.com/@(?P<user>[\w.-]+)/?(?:[?#].*)?$'
+
+        def _real_extract(self, url):
+            user = self._match_valid_url(url).group('user')
+            listing = self._download_json(f"{base_url}/api/profile/{user}", user, note=False)
+            details = {item['id']: item for item in listing.get('details', [])}
+            entries = [
+                self.url_result(
+                    f"https://www.tiktok.com/@{user}/video/{video_id}",
+                    ie=StubTikTokVideoIE.ie_key(),
+                    video_id=video_id,
+                    # Flat entries carry size hints like the real profile listing
+                    duration=details.get(video_id, {}).get('duration'),
+                    filesize_approx=details.get(video_id, {}).get('filesize'),
+                )
+                for video_id in listing.get('videos', [])
+            ]
+            return self.playlist_result(entries, user, user)
+
+    return [StubTikTokVideoIE, StubTikTokUserIE]
@@ -13,18 +13,24 @@ APP_AUTHOR = "Your Name"
 # Paths
 BASE_DIR = Path(__file__).parent
 SRC_DIR = BASE_DIR / "src"
-DATA_DIR = BASE_DIR / "data"
+# TIKTOK_DL_DATA_DIR lets benchmarks and tests run against an isolated data folder.
+DATA_DIR = Path(os.environ.get("TIKTOK_DL_DATA_DIR") or BASE_DIR / "data")
 ASSETS_DIR = BASE_DIR / "assets"
 DOWNLOADS_DIR = BASE_DIR / "downloads"
 
 # Ensure directories exist
-DATA_DIR.mkdir(exist_ok=True)
+DATA_DIR.mkdir(parents=True, exist_ok=True)
 DOWNLOADS_DIR.mkdir(exist_ok=True)
 
 # Files
 HISTORY_FILE = DATA_DIR / "history.json"
 SETTINGS_FILE = DATA_DIR / "settings.json"
 LOG_FILE = DATA_DIR / "app.log"
+LIBRARY_INDEX_FILE = DATA_DIR / "library_index.json"
+FAILED_DOWNLOADS_FILE = DATA_DIR / "failed_downloads.json"
+METRICS_DIR = DATA_DIR / "metrics"
+TRACES_DIR = DATA_DIR / "traces"
+PROFILES_DIR = DATA_DIR / "profiles"
 
 # Theme Colors
 DARK_THEME = {
@@ -91,6 +97,10 @@ FONTS = {
     "emoji_large": ("Segoe UI Emoji", 20),
 }
 
+# Output filename template (yt-dlp syntax). The video id keeps names unique and
+# lets the library scanner map files back to videos without a database.
+DEFAULT_FILENAME_TEMPLATE = "%(upload_date)s_%(id)s_%(title).80s.%(ext)s"
+
 # Download Settings
 DEFAULT_SETTINGS = {
     "language": "en",
@@ -102,12 +112,46 @@ DEFAULT_SETTINGS = {
     "profile_video_limit": 10,  # Default limit for profile downloads
     "convert_to_mp3": False,  # Default MP3 conversion setting
     "create_profile_folders": True,
+    "filename_template": DEFAULT_FILENAME_TEMPLATE,
+    "dedupe_on_download": False,  # Hardlink byte-identical copies after each download
+    "metrics_export": False,  # Opt-in: write Prometheus textfile + JSON snapshot during runs
+    "metrics_interval_seconds": 15,
+    "metrics_textfile_path": "",  # Empty = data/metrics/tiktok_downloader.prom
+    "metrics_json_path": "",  # Empty = data/metrics/metrics.json
+    "trace_runs": False,  # Write a Chrome trace per batch/profile run (or set TIKTOK_DL_TRACE=1)
+    "profile_runs": False,  # cProfile + tracemalloc per batch/profile run (or set TIKTOK_DL_PROFILE=1)
+    "profile_snapshot_every": 50,  # Items between tracemalloc snapshots
+    "log_format": "text",  # "text" or "json" (JSON lines) for data/app.log
+    "log_max_mb": 5,  # Rotate app.log at this size
+    "log_backup_count": 5,  # Rotated log files to keep
+    "media_backend": "yt-dlp",  # Download engine, see src/core/media_backend.py
+    "segmented_download": False,  # Fetch large files over parallel HTTP Range requests
+    "segment_connections": 4,  # Parallel ranges per file
+    "segment_min_mb": 16,  # Only segment files at least this large
+    "max_concurrent_downloads": 2,  # Scheduler slots shared by single, batch and profile downloads
+    "adaptive_concurrency": False,  # Tune the slot count from latency and 429s/timeouts (AIMD)
+    "concurrency_min": 1,  # Fewest slots the adaptive controller may use
+    "concurrency_max": 6,  # Most slots the adaptive controller may use
+    "per_profile_concurrency": 1,  # Batch downloads in flight per creator (0 = no cap)
+    "retry_attempts": 3,  # Retries for transient/throttled batch failures, run after the queue drains
+    "retry_base_delay": 2.0,  # Seconds before the first retry; doubles per attempt, with jitter
+    "skip_known_failures": True,  # Skip videos an earlier run found removed, private or geo-blocked
+    "breaker_threshold": 5,  # Identical extractor errors in a row that pause downloads (0 = off)
+    "breaker_probe_interval": 60,  # Seconds between probe downloads while paused
+    "breaker_auto_update": False,  # Run the yt-dlp updater when the breaker trips
+    "prefetch_window": 4,  # Upcoming batch/profile videos whose metadata is resolved ahead (0 = off)
+    "progress_tick_ms": 33,  # How often the GUI applies queued progress updates (~30 Hz)
+    "progress_log_lines": 1000,  # Lines kept in the profile window's progress log
+    "manager_keep_finished": 500,  # Finished downloads still listed in the download manager
+    "batch_order": "fifo",  # Batch queue order: "fifo" (fair share, listing order) or "shortest_first"
+    "bandwidth_limit_kb": 0,  # Total KB/s across all downloads (0 = unlimited)
+    "bandwidth_schedule": [],  # [{"start": "09:00", "end": "18:00", "limit_kb": 512}], first match wins
 }
 
 # yt-dlp Options
 YTDLP_OPTIONS = {
     'format': 'best',
-    'outtmpl': '%(title)s.%(ext)s',
+    'outtmpl': DEFAULT_FILENAME_TEMPLATE,
     'quiet': True,  # Suppress verbose output
     'no_warnings': True,  # Suppress warnings
     'extract_flat': False,
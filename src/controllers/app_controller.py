@@ -8,12 +8,18 @@ from src.core.app_models import (
     BatchImportResult,
     BatchPreparationResult,
     BatchTask,
+    DedupeResult,
+    LibraryRescanResult,
     UrlAnalysis,
 )
+from src.core.deduplicator import Deduplicator
 from src.core.downloader import TikTokDownloader
+from src.core.library import LibraryScanner
 from src.core.profile_scraper import ProfileScraper
+from src.core.scheduler import get_scheduler
 from src.utils.config_manager import ConfigManager
 from src.utils.logger import get_logger
+from src.utils.timing import get_stage_stats
 from src.utils.validators import is_valid_profile_url, is_valid_tiktok_url, is_valid_video_url
 
 
@@ -151,6 +157,47 @@ class AppController:
 
         return kept, skipped
 
+    def rescan_library(self, force: bool = False) -> LibraryRescanResult:
+        """Rebuild the library index from the download folder and reconcile history."""
+        result = LibraryScanner(self.config).rescan(force=force)
+        self.logger.info(
+            "Library rescan: %s scanned, %s unchanged, %s files, +%s/-%s videos, "
+            "%s history relinked, %s missing (%.2fs)",
+            result.directories_scanned,
+            result.directories_skipped,
+            result.files_indexed,
+            result.added,
+            result.removed,
+            result.history_relinked,
+            result.history_missing,
+            result.elapsed,
+        )
+        return result
+
+    def dedupe_library(self, dry_run: bool = False) -> DedupeResult:
+        """Hardlink byte-identical downloads together and report reclaimed space."""
+        result = Deduplicator(self.config).dedupe(dry_run=dry_run)
+        self.logger.info(
+            "Dedupe%s: %s files, %s hashed, %s groups, %s linked, %.1f MB reclaimed",
+            " (dry run)" if dry_run else "",
+            result.files_considered,
+            result.files_hashed,
+            result.duplicate_groups,
+            result.files_linked,
+            result.bytes_reclaimed / (1024 * 1024),
+        )
+        for error in result.errors:
+            self.logger.warning(f"Dedupe error: {error}")
+        return result
+
+    def get_stage_stats(self) -> dict[str, dict[str, float]]:
+        """Return cumulative per-stage timing percentiles for this process."""
+        return get_stage_stats()
+
+    def get_queue_wait_stats(self) -> dict[str, dict[str, float]]:
+        """Return scheduler wait-time percentiles per priority class."""
+        return get_scheduler().wait_stats()
+
     def safe_int(self, value, default: int = 0) -> int:
         """Convert a value to int without raising."""
         try:
@@ -48,3 +48,94 @@ class BatchPreparationResult:
     ignored_links: list[str] = field(default_factory=list)
     duplicate_links: list[str] = field(default_factory=list)
     skipped_due_to_limit: list[BatchTask] = field(default_factory=list)
+
+
+@dataclass
+class BatchTaskOutcome:
+    """Running tally for one batch task: a single link or a whole profile."""
+
+    index: int
+    task: BatchTask
+    total: int = 0
+    downloaded: int = 0
+    failed: int = 0
+    skipped: int = 0
+    retried: int = 0
+    title: str = ""
+    error: str | None = None
+    error_class: str | None = None
+    finished: bool = False
+
+    @property
+    def success(self) -> bool:
+        if self.error is not None:
+            return False
+        if self.task.task_type == "profile":
+            return True
+        return self.downloaded > 0
+
+
+@dataclass
+class LibraryRescanResult:
+    """Summary of a library rescan and its reconciliation with history."""
+
+    directories_scanned: int = 0
+    directories_skipped: int = 0
+    files_indexed: int = 0
+    added: int = 0
+    removed: int = 0
+    history_relinked: int = 0
+    history_missing: int = 0
+    elapsed: float = 0.0
+
+
+@dataclass
+class DedupeResult:
+    """Summary of a duplicate-collapsing pass over the download folder."""
+
+    files_considered: int = 0
+    files_hashed: int = 0
+    duplicate_groups: int = 0
+    files_linked: int = 0
+    bytes_reclaimed: int = 0
+    errors: list[str] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class DownloadProgress:
+    """Byte-level progress event for a single download."""
+
+    task_id: str
+    stage: str
+    bytes_done: int = 0
+    bytes_total: int | None = None
+    speed: float | None = None
+    smoothed_speed: float | None = None
+    eta: float | None = None
+    filename: str = ""
+
+    @property
+    def fraction(self) -> float | None:
+        if not self.bytes_total:
+            return None
+        return min(1.0, self.bytes_done / self.bytes_total)
+
+
+@dataclass(frozen=True)
+class TaskProgress:
+    """State of one queued or running download, as listed by the download manager."""
+
+    task_id: str
+    title: str = ""
+    stage: str = "queued"
+    bytes_done: int = 0
+    bytes_total: int | None = None
+    speed: float | None = None
+    eta: float | None = None
+    error: str = ""
+
+    @property
+    def fraction(self) -> float | None:
+        if not self.bytes_total:
+            return None
+        return min(1.0, self.bytes_done / self.bytes_total)
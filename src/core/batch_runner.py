@@ -0,0 +1,662 @@
+"""
+Batch Runner
+Run mixed batches of links and profiles on a worker pool with fair-share scheduling
+"""
+
+import contextvars
+import heapq
+import itertools
+import os
+import re
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from src.core.app_models import BatchTaskOutcome
+from src.core.circuit_breaker import CircuitBreaker, update_ytdlp_if_enabled
+from src.core.failures import ERROR_EXTRACTOR, RETRYABLE_ERRORS, classify_error, get_failure_store, retry_delay
+from src.core.library import extract_video_id_from_url
+from src.core.prefetch import DEFAULT_PREFETCH_WINDOW, MetadataPrefetcher
+from src.core.progress_model import get_progress_model
+from src.core.scheduler import PRIORITY_BATCH
+from src.utils.logger import get_logger
+from src.utils.metrics import get_metrics
+from src.utils.profiling import profile_thread
+
+LINKS_FLOW = "links"
+RETRY_FLOW = "retry"
+
+# Queue orders ("batch_order" setting)
+ORDER_FIFO = "fifo"
+ORDER_SHORTEST_FIRST = "shortest_first"
+
+# Size guesses for items without a filesize hint
+ASSUMED_BYTES_PER_SECOND = 200 * 1024
+DEFAULT_EXPECTED_BYTES = 4 * 1024 * 1024
+
+EVENT_ITEM_FINISHED = "item_finished"
+EVENT_TASK_FINISHED = "task_finished"
+# Sent with outcome None; the result dict carries the error signature
+EVENT_BREAKER_OPEN = "breaker_open"
+EVENT_BREAKER_CLOSED = "breaker_closed"
+
+
+def expected_bytes(video):
+    """
+    Estimate a video's download size from its listing metadata
+
+    Args:
+        video: Dict with optional "filesize_approx" and "duration"
+
+    Returns:
+        int: filesize_approx if known, else duration at an assumed bitrate,
+            else DEFAULT_EXPECTED_BYTES
+    """
+    size = video.get("filesize_approx")
+    if size:
+        return int(size)
+    duration = video.get("duration")
+    if duration:
+        return int(float(duration) * ASSUMED_BYTES_PER_SECOND)
+    return DEFAULT_EXPECTED_BYTES
+
+
+class FairQueue:
+    """
+    Deficit round-robin over named flows, with a per-creator concurrency cap.
+
+    Every flow (one per profile, one for loose links) gets ``quantum`` credit
+    per round and spends each item's cost from it, so a 3,000-video profile
+    and a handful of single links take turns instead of running in order.
+    Items whose creator already has ``per_creator_limit`` downloads in flight
+    are passed over until one finishes.
+
+    With ``order=ORDER_SHORTEST_FIRST`` each flow is kept sorted by cost and
+    the cheapest eligible head across all flows runs next, trading fairness
+    for the most finished items per unit of time.
+    """
+
+    def __init__(self, quantum=1.0, per_creator_limit=0, order=ORDER_FIFO):
+        """
+        Args:
+            quantum: Credit added to a flow on each visit
+            per_creator_limit: Max in-flight items per creator (0 = no cap)
+            order: ORDER_FIFO (deficit round-robin) or ORDER_SHORTEST_FIRST
+        """
+        self.quantum = quantum
+        self.per_creator_limit = per_creator_limit
+        self.shortest_first = order == ORDER_SHORTEST_FIRST
+        self._sequence = itertools.count()
+        self._flows = {}
+        self._deficits = {}
+        self._order = []
+        self._cursor = 0
+        self._fresh_visit = True
+        self._in_flight = {}
+        self._creator_active = {}
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def put(self, flow, item, creator=None, cost=1.0):
+        """
+        Queue an item at the back of a flow
+
+        Args:
+            flow: Flow name
+            item: Work item
+            creator: Profile the item belongs to, for the concurrency cap
+            cost: Credit the item consumes when served (expected size when
+                ordering shortest first)
+        """
+        with self._condition:
+            if self._closed:
+                return
+            if flow not in self._flows:
+                self._flows[flow] = [] if self.shortest_first else deque()
+                self._deficits[flow] = 0.0
+            if not self._flows[flow]:
+                self._order.append(flow)
+            entry = (item, creator, cost)
+            if self.shortest_first:
+                heapq.heappush(self._flows[flow], (cost, next(self._sequence), entry))
+            else:
+                self._flows[flow].append(entry)
+            self._condition.notify_all()
+
+    def get(self):
+        """
+        Block until an item may run
+
+        Returns:
+            The next item, or None once the queue is drained (nothing pending
+            or in flight) or closed
+        """
+        with self._condition:
+            while True:
+                if self._closed:
+                    return None
+                entry = self._select()
+                if entry is not None:
+                    item, creator, _cost = entry
+                    self._in_flight[id(item)] = creator
+                    if creator is not None:
+                        self._creator_active[creator] = self._creator_active.get(creator, 0) + 1
+                    return item
+                if not self._order and not self._in_flight:
+                    # In-flight items may still add work, so only stop when both are empty
+                    self._condition.notify_all()
+                    return None
+                self._condition.wait()
+
+    def task_done(self, item):
+        """Mark an item returned by get() as finished"""
+        with self._condition:
+            creator = self._in_flight.pop(id(item), None)
+            if creator is not None:
+                self._creator_active[creator] -= 1
+            self._condition.notify_all()
+
+    def close(self):
+        """Drop everything still queued and release waiting workers"""
+        with self._condition:
+            self._closed = True
+            self._flows.clear()
+            self._order.clear()
+            self._condition.notify_all()
+
+    def pending(self):
+        """Return the number of queued items"""
+        with self._condition:
+            return sum(len(flow) for flow in self._flows.values())
+
+    def peek(self, count):
+        """
+        Return up to ``count`` queued items in roughly the order get() will serve them
+
+        Per-creator caps are ignored, so this is a forecast for lookahead work,
+        not a promise.
+        """
+        with self._condition:
+            if self.shortest_first:
+                entries = heapq.nsmallest(count, itertools.chain.from_iterable(self._flows.values()))
+                return [entry[2][0] for entry in entries]
+            # Round-robin across flows starting from the one served next
+            flows = self._order[self._cursor:] + self._order[:self._cursor]
+            iterators = [iter(self._flows[flow]) for flow in flows]
+            items = []
+            while iterators and len(items) < count:
+                for iterator in list(iterators):
+                    entry = next(iterator, None)
+                    if entry is None:
+                        iterators.remove(iterator)
+                    elif len(items) < count:
+                        items.append(entry[0])
+            return items
+
+    def _eligible(self, entry):
+        _item, creator, _cost = entry
+        if not self.per_creator_limit or creator is None:
+            return True
+        return self._creator_active.get(creator, 0) < self.per_creator_limit
+
+    def _head(self, flow):
+        queue = self._flows[flow]
+        return queue[0][2] if self.shortest_first else queue[0]
+
+    def _pop(self, flow):
+        queue = self._flows[flow]
+        return heapq.heappop(queue)[2] if self.shortest_first else queue.popleft()
+
+    def _select(self):
+        """Pick the next entry; None if every head is blocked"""
+        if not any(self._eligible(self._head(flow)) for flow in self._order):
+            return None
+        if self.shortest_first:
+            return self._select_shortest()
+        return self._select_round_robin()
+
+    def _select_shortest(self):
+        eligible = [flow for flow in self._order if self._eligible(self._head(flow))]
+        flow = min(eligible, key=lambda name: self._head(name)[2])
+        entry = self._pop(flow)
+        if not self._flows[flow]:
+            self._order.remove(flow)
+        return entry
+
+    def _select_round_robin(self):
+        """Deficit round-robin between flows"""
+        while True:
+            self._cursor %= len(self._order)
+            flow = self._order[self._cursor]
+            queue = self._flows[flow]
+            entry = queue[0]
+            if not self._eligible(entry):
+                # Blocked flows do not bank credit while they wait
+                self._deficits[flow] = 0.0
+            else:
+                if self._fresh_visit:
+                    self._deficits[flow] += self.quantum
+                    self._fresh_visit = False
+                if entry[2] <= self._deficits[flow]:
+                    queue.popleft()
+                    self._deficits[flow] -= entry[2]
+                    if not queue:
+                        self._deficits[flow] = 0.0
+                        self._order.pop(self._cursor)
+                        self._fresh_visit = True
+                    return entry
+            self._cursor += 1
+            self._fresh_visit = True
+
+
+@dataclass
+class _WorkItem:
+    outcome: BatchTaskOutcome
+    url: str
+    kind: str
+    output_path: str | None = None
+    source: str = "batch"
+    expected_bytes: int = DEFAULT_EXPECTED_BYTES
+    attempt: int = 0
+    last_error: str | None = None
+
+
+class BatchRunner:
+    """Download a batch of links and profiles across a pool of workers"""
+
+    def __init__(self, downloader, profile_scraper, config, workers=None, per_profile_limit=None, order=None,
+                 prefetch_window=None):
+        """
+        Args:
+            downloader: TikTokDownloader used for every video
+            profile_scraper: ProfileScraper used to enumerate profile tasks
+            config: ConfigManager
+            workers: Worker threads (defaults to "max_concurrent_downloads", or
+                "concurrency_max" with adaptive concurrency)
+            per_profile_limit: Concurrent downloads per creator (defaults to
+                "per_profile_concurrency"; 0 = no cap)
+            order: ORDER_FIFO or ORDER_SHORTEST_FIRST (defaults to "batch_order")
+            prefetch_window: Queued videos whose metadata is resolved ahead
+                (defaults to "prefetch_window"; 0 = off)
+        """
+        self.downloader = downloader
+        self.profile_scraper = profile_scraper
+        self.config = config
+        self.workers = workers or self._default_workers(config)
+        if per_profile_limit is None:
+            per_profile_limit = int(config.get_setting("per_profile_concurrency", 1) or 0)
+        self.per_profile_limit = per_profile_limit
+        order = order or config.get_setting("batch_order", ORDER_FIFO)
+        self.order = order if order in (ORDER_FIFO, ORDER_SHORTEST_FIRST) else ORDER_FIFO
+        if prefetch_window is None:
+            prefetch_window = int(config.get_setting("prefetch_window", DEFAULT_PREFETCH_WINDOW) or 0)
+        self.prefetch_window = prefetch_window
+        # (seconds, items done, expected bytes done, actual bytes done) per finished video
+        self.completion_curve = []
+        self.logger = get_logger("BatchRunner")
+
+    def run(self, tasks, convert_to_mp3=False, create_folders=True, profile_limit=0, skip_existing=True,
+            on_event=None, byte_progress_callback=None, stop_check=None, cancel_token=None):
+        """
+        Run every task to completion
+
+        Profile tasks are enumerated by the first worker that reaches them and
+        their videos join the profile's own flow, so they interleave with the
+        loose links and other profiles. In shortest-first order the smallest
+        expected video runs next instead; the completion curve of either
+        order is kept in ``completion_curve``. Metadata for the next
+        ``prefetch_window`` queued videos is extracted while earlier transfers
+        run, so extraction stays off each item's critical path.
+
+        Transient and throttled failures are retried with jittered exponential
+        backoff once the queue drains; videos recorded as removed or private
+        by an earlier run are skipped. A run of identical extractor errors
+        trips the circuit breaker, which holds the queue until a probe
+        download succeeds. Queued videos are listed in the shared progress
+        model; those still queued when the run stops are withdrawn from it.
+
+        Args:
+            tasks: BatchTask list
+            convert_to_mp3: Convert videos to MP3
+            create_folders: Use @username folders for profile tasks
+            profile_limit: Videos per profile (0 = all)
+            skip_existing: Skip profile videos already in the library
+            on_event: Called with (event, outcome, result) from worker threads;
+                breaker events pass outcome None
+            byte_progress_callback: Called with (outcome, DownloadProgress)
+            stop_check: Function that returns True to stop after in-flight items
+            cancel_token: CancellationToken; cancelling aborts in-flight
+                transfers too, and pausing holds workers mid-transfer
+
+        Returns:
+            list: BatchTaskOutcome per task, in task order
+        """
+        queue = FairQueue(per_creator_limit=self.per_profile_limit, order=self.order)
+        self.completion_curve = []
+        outcomes = [BatchTaskOutcome(index=index, task=task) for index, task in enumerate(tasks, start=1)]
+        state = {
+            "lock": threading.Lock(),
+            "pending": {outcome.index: 0 for outcome in outcomes},
+            "options": {
+                "convert_to_mp3": convert_to_mp3,
+                "create_folders": create_folders,
+                "profile_limit": profile_limit,
+                "skip_existing": skip_existing,
+            },
+            "on_event": on_event,
+            "byte_progress_callback": byte_progress_callback,
+            "started": time.perf_counter(),
+            "expected_done": 0,
+            "actual_done": 0,
+            # (due time, item) for failures worth another attempt
+            "retries": [],
+            "retry_attempts": int(self.config.get_setting("retry_attempts", 3) or 0),
+            "retry_base_delay": float(self.config.get_setting("retry_base_delay", 2.0) or 0),
+            "skip_known_failures": bool(self.config.get_setting("skip_known_failures", True)),
+        }
+        state["breaker"] = self.breaker = self._create_breaker(on_event)
+        state["cancel_token"] = cancel_token
+        state["progress_model"] = progress_model = get_progress_model()
+        # Video URLs listed in the progress model by this run
+        state["listed"] = []
+        if cancel_token and stop_check is None:
+            stop_check = cancel_token.is_cancelled
+
+        for outcome in outcomes:
+            task = outcome.task
+            if task.task_type == "profile":
+                flow = f"profile:{outcome.index}"
+                creator = self.profile_scraper.extract_username(task.url).lower()
+            else:
+                flow = LINKS_FLOW
+                creator = self._creator_from_url(task.url)
+            state["pending"][outcome.index] = 1
+            item = _WorkItem(outcome, task.url, task.task_type)
+            if task.task_type == "profile":
+                # Enumerating is cheap and reveals sizes, so it goes first
+                item.expected_bytes = 0
+            queue.put(flow, item, creator, self._cost(item))
+        self._list_queued([(task.url, "") for task in tasks if task.task_type != "profile"], state)
+
+        try:
+            with MetadataPrefetcher(self.downloader.prefetch_info, self.prefetch_window) as prefetcher:
+                state["prefetcher"] = prefetcher
+                self._run_workers(queue, state, stop_check, len(outcomes))
+                self._drain_retries(state, stop_check)
+        finally:
+            progress_model.withdraw(state["listed"])
+
+        get_metrics().set("queue_depth", 0, queue="batch")
+        if self.completion_curve:
+            elapsed, items, expected, actual = self.completion_curve[-1]
+            self.logger.info(
+                f"Batch ({self.order}) finished {items} videos in {elapsed:.1f}s; "
+                f"expected {expected / 1048576:.1f} MB, fetched {actual / 1048576:.1f} MB"
+            )
+        return outcomes
+
+    def _create_breaker(self, on_event):
+        def on_trip(signature):
+            if on_event:
+                on_event(EVENT_BREAKER_OPEN, None, {"success": False, "error": signature})
+            update_ytdlp_if_enabled(self.config, self.logger)
+
+        def on_reset():
+            if on_event:
+                on_event(EVENT_BREAKER_CLOSED, None, None)
+
+        return CircuitBreaker.from_config(self.config, on_trip=on_trip, on_reset=on_reset)
+
+    def _run_workers(self, queue, state, stop_check, item_count):
+        threads = []
+        for number in range(min(self.workers, max(1, item_count))):
+            # Carry the run id and stage collectors into each worker
+            context = contextvars.copy_context()
+            thread = threading.Thread(
+                target=context.run,
+                args=(self._profiled_worker, queue, state, stop_check),
+                name=f"BatchWorker-{number + 1}",
+                daemon=True,
+            )
+            thread.start()
+            threads.append(thread)
+        for thread in threads:
+            thread.join()
+
+    def _drain_retries(self, state, stop_check):
+        """Run deferred retries in rounds as their backoff expires"""
+        while state["retries"]:
+            due_at = min(due for due, _item in state["retries"])
+            while time.monotonic() < due_at:
+                if stop_check and stop_check():
+                    break
+                remaining = max(0.0, due_at - time.monotonic())
+                if state["cancel_token"]:
+                    state["cancel_token"].sleep(remaining)
+                else:
+                    time.sleep(min(0.2, remaining))
+            if stop_check and stop_check():
+                break
+            now = time.monotonic()
+            with state["lock"]:
+                due_items = [item for due, item in state["retries"] if due <= now]
+                state["retries"] = [(due, item) for due, item in state["retries"] if due > now]
+            queue = FairQueue(per_creator_limit=self.per_profile_limit, order=self.order)
+            for item in due_items:
+                queue.put(RETRY_FLOW, item, self._creator_from_url(item.url), self._cost(item))
+            self._run_workers(queue, state, stop_check, len(due_items))
+
+        # Stopped with retries still waiting: they count as failed
+        with state["lock"]:
+            abandoned, state["retries"] = [item for _due, item in state["retries"]], []
+        for item in abandoned:
+            with state["lock"]:
+                item.outcome.failed += 1
+                if item.outcome.task.task_type != "profile":
+                    item.outcome.error = item.last_error or "Unknown error"
+            self._settle(item, state)
+
+    @staticmethod
+    def _list_queued(videos, state):
+        """Show queued (url, title) videos in the download manager"""
+        if videos:
+            with state["lock"]:
+                state["listed"].extend(url for url, _title in videos)
+            state["progress_model"].enqueue_many(videos)
+
+    def _known_failure(self, url, state):
+        """Return the stored permanent failure for a URL when such videos are skipped"""
+        if not state["skip_known_failures"]:
+            return None
+        return get_failure_store().get(url)
+
+    @staticmethod
+    def _default_workers(config):
+        # With adaptive concurrency the scheduler gates downloads, so run
+        # enough workers for the controller's ceiling
+        key = "concurrency_max" if config.get_setting("adaptive_concurrency", False) else "max_concurrent_downloads"
+        return max(1, int(config.get_setting(key, 2) or 1))
+
+    def _cost(self, item):
+        """Queue cost: expected bytes when ordering shortest first, one slot otherwise"""
+        return item.expected_bytes if self.order == ORDER_SHORTEST_FIRST else 1.0
+
+    def _profiled_worker(self, queue, state, stop_check):
+        # cProfile only sees the thread that enabled it, so a profiled run profiles each worker
+        with profile_thread():
+            self._worker(queue, state, stop_check)
+
+    def _worker(self, queue, state, stop_check):
+        metrics = get_metrics()
+        while True:
+            if stop_check and stop_check():
+                queue.close()
+                return
+            if state["cancel_token"] and not state["cancel_token"].wait_if_paused():
+                queue.close()
+                return
+            # Queued items stay put while the breaker is open
+            if queue.pending() and not state["breaker"].wait_until_allowed(stop_check):
+                queue.close()
+                return
+            item = queue.get()
+            if item is None:
+                return
+            metrics.set("queue_depth", queue.pending(), queue="batch")
+            self._prefetch_ahead(queue, state)
+            try:
+                if item.kind == "profile":
+                    self._expand_profile(item, queue, state)
+                else:
+                    self._download(item, state)
+            except Exception as exc:
+                # Never let one item take a worker down with it
+                self.logger.error(f"Batch item failed ({item.url}): {exc}")
+                state["breaker"].record({"success": False, "error": str(exc)})
+                with state["lock"]:
+                    item.outcome.failed += 1
+                    if item.kind == "profile":
+                        item.outcome.error = str(exc)
+            finally:
+                self._settle(item, state)
+                queue.task_done(item)
+
+    def _prefetch_ahead(self, queue, state):
+        prefetcher = state["prefetcher"]
+        if prefetcher.window:
+            upcoming = queue.peek(prefetcher.window)
+            # Known failures are skipped without a download, so never claim their prefetch
+            prefetcher.schedule([
+                queued.url for queued in upcoming
+                if queued.kind == "video" and not self._known_failure(queued.url, state)
+            ])
+
+    def _expand_profile(self, item, queue, state):
+        """Enumerate a profile task and queue its videos in the profile's flow"""
+        options = state["options"]
+        scraper = self.profile_scraper
+        username = scraper.extract_username(item.url)
+        output_path = scraper.resolve_output_path(username, options["create_folders"])
+        videos = scraper.list_videos(item.url, options["profile_limit"])
+        # A working listing is enough to close a half-open breaker
+        state["breaker"].record({"success": True})
+        existing_ids = scraper.library.scan(output_path) if options["skip_existing"] else {}
+
+        flow = f"profile:{item.outcome.index}"
+        creator = username.lower()
+        queued_videos = []
+        with state["lock"]:
+            item.outcome.total = len(videos)
+            for video in videos:
+                video_id = video.get("id") or extract_video_id_from_url(video["url"])
+                if (video_id and video_id in existing_ids) or self._known_failure(video["url"], state):
+                    item.outcome.skipped += 1
+                    continue
+                state["pending"][item.outcome.index] += 1
+                work_item = _WorkItem(
+                    item.outcome, video["url"], "video", str(output_path), "profile", expected_bytes(video)
+                )
+                queue.put(flow, work_item, creator, self._cost(work_item))
+                queued_videos.append((video["url"], video.get("title") or ""))
+        self._list_queued(queued_videos, state)
+        self._prefetch_ahead(queue, state)
+
+    def _download(self, item, state):
+        outcome = item.outcome
+        known_failure = self._known_failure(item.url, state)
+        if known_failure:
+            with state["lock"]:
+                outcome.skipped += 1
+                if outcome.task.task_type != "profile":
+                    outcome.error = f"Skipped, failed before: {known_failure.get('error', '')}"
+                    outcome.error_class = known_failure.get("error_class")
+            state["progress_model"].skip(item.url, known_failure.get("error", ""))
+            state["prefetcher"].discard(item.url)
+            # A skipped item says nothing about extraction; let another item probe
+            state["breaker"].release_probe()
+            return
+
+        progress_callback = None
+        if state["byte_progress_callback"]:
+            def progress_callback(progress, outcome=outcome):
+                state["byte_progress_callback"](outcome, progress)
+
+        result = self.downloader.download_video(
+            item.url,
+            output_path=item.output_path,
+            convert_to_mp3=state["options"]["convert_to_mp3"],
+            source=item.source,
+            progress_callback=progress_callback,
+            priority=PRIORITY_BATCH,
+            info=state["prefetcher"].take(item.url),
+            cancel_token=state["cancel_token"],
+        )
+        state["breaker"].record(result)
+        if not result.get("success") and self._defer_retry(item, result, state):
+            return
+        actual_bytes = 0
+        if result.get("success") and result.get("path") and os.path.isfile(result["path"]):
+            actual_bytes = os.path.getsize(result["path"])
+        with state["lock"]:
+            state["expected_done"] += item.expected_bytes
+            state["actual_done"] += actual_bytes
+            self.completion_curve.append((
+                time.perf_counter() - state["started"],
+                len(self.completion_curve) + 1,
+                state["expected_done"],
+                state["actual_done"],
+            ))
+            if result.get("success"):
+                outcome.downloaded += 1
+                outcome.title = result.get("title", "")
+            else:
+                outcome.failed += 1
+                if outcome.task.task_type != "profile":
+                    outcome.error = result.get("error", "Unknown error")
+                    outcome.error_class = result.get("error_class")
+        if item.source == "profile" and not result.get("success"):
+            self.logger.error(f"Failed to download {item.url}: {result.get('error', 'Unknown error')}")
+        if state["on_event"]:
+            state["on_event"](EVENT_ITEM_FINISHED, outcome, result)
+
+    def _defer_retry(self, item, result, state):
+        """Queue a retryable failure for later; returns False when it is final"""
+        error_class = result.get("error_class") or classify_error(result.get("error"))
+        retryable = error_class in RETRYABLE_ERRORS and item.attempt < state["retry_attempts"]
+        # Extractor failures get one more try, after the breaker has seen extraction work
+        retryable = retryable or (error_class == ERROR_EXTRACTOR and state["breaker"].threshold and not item.attempt)
+        if not retryable:
+            return False
+        item.attempt += 1
+        item.last_error = result.get("error")
+        delay = retry_delay(item.attempt, state["retry_base_delay"], error_class=error_class)
+        with state["lock"]:
+            # The retry keeps its task open until it settles
+            state["pending"][item.outcome.index] += 1
+            state["retries"].append((time.monotonic() + delay, item))
+            item.outcome.retried += 1
+        state["progress_model"].enqueue(item.url)
+        self.logger.warning(
+            f"Retrying {item.url} in {delay:.1f}s after {error_class} error "
+            f"(attempt {item.attempt}/{state['retry_attempts']})"
+        )
+        return True
+
+    def _settle(self, item, state):
+        """Count an item as done and report its task once nothing of it is left"""
+        outcome = item.outcome
+        with state["lock"]:
+            state["pending"][outcome.index] -= 1
+            if state["pending"][outcome.index] > 0 or outcome.finished:
+                return
+            outcome.finished = True
+        if state["on_event"]:
+            state["on_event"](EVENT_TASK_FINISHED, outcome, None)
+
+    @staticmethod
+    def _creator_from_url(url):
+        match = re.search(r"@([a-zA-Z0-9._-]+)", url or "")
+        return match.group(1).lower() if match else None
@@ -0,0 +1,81 @@
+"""
+Cancellation
+Stop and pause tokens checked inside transfers, so downloads react within a chunk
+"""
+
+import threading
+
+
+class DownloadCancelled(Exception):
+    """Raised inside a transfer when its CancellationToken is cancelled"""
+
+
+class CancellationToken:
+    """
+    Cooperative stop/pause signal shared by a download run.
+
+    Built on two Events: cancelling wakes everything waiting on the token,
+    and pausing blocks callers in wait_if_paused() until resume() or cancel()
+    without polling. progress_hook() plugs the token into yt-dlp (and the
+    segmented fetcher), so an in-flight transfer stops or pauses at its next
+    chunk instead of after the whole file.
+    """
+
+    def __init__(self):
+        self._cancelled = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+
+    def cancel(self):
+        """Stop everything using this token; paused callers are released"""
+        self._cancelled.set()
+        self._running.set()
+
+    def pause(self):
+        """Hold callers at their next check until resume()"""
+        if not self._cancelled.is_set():
+            self._running.clear()
+
+    def resume(self):
+        """Release paused callers"""
+        self._running.set()
+
+    def is_cancelled(self):
+        """Return True once cancel() was called; usable as a ``stop_check``"""
+        return self._cancelled.is_set()
+
+    def is_paused(self):
+        """Return True while paused; usable as a ``pause_check``"""
+        return not self._running.is_set()
+
+    def wait_if_paused(self, timeout=None):
+        """
+        Block while paused
+
+        Args:
+            timeout: Longest wait in seconds (None = until resumed or cancelled)
+
+        Returns:
+            bool: True if the caller may continue, False if cancelled
+        """
+        self._running.wait(timeout)
+        return not self._cancelled.is_set()
+
+    def sleep(self, seconds):
+        """
+        Sleep that ends early on cancel
+
+        Returns:
+            bool: True if the full time passed, False if cancelled
+        """
+        return not self._cancelled.wait(seconds)
+
+    def raise_if_cancelled(self):
+        """Wait out a pause, then raise DownloadCancelled if cancelled"""
+        if not self.wait_if_paused():
+            raise DownloadCancelled("Download cancelled")
+
+    def progress_hook(self, status):
+        """yt-dlp ``progress_hooks`` entry: pauses or aborts the transfer at the next chunk"""
+        if status.get("status") == "downloading":
+            self.raise_if_cancelled()
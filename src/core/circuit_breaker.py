@@ -0,0 +1,214 @@
+"""
+Circuit Breaker
+Pause downloads when every extraction fails the same way, and resume after a successful probe
+"""
+
+import os
+import re
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from src.core.failures import ERROR_EXTRACTOR, classify_error
+from src.core.updater import YtdlpUpdater
+from src.utils.logger import get_logger
+
+STATE_CLOSED = "closed"        # Downloads run normally
+STATE_OPEN = "open"            # Downloads wait; a probe is allowed after probe_interval
+STATE_HALF_OPEN = "half_open"  # One probe download is running
+
+DEFAULT_THRESHOLD = 5
+DEFAULT_PROBE_INTERVAL = 60.0
+
+
+def error_signature(error):
+    """
+    Reduce an error message to the part shared by every video it hits
+
+    URLs and numbers (video IDs, byte offsets) are masked, so the same
+    extractor bug on different videos gives the same signature.
+    """
+    signature = re.sub(r"https?://\S+", "<url>", str(error or ""))
+    signature = re.sub(r"\d+", "#", signature)
+    return signature.strip()[:200]
+
+
+def update_ytdlp_if_enabled(config, logger):
+    """
+    Run YtdlpUpdater.update() when "breaker_auto_update" is on
+
+    The new version is only imported by the next app start; until then the
+    breaker keeps probing with the loaded one.
+
+    Returns:
+        dict | None: The update result, or None when disabled
+    """
+    if not config.get_setting("breaker_auto_update", False):
+        return None
+    logger.info("Updating yt-dlp after repeated extractor failures")
+    result = YtdlpUpdater.update()
+    if result.get("success"):
+        logger.info(f"{result['message']} Restart the app to load it.")
+    else:
+        logger.error(result.get("message", "yt-dlp update failed"))
+    return result
+
+
+class CircuitBreaker:
+    """
+    Trip after ``threshold`` consecutive identical extractor errors.
+
+    While open, callers block in wait_until_allowed() so queued work stays
+    where it is. Every ``probe_interval`` seconds one caller is let through
+    as a probe; its success closes the breaker and releases everyone.
+    Failures of other classes (removed videos, timeouts) neither count
+    towards nor reset the streak.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, probe_interval=DEFAULT_PROBE_INTERVAL,
+                 on_trip=None, on_reset=None, clock=time.monotonic):
+        """
+        Args:
+            threshold: Identical extractor errors in a row that trip the breaker (0 = off)
+            probe_interval: Seconds between probes while open
+            on_trip: Called with the error signature when the breaker opens
+            on_reset: Called when a probe succeeds and the breaker closes
+            clock: Monotonic time source
+        """
+        self.threshold = max(0, int(threshold))
+        self.probe_interval = probe_interval
+        self.on_trip = on_trip
+        self.on_reset = on_reset
+        self._clock = clock
+        self.state = STATE_CLOSED
+        self.signature = None
+        self._streak = 0
+        self._opened_at = None
+        # Thread running the current probe while half-open
+        self._probe_thread = None
+        self._condition = threading.Condition()
+        self.logger = get_logger("CircuitBreaker")
+
+    @classmethod
+    def from_config(cls, config, **kwargs):
+        """Create a breaker from the "breaker_threshold" and "breaker_probe_interval" settings"""
+        return cls(
+            threshold=config.get_setting("breaker_threshold", DEFAULT_THRESHOLD) or 0,
+            probe_interval=float(config.get_setting("breaker_probe_interval", DEFAULT_PROBE_INTERVAL)),
+            **kwargs,
+        )
+
+    def allow(self):
+        """
+        Return True if a download may start now
+
+        When open and the probe interval has passed, the caller becomes the
+        probe and the breaker goes half-open.
+        """
+        with self._condition:
+            if self.state == STATE_CLOSED:
+                return True
+            if self.state == STATE_OPEN and self._clock() - self._opened_at >= self.probe_interval:
+                self.state = STATE_HALF_OPEN
+                self._probe_thread = threading.get_ident()
+                self.logger.info("Probing whether extraction works again")
+                return True
+            return False
+
+    def release_probe(self):
+        """
+        Give up the probe when the caller's item turned out not to need a download
+
+        Only the thread that became the probe releases it; the breaker goes
+        back to open with the next probe due at once, as for an
+        inconclusive result.
+        """
+        with self._condition:
+            if self.state == STATE_HALF_OPEN and self._probe_thread == threading.get_ident():
+                self._reopen_for_next_probe()
+
+    def wait_until_allowed(self, stop_check=None, poll_interval=0.5):
+        """
+        Block while the breaker holds downloads back
+
+        Args:
+            stop_check: Function that returns True to give up waiting
+            poll_interval: Seconds between checks
+
+        Returns:
+            bool: True when the caller may download, False if stopped
+        """
+        while not self.allow():
+            if stop_check and stop_check():
+                return False
+            with self._condition:
+                self._condition.wait(poll_interval)
+        return True
+
+    def record(self, result):
+        """
+        Feed a download result to the breaker
+
+        Args:
+            result: download_video() result dict
+
+        Returns:
+            bool: True if this result tripped the breaker
+        """
+        tripped_signature = None
+        reset = False
+        with self._condition:
+            if result.get("success"):
+                reset = self.state != STATE_CLOSED
+                self.state = STATE_CLOSED
+                self._streak = 0
+                self.signature = None
+                self._condition.notify_all()
+            else:
+                error = result.get("error")
+                error_class = result.get("error_class") or classify_error(error)
+                if error_class != ERROR_EXTRACTOR:
+                    if self.state == STATE_HALF_OPEN:
+                        # Inconclusive probe; let the next caller try
+                        self._reopen_for_next_probe()
+                    return False
+                signature = error_signature(error)
+                if self.state == STATE_HALF_OPEN:
+                    self.state = STATE_OPEN
+                    self._opened_at = self._clock()
+                    self.logger.warning(f"Probe failed, still paused: {signature}")
+                    return False
+                if self.state == STATE_OPEN:
+                    return False
+                self._streak = self._streak + 1 if signature == self.signature else 1
+                self.signature = signature
+                if self.threshold and self._streak >= self.threshold:
+                    self.state = STATE_OPEN
+                    self._opened_at = self._clock()
+                    tripped_signature = signature
+        if tripped_signature is not None:
+            self.logger.error(
+                f"Extraction failed {self._streak} times in a row with the same error; "
+                f"pausing downloads. Update yt-dlp. Last error: {tripped_signature}"
+            )
+            if self.on_trip:
+                self.on_trip(tripped_signature)
+            return True
+        if reset:
+            self.logger.info("Probe succeeded, resuming downloads")
+            if self.on_reset:
+                self.on_reset()
+        return False
+
+    def _reopen_for_next_probe(self):
+        """Go back to open with a probe due immediately; caller holds the condition"""
+        self.state = STATE_OPEN
+        self._opened_at = self._clock() - self.probe_interval
+        self._probe_thread = None
+        self._condition.notify_all()
+
+    def is_open(self):
+        """Return True while downloads are held back"""
+        with self._condition:
+            return self.state != STATE_CLOSED
@@ -0,0 +1,150 @@
+"""
+Adaptive Concurrency
+AIMD controller that tunes the download slot count from observed latency and errors
+"""
+
+import os
+import re
+import sys
+import threading
+import time
+from collections import deque
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from src.utils.logger import get_logger
+from src.utils.metrics import get_metrics
+
+DEFAULT_MIN_CONCURRENCY = 1
+DEFAULT_MAX_CONCURRENCY = 6
+
+# Errors that mean the server (or the link) wants us to slow down
+CONGESTION_RE = re.compile(r"\b429\b|too many requests|timed? ?out|rate.?limit", re.IGNORECASE)
+
+
+def is_congestion_error(error):
+    """
+    Tell throttling and timeouts apart from ordinary failures
+
+    Args:
+        error: Error message from a download result
+
+    Returns:
+        bool: True for HTTP 429, rate-limit and timeout errors
+    """
+    return bool(error and CONGESTION_RE.search(str(error)))
+
+
+class AdaptiveConcurrency:
+    """
+    Additive-increase / multiplicative-decrease limit on concurrent downloads.
+
+    After every ``limit`` completions (one round at the current level) the
+    limit grows by one if the round had a low error rate and its mean latency
+    stayed within ``latency_tolerance`` of the best round seen. A 429 or a
+    timeout halves the limit at once; other failures only block growth unless
+    they pass ``error_threshold``. Decreases are spaced by ``cooldown`` seconds
+    so one burst of throttling from items already in flight counts once.
+    """
+
+    def __init__(self, config=None, initial=None, latency_tolerance=1.5, error_threshold=0.2,
+                 decrease_factor=0.5, cooldown=5.0, clock=time.monotonic):
+        """
+        Args:
+            config: Object with get_setting(); "concurrency_min" and
+                "concurrency_max" are re-read on every adjustment
+            initial: Starting limit (defaults to "max_concurrent_downloads")
+            latency_tolerance: Mean round latency, as a multiple of the best
+                round, above which the limit stops growing
+            error_threshold: Failure rate in a round that triggers a decrease
+            decrease_factor: Multiplier applied on a decrease
+            cooldown: Minimum seconds between decreases
+            clock: Monotonic time source
+        """
+        self.config = config
+        self.latency_tolerance = latency_tolerance
+        self.error_threshold = error_threshold
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+        self._clock = clock
+        self._round = deque()
+        self._best_latency = None
+        self._last_decrease = None
+        self._lock = threading.Lock()
+        self.logger = get_logger("AdaptiveConcurrency")
+        if initial is None and config is not None:
+            initial = config.get_setting("max_concurrent_downloads", DEFAULT_MIN_CONCURRENCY)
+        low, high = self.bounds()
+        self.limit = min(high, max(low, int(initial or low)))
+        get_metrics().set("concurrency_limit", self.limit)
+
+    def bounds(self):
+        """Return the (min, max) limit allowed by the settings"""
+        low, high = DEFAULT_MIN_CONCURRENCY, DEFAULT_MAX_CONCURRENCY
+        if self.config is not None:
+            try:
+                low = max(1, int(self.config.get_setting("concurrency_min", low)))
+                high = max(low, int(self.config.get_setting("concurrency_max", high)))
+            except (TypeError, ValueError):
+                low, high = DEFAULT_MIN_CONCURRENCY, DEFAULT_MAX_CONCURRENCY
+        return low, high
+
+    def observe(self, latency, error=None):
+        """
+        Record one finished download and adjust the limit if a round is complete
+
+        Args:
+            latency: Seconds the download held its slot
+            error: Error message if it failed, else None
+
+        Returns:
+            int: The limit after this observation
+        """
+        with self._lock:
+            low, high = self.bounds()
+            if is_congestion_error(error):
+                self._decrease(low, high, f"congestion ({str(error)[:60]})")
+                return self.limit
+
+            self._round.append((latency, error is not None))
+            if len(self._round) < self.limit:
+                self._clamp(low, high)
+                return self.limit
+
+            latencies = [value for value, failed in self._round if not failed]
+            failure_rate = sum(1 for _value, failed in self._round if failed) / len(self._round)
+            self._round.clear()
+            if failure_rate > self.error_threshold:
+                self._decrease(low, high, f"error rate {failure_rate:.0%}")
+                return self.limit
+            if not latencies:
+                return self.limit
+
+            mean_latency = sum(latencies) / len(latencies)
+            if self._best_latency is None or mean_latency < self._best_latency:
+                self._best_latency = mean_latency
+            if failure_rate == 0 and mean_latency <= self._best_latency * self.latency_tolerance:
+                self._set(min(high, self.limit + 1), f"healthy round, mean latency {mean_latency:.2f}s")
+            else:
+                self._clamp(low, high)
+            return self.limit
+
+    def _decrease(self, low, high, reason):
+        now = self._clock()
+        if self._last_decrease is not None and now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        self._round.clear()
+        # Latency at the lower level is the new reference point
+        self._best_latency = None
+        self._set(min(high, max(low, int(self.limit * self.decrease_factor))), reason)
+
+    def _clamp(self, low, high):
+        if not low <= self.limit <= high:
+            self._set(min(high, max(low, self.limit)), "settings bounds changed")
+
+    def _set(self, limit, reason):
+        if limit == self.limit:
+            return
+        self.logger.info(f"Concurrency {self.limit} -> {limit}: {reason}")
+        self.limit = limit
+        get_metrics().set("concurrency_limit", limit)
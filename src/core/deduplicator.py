@@ -0,0 +1,216 @@
+"""
+Deduplicator
+Collapse byte-identical downloads into hardlinks
+"""
+
+import hashlib
+import os
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from src.core.app_models import DedupeResult
+from src.core.library import is_media_file
+from src.utils.config_manager import ConfigManager
+
+
+class Deduplicator:
+    """Find identical media files by size and content hash and hardlink them"""
+
+    CHUNK_SIZE = 1024 * 1024
+    HEAD_SIZE = 64 * 1024
+
+    # Size index for the on-download hook, shared by all instances.
+    _size_index = None
+    _size_index_root = None
+    _index_lock = threading.RLock()
+
+    def __init__(self, config=None):
+        self.config = config or ConfigManager()
+
+    def dedupe(self, root=None, dry_run=False):
+        """
+        Replace duplicate files under a folder with hardlinks to one copy
+
+        Files are grouped by filesystem and size first, so only same-size
+        candidates are ever read. Candidates are compared by a hash of their
+        first chunk and then of their full contents.
+
+        Args:
+            root: Folder to deduplicate (defaults to the download path setting)
+            dry_run: Only report what would be reclaimed
+
+        Returns:
+            DedupeResult: Summary including bytes reclaimed
+        """
+        result = DedupeResult()
+        by_size = {}
+        for path, stat in self._iter_media(self._resolve_root(root)):
+            result.files_considered += 1
+            by_size.setdefault((stat.st_dev, stat.st_size), []).append((path, stat))
+
+        for (_, size), candidates in by_size.items():
+            if size == 0 or len(candidates) < 2:
+                continue
+            for group in self._identical_groups(candidates, result):
+                result.duplicate_groups += 1
+                self._collapse(group, size, dry_run, result)
+
+        return result
+
+    def dedupe_file(self, path, root=None):
+        """
+        Hardlink a freshly downloaded file to an identical existing copy
+
+        Args:
+            path: Newly downloaded file
+            root: Library folder (defaults to the download path setting)
+
+        Returns:
+            DedupeResult: Summary of what was linked
+        """
+        result = DedupeResult()
+        path = Path(path)
+        try:
+            stat = path.stat()
+        except OSError as e:
+            result.errors.append(f"{path}: {e}")
+            return result
+
+        root = self._resolve_root(root)
+        with Deduplicator._index_lock:
+            size_index = self._get_size_index(root)
+            key = (stat.st_dev, stat.st_size)
+            candidates = [(p, s) for p, s in size_index.get(key, []) if p != path]
+            size_index.setdefault(key, []).append((path, stat))
+
+        result.files_considered = len(candidates) + 1
+        if stat.st_size == 0 or not candidates:
+            return result
+
+        for group in self._identical_groups(candidates + [(path, stat)], result):
+            if any(p == path for p, _ in group):
+                result.duplicate_groups += 1
+                # Keep the existing copy; the new download becomes the link.
+                group.sort(key=lambda item: item[0] == path)
+                self._collapse(group, stat.st_size, False, result)
+
+        with Deduplicator._index_lock:
+            entries = Deduplicator._size_index.get(key, []) if Deduplicator._size_index else []
+            for position, (indexed_path, _) in enumerate(entries):
+                if indexed_path == path:
+                    try:
+                        entries[position] = (path, path.stat())
+                    except OSError:
+                        del entries[position]
+                    break
+        return result
+
+    def _resolve_root(self, root):
+        return Path(root or self.config.get_setting("download_path") or "downloads")
+
+    def _iter_media(self, root):
+        """Yield (path, stat) for every media file below root."""
+        pending = [root]
+        while pending:
+            directory = pending.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False) and is_media_file(entry.name):
+                            try:
+                                yield Path(entry.path), entry.stat(follow_symlinks=False)
+                            except OSError:
+                                continue
+            except OSError:
+                continue
+
+    def _get_size_index(self, root):
+        """Build the (device, size) -> files index once per library root."""
+        if Deduplicator._size_index is None or Deduplicator._size_index_root != root:
+            index = {}
+            for path, stat in self._iter_media(root):
+                index.setdefault((stat.st_dev, stat.st_size), []).append((path, stat))
+            Deduplicator._size_index = index
+            Deduplicator._size_index_root = root
+        return Deduplicator._size_index
+
+    def _identical_groups(self, candidates, result):
+        """Split same-size candidates into groups of byte-identical files."""
+        # Files that are already hardlinks of each other only need hashing once.
+        by_inode = {}
+        for path, stat in candidates:
+            by_inode.setdefault(stat.st_ino, []).append((path, stat))
+        if len(by_inode) < 2:
+            return []
+
+        by_head = {}
+        for links in by_inode.values():
+            digest = self._hash_file(links[0][0], self.HEAD_SIZE, result)
+            if digest is not None:
+                by_head.setdefault(digest, []).append(links)
+
+        groups = []
+        for inode_groups in by_head.values():
+            if len(inode_groups) < 2:
+                continue
+            by_full = {}
+            for links in inode_groups:
+                digest = self._hash_file(links[0][0], None, result)
+                if digest is not None:
+                    by_full.setdefault(digest, []).append(links)
+            for identical in by_full.values():
+                if len(identical) > 1:
+                    groups.append([item for links in identical for item in links])
+        return groups
+
+    def _hash_file(self, path, limit, result):
+        """Hash a file in chunks, optionally only its first ``limit`` bytes."""
+        hasher = hashlib.blake2b(digest_size=32)
+        remaining = limit
+        try:
+            with open(path, 'rb') as f:
+                while remaining is None or remaining > 0:
+                    chunk = f.read(self.CHUNK_SIZE if remaining is None else min(self.CHUNK_SIZE, remaining))
+                    if not chunk:
+                        break
+                    hasher.update(chunk)
+                    if remaining is not None:
+                        remaining -= len(chunk)
+        except OSError as e:
+            result.errors.append(f"{path}: {e}")
+            return None
+        if limit is None:
+            result.files_hashed += 1
+        return hasher.digest()
+
+    def _collapse(self, group, size, dry_run, result):
+        """Hardlink every file in the group to the first one."""
+        keeper, keeper_stat = group[0]
+        relinked = {}
+        for path, stat in group[1:]:
+            if stat.st_ino == keeper_stat.st_ino:
+                continue
+            if not dry_run:
+                temp_path = path.with_name(f".{path.name}.dedupe")
+                try:
+                    os.link(keeper, temp_path)
+                    os.replace(temp_path, path)
+                except OSError as e:
+                    try:
+                        os.remove(temp_path)
+                    except OSError:
+                        pass
+                    result.errors.append(f"{path}: {e}")
+                    continue
+            result.files_linked += 1
+            counts = relinked.setdefault(stat.st_ino, [0, stat.st_nlink])
+            counts[0] += 1
+
+        # An inode's blocks are only freed once every link to it was replaced.
+        for replaced, nlink in relinked.values():
+            if replaced >= nlink:
+                result.bytes_reclaimed += size
@@ -3,16 +3,26 @@ TikTok Video Downloader
 Core functionality for downloading single videos
 """
 
-import yt_dlp
 import os
-import shutil
 from pathlib import Path
 import sys
 import re
+import time
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
-from config import YTDLP_OPTIONS
+from config import YTDLP_OPTIONS, DEFAULT_FILENAME_TEMPLATE
+from src.core.cancellation import DownloadCancelled
+from src.core.deduplicator import Deduplicator
+from src.core.failures import ERROR_CANCELLED, ERROR_INVALID_URL, classify_error, get_failure_store
+from src.core.media_backend import resolve_backend
+from src.core.scheduler import PRIORITY_INTERACTIVE, get_scheduler
+from src.core.progress import ProgressTracker, STAGE_ERROR, STAGE_EXTRACTING
+from src.core.progress_model import get_progress_model
+from src.utils.bandwidth import get_bandwidth_governor
 from src.utils.file_manager import FileManager
+from src.utils.metrics import get_metrics
+from src.utils.timing import PostprocessTimer, record_stage, stage_span
+from src.utils.tracing import trace_span
 from src.utils.validators import is_valid_tiktok_url
 from src.utils.config_manager import ConfigManager
 
@@ -20,11 +30,20 @@ from src.utils.config_manager import ConfigManager
 class TikTokDownloader:
     """Handle TikTok video downloads"""
     
-    def __init__(self):
+    def __init__(self, backend=None):
+        """
+        Args:
+            backend: MediaBackend instance or registered backend name
+                (defaults to the "media_backend" setting)
+        """
         self.file_manager = FileManager()
         self.config = ConfigManager()
+        self.deduplicator = Deduplicator(self.config)
+        self.backend = resolve_backend(backend, self.config)
     
-    def download_video(self, url, output_path=None, convert_to_mp3=False, filename=None, source=None):
+    def download_video(self, url, output_path=None, convert_to_mp3=False, filename=None, source=None,
+                       progress_callback=None, task_id=None, priority=PRIORITY_INTERACTIVE, info=None,
+                       cancel_token=None):
         """
         Download a single TikTok video
         
@@ -34,16 +53,77 @@ class TikTokDownloader:
             convert_to_mp3: Convert video to MP3
             filename: Custom filename
             source: Source of download (e.g., 'profile' for profile downloads)
+            progress_callback: Function called with DownloadProgress events
+            task_id: Identifier reported in progress events (defaults to url)
+            priority: Scheduler class; batches pass PRIORITY_BATCH so a single
+                pasted link is served before their next item
+            info: Metadata from prefetch_info(); skips extraction when given
+            cancel_token: CancellationToken that pauses or aborts the transfer
+                mid-file; an aborted download leaves no partial file behind
+        
+        The download is listed in the shared progress model from the moment
+        it waits for a slot until it finishes.
         
         Returns:
             dict: Download result with success status and path
         """
+        metrics = get_metrics()
+        metrics.inc("downloads_started_total")
+        scheduler = get_scheduler()
+        model = get_progress_model()
+        task_id = task_id or url
+        model.enqueue(task_id, (info or {}).get("title", ""))
+
+        def report_progress(progress):
+            model.apply(progress)
+            if progress_callback:
+                progress_callback(progress)
+
+        result = {"success": False, "error": "Download interrupted"}
+        # Seconds spent paused with the slot given back; not part of the latency
+        timing = {"paused": 0.0}
+        try:
+            with scheduler.slot(priority):
+                metrics.inc("active_workers")
+                started = time.perf_counter()
+                try:
+                    with trace_span("download", url=url, source=source or "single"):
+                        result = self._download_video(
+                            url, output_path, convert_to_mp3, filename, source, report_progress, task_id, info,
+                            cancel_token, priority, timing,
+                        )
+                    # A stopped download says nothing about how the server copes
+                    if result.get("error_class") != ERROR_CANCELLED:
+                        error = None if result.get("success") else result.get("error")
+                        scheduler.observe(time.perf_counter() - started - timing["paused"], error)
+                    return result
+                finally:
+                    metrics.dec("active_workers")
+        finally:
+            model.finish(task_id, result)
+    
+    def _download_video(self, url, output_path, convert_to_mp3, filename, source, progress_callback, task_id,
+                        info=None, cancel_token=None, priority=PRIORITY_INTERACTIVE, timing=None):
+        """Body of download_video; records outcome metrics"""
+        metrics = get_metrics()
+        tracker = ProgressTracker(progress_callback, task_id or url) if progress_callback else None
+        # Files the transfer has started writing, removed if it is cancelled
+        partial_files = set()
+        # Failures after the transfer are local (moving, history) and say nothing about the video
+        fetched = False
         try:
+            if cancel_token:
+                self._wait_out_pause(cancel_token, priority, timing)
+            
             # Validate URL
-            if not is_valid_tiktok_url(url):
+            with stage_span("validate"):
+                is_valid = is_valid_tiktok_url(url)
+            if not is_valid:
+                metrics.inc("downloads_failed_total", error_class=ERROR_INVALID_URL)
                 return {
                     "success": False,
-                    "error": "Invalid TikTok URL"
+                    "error": "Invalid TikTok URL",
+                    "error_class": ERROR_INVALID_URL,
                 }
             
             # Prepare output path
@@ -74,7 +154,7 @@ class TikTokDownloader:
                         'preferredquality': '192',
                     }],
                 })
-                ydl_opts['outtmpl'] = str(output_path / '%(title)s.%(ext)s')
+                ydl_opts['outtmpl'] = str(output_path / self._get_filename_template())
             else:
                 quality = self.config.get_setting("video_quality", "best")
                 if quality == "best":
@@ -89,76 +169,149 @@ class TikTokDownloader:
                 if filename:
                     ydl_opts['outtmpl'] = str(output_path / f"{filename}.%(ext)s")
                 else:
-                    ydl_opts['outtmpl'] = str(output_path / '%(title)s.%(ext)s')
+                    ydl_opts['outtmpl'] = str(output_path / self._get_filename_template())
+            
+            postprocess_timer = PostprocessTimer()
+            ydl_opts['postprocessor_hooks'] = [postprocess_timer.hook]
+            if tracker:
+                ydl_opts['progress_hooks'] = [tracker.hook]
+                ydl_opts['postprocessor_hooks'].append(tracker.postprocessor_hook)
+                tracker.stage(STAGE_EXTRACTING)
+            
+            if cancel_token:
+                def cancel_hook(status):
+                    partial_files.add(status.get("tmpfilename") or status.get("filename"))
+                    if status.get("status") == "downloading":
+                        self._wait_out_pause(cancel_token, priority, timing)
+                ydl_opts['progress_hooks'] = [cancel_hook, *ydl_opts.get('progress_hooks', [])]
             
             # Download
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:  # type: ignore
-                info = ydl.extract_info(url, download=True)
-                downloaded_file = Path(ydl.prepare_filename(info))
-
-                if convert_to_mp3:
-                    downloaded_file = downloaded_file.with_suffix('.mp3')
-                downloaded_file = self._resolve_downloaded_file(downloaded_file)
-
-                if create_folder and not profile_user:
-                    resolved_user = (
-                        self._extract_profile_from_info(info)
-                        or self._extract_profile_user(url)
-                        or self._extract_profile_from_path(base_output_path)
+            if info is None:
+                with stage_span("extract"):
+                    info = self.backend.extract(url, ydl_opts)
+            if cancel_token:
+                self._wait_out_pause(cancel_token, priority, timing)
+            
+            # Every transfer draws from the shared bandwidth cap
+            with get_bandwidth_governor().lease(cancel_token) as lease:
+                ydl_opts['progress_hooks'] = [lease.progress_hook, *ydl_opts.get('progress_hooks', [])]
+                transfer_started = time.perf_counter()
+                info, downloaded_file = self.backend.fetch(info, ydl_opts)
+            fetched = True
+            record_stage("transfer", time.perf_counter() - transfer_started - postprocess_timer.total, transfer_started)
+            downloaded_file = self._resolve_downloaded_file(downloaded_file)
+            downloaded_file = self.backend.postprocess(info, downloaded_file, ydl_opts)
+            
+            relocate_started = time.perf_counter()
+            if create_folder and not profile_user:
+                resolved_user = (
+                    self._extract_profile_from_info(info)
+                    or self._extract_profile_user(url)
+                    or self._extract_profile_from_path(base_output_path)
+                )
+                if resolved_user:
+                    profile_user = resolved_user
+                    target_dir = self._resolve_output_path(
+                        base_output_path,
+                        profile_user,
+                        explicit_output_path,
+                        create_folder,
                     )
-                    if resolved_user:
-                        profile_user = resolved_user
-                        target_dir = self._resolve_output_path(
-                            base_output_path,
-                            profile_user,
-                            explicit_output_path,
-                            create_folder,
-                        )
-                        target_dir.mkdir(parents=True, exist_ok=True)
-                    else:
-                        target_dir = output_path
+                    target_dir.mkdir(parents=True, exist_ok=True)
                 else:
                     target_dir = output_path
+            else:
+                target_dir = output_path
 
-                if target_dir != downloaded_file.parent:
-                    target_dir.mkdir(parents=True, exist_ok=True)
-                    unique_name = self.file_manager.get_unique_filename(target_dir, downloaded_file.name)
-                    final_path = target_dir / unique_name
-                    try:
-                        downloaded_file.rename(final_path)
-                        downloaded_file = final_path
-                    except OSError:
-                        # Fallback to copy if rename fails across devices
-                        shutil.copy2(downloaded_file, final_path)
-                        downloaded_file.unlink(missing_ok=True)
-                        downloaded_file = final_path
-                
-                # Save to history
-                if self.config.get_setting("save_history"):
-                    history_entry = {
-                        "title": info.get('title', 'Unknown'),
-                        "url": url,
-                        "type": "MP3" if convert_to_mp3 else "Video",
-                        "path": str(downloaded_file)
-                    }
-                    if source:
-                        history_entry["source"] = source
-                    if profile_user:
-                        history_entry["profile_user"] = f"@{profile_user}"
-                    self.config.add_to_history(history_entry)
-                
-                return {
-                    "success": True,
-                    "path": str(downloaded_file),
-                    "title": info.get('title', 'Unknown')
+            if target_dir != downloaded_file.parent:
+                target_dir.mkdir(parents=True, exist_ok=True)
+                unique_name = self.file_manager.reserve_unique_filename(target_dir, downloaded_file.name)
+                final_path = target_dir / unique_name
+                try:
+                    # Renames in place, or copies in-kernel across devices
+                    downloaded_file = self.file_manager.relocate_file(downloaded_file, final_path)
+                except OSError:
+                    self.file_manager.release_filename(target_dir, unique_name)
+                    raise
+            
+            if self.config.get_setting("dedupe_on_download", False):
+                self._dedupe_download(downloaded_file)
+            record_stage("relocate", time.perf_counter() - relocate_started, relocate_started)
+            
+            # Save to history
+            if self.config.get_setting("save_history"):
+                history_entry = {
+                    "title": info.get('title', 'Unknown'),
+                    "url": url,
+                    "type": "MP3" if convert_to_mp3 else "Video",
+                    "path": str(downloaded_file)
                 }
-                
+                if source:
+                    history_entry["source"] = source
+                if profile_user:
+                    history_entry["profile_user"] = f"@{profile_user}"
+                with stage_span("history"):
+                    self.config.add_to_history(history_entry)
+            
+            if tracker:
+                tracker.finish(downloaded_file)
+            
+            get_failure_store().forget(url)
+            metrics.inc("downloads_succeeded_total")
+            try:
+                metrics.inc("bytes_transferred_total", downloaded_file.stat().st_size)
+            except OSError:
+                pass
+            
+            return {
+                "success": True,
+                "path": str(downloaded_file),
+                "title": info.get('title', 'Unknown')
+            }
+            
+        except DownloadCancelled as e:
+            self._remove_partial_files(partial_files)
+            metrics.inc("downloads_failed_total", error_class=ERROR_CANCELLED)
+            if tracker:
+                tracker.stage(STAGE_ERROR)
+            return {
+                "success": False,
+                "error": str(e),
+                "error_class": ERROR_CANCELLED,
+            }
         except Exception as e:
+            error_class = classify_error(e)
+            metrics.inc("downloads_failed_total", error_class=error_class)
+            # Removed and private videos are remembered so later batches skip them
+            if not fetched:
+                get_failure_store().record(url, error_class, e)
+            if tracker:
+                tracker.stage(STAGE_ERROR)
             return {
                 "success": False,
-                "error": str(e)
+                "error": str(e),
+                "error_class": error_class,
             }
 
+    def _dedupe_download(self, downloaded_file: Path) -> None:
+        """Hardlink a finished download to an identical copy already in the library."""
+        try:
+            self.deduplicator.dedupe_file(downloaded_file)
+        except Exception:
+            # Deduplication is best effort and must never fail a download.
+            pass
+
+    def _get_filename_template(self) -> str:
+        """Return the configured yt-dlp output template, always ending in an extension."""
+        template = str(self.config.get_setting("filename_template", DEFAULT_FILENAME_TEMPLATE) or "").strip()
+        if not template:
+            return DEFAULT_FILENAME_TEMPLATE
+        # Keep templates relative to the output folder.
+        template = template.replace("\\", "/").lstrip("/")
+        if "%(ext)s" not in template:
+            template = f"{template}.%(ext)s"
+        return template
+
     def _extract_profile_user(self, url: str | None) -> str | None:
         if not url:
             return None
@@ -221,6 +374,52 @@ class TikTokDownloader:
 
         return base_output_path / f"@{profile_user}"
     
+    @staticmethod
+    def _wait_out_pause(cancel_token, priority, timing=None):
+        """
+        Block while the token is paused, then raise DownloadCancelled if it was cancelled
+
+        The paused download gives its scheduler slot back while it waits, so
+        other downloads (including the one the user wants next) can run. The
+        wait, including getting a slot back, is added to ``timing["paused"]``.
+        """
+        started = time.perf_counter()
+        while cancel_token.is_paused() and not cancel_token.is_cancelled():
+            with get_scheduler().yielded(priority):
+                cancel_token.wait_if_paused()
+        if timing is not None:
+            timing["paused"] += time.perf_counter() - started
+        if cancel_token.is_cancelled():
+            raise DownloadCancelled("Download cancelled")
+    
+    @staticmethod
+    def _remove_partial_files(paths):
+        """Delete what a cancelled transfer wrote"""
+        for path in paths:
+            if not path:
+                continue
+            for candidate in (Path(path), Path(f"{path}.part"), Path(f"{path}.ytdl")):
+                try:
+                    candidate.unlink(missing_ok=True)
+                except OSError:
+                    pass
+    
+    def prefetch_info(self, url):
+        """
+        Resolve a video's metadata ahead of its download
+
+        Runs outside the scheduler and bandwidth cap; pass the result to
+        download_video(info=...) so the download goes straight to the transfer.
+        
+        Args:
+            url: TikTok video URL
+        
+        Returns:
+            dict: Unprocessed info from the backend
+        """
+        with stage_span("prefetch"):
+            return self.backend.extract(url, YTDLP_OPTIONS.copy())
+    
     def get_video_info(self, url):
         """
         Get video information without downloading
@@ -238,18 +437,17 @@ class TikTokDownloader:
                 'extract_flat': True,
             }
             
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:  # type: ignore
-                info = ydl.extract_info(url, download=False)
-                
-                return {
-                    "success": True,
-                    "title": info.get('title', 'Unknown'),
-                    "duration": info.get('duration', 0),
-                    "uploader": info.get('uploader', 'Unknown'),
-                    "view_count": info.get('view_count', 0),
-                    "like_count": info.get('like_count', 0),
-                }
-                
+            info = self.backend.extract(url, ydl_opts)
+            
+            return {
+                "success": True,
+                "title": info.get('title', 'Unknown'),
+                "duration": info.get('duration', 0),
+                "uploader": info.get('uploader', 'Unknown'),
+                "view_count": info.get('view_count', 0),
+                "like_count": info.get('like_count', 0),
+            }
+            
         except Exception as e:
             return {
                 "success": False,
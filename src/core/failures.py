@@ -0,0 +1,213 @@
+"""
+Download Failures
+Classify download errors, schedule retries, and remember videos that cannot be fetched
+"""
+
+import errno
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from config import FAILED_DOWNLOADS_FILE
+from src.core.library import extract_video_id_from_url
+
+ERROR_TRANSIENT = "transient"        # Network hiccup, 5xx, timeout
+ERROR_THROTTLED = "throttled"        # HTTP 429 / rate limited
+ERROR_UNAVAILABLE = "unavailable"    # Private, login-only or geo-blocked
+ERROR_REMOVED = "removed"            # Deleted or never existed
+ERROR_EXTRACTOR = "extractor"        # yt-dlp could not parse the page; usually needs an update
+ERROR_DISK_FULL = "disk_full"        # No space left for the file
+ERROR_POSTPROCESS = "postprocess"    # ffmpeg missing or conversion failed; the video itself is fine
+ERROR_LOCAL = "local"                # Permissions, bad paths and other local filesystem errors
+ERROR_INVALID_URL = "invalid_url"
+ERROR_CANCELLED = "cancelled"       # Stopped by the user
+ERROR_UNKNOWN = "unknown"
+
+# Worth another attempt later in the same batch
+RETRYABLE_ERRORS = {ERROR_TRANSIENT, ERROR_THROTTLED}
+# Properties of the video itself, so future runs skip it. Only the site's
+# answer to the extraction or transfer may put a video in these classes.
+PERMANENT_ERRORS = {ERROR_REMOVED, ERROR_UNAVAILABLE}
+
+# First match wins, so the more specific classes come first
+ERROR_PATTERNS = [
+    (ERROR_DISK_FULL, re.compile(r"no space left|disk (is )?full|quota exceeded", re.IGNORECASE)),
+    (ERROR_POSTPROCESS, re.compile(
+        r"ffmpeg|ffprobe|post-?process|conversion failed|error (opening|writing) output",
+        re.IGNORECASE,
+    )),
+    (ERROR_LOCAL, re.compile(
+        r"permission denied|access is denied|read-only file system|file name too long|"
+        r"no such file or directory|cannot find the path",
+        re.IGNORECASE,
+    )),
+    (ERROR_THROTTLED, re.compile(r"\b429\b|too many requests|rate.?limit", re.IGNORECASE)),
+    (ERROR_REMOVED, re.compile(
+        r"\b404\b|\b410\b|(video|post|item|page|account|user) (is |was |has been )?(not found|removed|deleted)|"
+        r"no longer available|does not exist|status code 10204",
+        re.IGNORECASE,
+    )),
+    (ERROR_UNAVAILABLE, re.compile(
+        r"private|log ?in|sign ?in|geo[- ]?(restrict|block)|not available in your (country|region)",
+        re.IGNORECASE,
+    )),
+    (ERROR_TRANSIENT, re.compile(
+        r"timed? ?out|connection (reset|refused|aborted)|remote end closed|temporary failure|"
+        r"network is unreachable|incompleteread|\b50[0-4]\b|unable to download|"
+        # TikTok answers 403 when a signed CDN URL has expired; a fresh extraction fixes it
+        r"\b403\b|forbidden|"
+        r"connection closed|range .* failed",
+        re.IGNORECASE,
+    )),
+    (ERROR_EXTRACTOR, re.compile(
+        r"unable to extract|unsupported url|please report this issue|extractor",
+        re.IGNORECASE,
+    )),
+]
+
+
+def classify_error(error):
+    """
+    Map a download exception or error message to an ERROR_* class
+
+    Args:
+        error: Exception or error string
+
+    Returns:
+        str: One of the ERROR_* constants
+    """
+    if isinstance(error, OSError) and error.errno in (errno.ENOSPC, getattr(errno, "EDQUOT", errno.ENOSPC)):
+        return ERROR_DISK_FULL
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return ERROR_TRANSIENT
+    if isinstance(error, OSError):
+        return ERROR_LOCAL
+    message = str(error or "")
+    for error_class, pattern in ERROR_PATTERNS:
+        if pattern.search(message):
+            return error_class
+    return ERROR_UNKNOWN
+
+
+def retry_delay(attempt, base=2.0, cap=60.0, error_class=ERROR_TRANSIENT, rand=random.random):
+    """
+    Jittered exponential backoff before a retry
+
+    Args:
+        attempt: Retry number, starting at 1
+        base: Delay before the first retry in seconds
+        cap: Longest delay in seconds
+        error_class: Throttled errors start from twice the base delay
+        rand: Random source in [0, 1)
+
+    Returns:
+        float: Seconds to wait, between half and all of the exponential delay
+    """
+    if error_class == ERROR_THROTTLED:
+        base *= 2
+    delay = min(cap, base * 2 ** max(0, attempt - 1))
+    return delay / 2 + rand() * delay / 2
+
+
+class FailureStore:
+    """Persistent record of videos that failed permanently (removed, private, geo-blocked)"""
+
+    VERSION = 1
+
+    def __init__(self, store_file=None):
+        self.store_file = Path(store_file or FAILED_DOWNLOADS_FILE)
+        # video id (or URL) -> {"url", "error_class", "error", "recorded_at"}
+        self.entries = {}
+        self._lock = threading.RLock()
+        self.load()
+
+    def load(self):
+        """Load the store from disk, starting empty if it is missing or unreadable."""
+        with self._lock:
+            self.entries = {}
+            if not self.store_file.exists():
+                return
+            try:
+                with open(self.store_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if isinstance(data, dict) and data.get("version") == self.VERSION:
+                    # Drop entries an older, looser classifier recorded (missing ffmpeg, CDN 403s)
+                    self.entries = {
+                        key: entry for key, entry in (data.get("entries") or {}).items()
+                        if classify_error(entry.get("error")) in PERMANENT_ERRORS
+                    }
+            except Exception:
+                self.entries = {}
+
+    def save(self):
+        """Write the store atomically."""
+        with self._lock:
+            data = {"version": self.VERSION, "entries": self.entries}
+            temp_file = self.store_file.with_name(f"{self.store_file.name}.tmp")
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+            os.replace(temp_file, self.store_file)
+
+    @staticmethod
+    def _key(url):
+        return extract_video_id_from_url(url) or url
+
+    def record(self, url, error_class, error):
+        """
+        Remember a permanent failure; other classes are ignored
+
+        Args:
+            url: Video URL
+            error_class: ERROR_* class from classify_error()
+            error: Error message
+
+        Returns:
+            bool: True if the failure was recorded
+        """
+        if error_class not in PERMANENT_ERRORS:
+            return False
+        with self._lock:
+            self.entries[self._key(url)] = {
+                "url": url,
+                "error_class": error_class,
+                "error": str(error)[:500],
+                "recorded_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            }
+            self.save()
+        return True
+
+    def get(self, url):
+        """Return the recorded failure for a URL, or None"""
+        with self._lock:
+            return self.entries.get(self._key(url))
+
+    def forget(self, url):
+        """Drop a URL from the store, e.g. after it downloads successfully"""
+        with self._lock:
+            if self.entries.pop(self._key(url), None) is not None:
+                self.save()
+
+    def clear(self):
+        """Forget every recorded failure"""
+        with self._lock:
+            self.entries = {}
+            self.save()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_failure_store():
+    """Return the process-wide FailureStore."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = FailureStore()
+        return _store
@@ -0,0 +1,305 @@
+"""
+Download Library
+Map downloaded files back to TikTok video IDs
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from config import LIBRARY_INDEX_FILE
+from src.core.app_models import LibraryRescanResult
+from src.utils.config_manager import ConfigManager
+
+
+# TikTok video IDs are 19-digit snowflakes; allow some slack for older/newer IDs.
+VIDEO_ID_PATTERN = re.compile(r'(?<!\d)(\d{15,22})(?!\d)')
+VIDEO_URL_ID_PATTERN = re.compile(r'/(?:video|photo)/(\d{15,22})')
+
+MEDIA_EXTENSIONS = {'.mp4', '.webm', '.mkv', '.mov', '.m4a', '.mp3', '.aac', '.opus'}
+SIDECAR_SUFFIX = '.info.json'
+
+
+def extract_video_id(filename):
+    """
+    Extract a TikTok video ID from a filename produced by the filename template
+
+    Args:
+        filename: File name or path
+
+    Returns:
+        str | None: Video ID if one is present
+    """
+    match = VIDEO_ID_PATTERN.search(Path(filename).stem)
+    return match.group(1) if match else None
+
+
+def extract_video_id_from_url(url):
+    """
+    Extract a TikTok video ID from a full video URL
+
+    Args:
+        url: TikTok video URL
+
+    Returns:
+        str | None: Video ID if the URL contains one
+    """
+    if not url:
+        return None
+    match = VIDEO_URL_ID_PATTERN.search(url)
+    return match.group(1) if match else None
+
+
+def is_media_file(filename):
+    """Return True when the filename has a known media extension."""
+    return Path(filename).suffix.lower() in MEDIA_EXTENSIONS
+
+
+class LibraryIndex:
+    """Persistent per-directory index of media files and their video IDs"""
+
+    VERSION = 1
+
+    def __init__(self, index_file=None):
+        self.index_file = Path(index_file or LIBRARY_INDEX_FILE)
+        self.root = None
+        # directory path -> {"mtime_ns": int, "files": {name: id|None}, "subdirs": [name]}
+        self.directories = {}
+        self._lock = threading.RLock()
+        self.load()
+
+    def load(self):
+        """Load the index from disk, starting empty if it is missing or unreadable."""
+        with self._lock:
+            self.root = None
+            self.directories = {}
+            if not self.index_file.exists():
+                return
+            try:
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if isinstance(data, dict) and data.get("version") == self.VERSION:
+                    self.root = data.get("root")
+                    self.directories = data.get("directories") or {}
+            except Exception:
+                self.directories = {}
+
+    def save(self):
+        """Write the index atomically."""
+        with self._lock:
+            data = {"version": self.VERSION, "root": self.root, "directories": self.directories}
+            temp_file = self.index_file.with_name(f"{self.index_file.name}.tmp")
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(temp_file, self.index_file)
+
+    def videos(self):
+        """
+        Get the indexed video ID -> path mapping
+
+        Returns:
+            dict: Video ID -> Path of the media file
+        """
+        with self._lock:
+            mapping = {}
+            for directory, record in self.directories.items():
+                for name, video_id in record.get("files", {}).items():
+                    if video_id:
+                        mapping.setdefault(video_id, Path(directory) / name)
+            return mapping
+
+
+class LibraryScanner:
+    """Recover the video ID -> path mapping from the download folder"""
+
+    def __init__(self, config=None):
+        self.config = config or ConfigManager()
+
+    def scan(self, root=None):
+        """
+        Walk the download folder and map video IDs to files by name alone
+
+        Args:
+            root: Folder to scan (defaults to the download path setting)
+
+        Returns:
+            dict: Video ID -> Path of the media file
+        """
+        root = Path(root or self.config.get_setting("download_path") or "downloads")
+        library = {}
+        pending = [root]
+
+        while pending:
+            directory = pending.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(Path(entry.path))
+                        elif entry.is_file() and is_media_file(entry.name):
+                            video_id = extract_video_id(entry.name)
+                            if video_id:
+                                library.setdefault(video_id, Path(entry.path))
+            except OSError:
+                continue
+
+        return library
+
+    def find_video(self, video_id, root=None):
+        """
+        Locate a downloaded video by ID
+
+        Args:
+            video_id: TikTok video ID
+            root: Folder to scan (defaults to the download path setting)
+
+        Returns:
+            Path | None: Path of the media file if it is on disk
+        """
+        return self.scan(root).get(str(video_id))
+
+    def rescan(self, root=None, index=None, workers=None, force=False, reconcile_history=True):
+        """
+        Rebuild the library index from disk with parallel directory workers
+
+        Directories whose mtime is unchanged since the last rescan reuse their
+        cached entries instead of being listed again, so a rescan of an
+        untouched library costs one stat per directory. Video IDs come from
+        filenames, falling back to a ``.info.json`` sidecar next to the file.
+
+        Args:
+            root: Folder to scan (defaults to the download path setting)
+            index: LibraryIndex to update (defaults to the persisted index)
+            workers: Number of directory workers
+            force: Re-list every directory even if its mtime is unchanged
+            reconcile_history: Relink or flag history entries after the scan
+
+        Returns:
+            LibraryRescanResult: Rescan summary
+        """
+        started = time.perf_counter()
+        root = os.path.abspath(root or self.config.get_setting("download_path") or "downloads")
+        index = index or LibraryIndex()
+        result = LibraryRescanResult()
+
+        same_root = index.root == root
+        previous = index.directories if same_root else {}
+        before_ids = set(index.videos()) if same_root else set()
+        directories = {}
+        workers = workers or min(32, (os.cpu_count() or 1) * 4)
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pending = {pool.submit(self._scan_directory, root, previous.get(root), force)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    scanned = future.result()
+                    if scanned is None:
+                        continue
+                    path, record, reused = scanned
+                    directories[path] = record
+                    if reused:
+                        result.directories_skipped += 1
+                    else:
+                        result.directories_scanned += 1
+                    for name in record["subdirs"]:
+                        subdir = os.path.join(path, name)
+                        pending.add(pool.submit(self._scan_directory, subdir, previous.get(subdir), force))
+
+        changed = not same_root or result.directories_scanned > 0 or directories.keys() != previous.keys()
+        with index._lock:
+            index.root = root
+            index.directories = directories
+        if changed:
+            index.save()
+
+        videos = index.videos()
+        after_ids = set(videos)
+        result.files_indexed = sum(len(record["files"]) for record in directories.values())
+        result.added = len(after_ids - before_ids)
+        result.removed = len(before_ids - after_ids)
+
+        if reconcile_history:
+            self._reconcile_history(videos, result)
+
+        result.elapsed = time.perf_counter() - started
+        return result
+
+    def _scan_directory(self, path, cached, force):
+        """List one directory, or reuse its cached record when its mtime is unchanged."""
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+        if cached and not force and cached.get("mtime_ns") == mtime_ns:
+            return path, cached, True
+
+        names = set()
+        media = []
+        subdirs = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.name)
+                        continue
+                    names.add(entry.name)
+                    if is_media_file(entry.name):
+                        media.append(entry.name)
+        except OSError:
+            return None
+
+        files = {}
+        for name in media:
+            files[name] = extract_video_id(name) or self._read_sidecar_id(path, name, names)
+
+        return path, {"mtime_ns": mtime_ns, "files": files, "subdirs": subdirs}, False
+
+    def _read_sidecar_id(self, directory, filename, names):
+        """Read the video ID from a yt-dlp ``.info.json`` sidecar if there is one."""
+        sidecar = f"{Path(filename).stem}{SIDECAR_SUFFIX}"
+        if sidecar not in names:
+            return None
+        try:
+            with open(os.path.join(directory, sidecar), 'r', encoding='utf-8') as f:
+                video_id = json.load(f).get("id")
+        except Exception:
+            return None
+        return str(video_id) if video_id else None
+
+    def _reconcile_history(self, videos, result):
+        """Point history entries at moved files and flag entries whose file is gone."""
+        # Runs under the history lock so downloads finishing meanwhile are not lost
+        self.config.update_history(lambda history: self._relink_history(history, videos, result))
+
+    def _relink_history(self, history, videos, result):
+        changed = False
+
+        for item in history:
+            path = item.get("path")
+            if path and os.path.exists(path):
+                if item.pop("missing", None):
+                    changed = True
+                continue
+
+            video_id = extract_video_id_from_url(item.get("url")) or (extract_video_id(path) if path else None)
+            located = videos.get(video_id) if video_id else None
+            if located:
+                item["path"] = str(located)
+                item.pop("missing", None)
+                result.history_relinked += 1
+                changed = True
+            else:
+                result.history_missing += 1
+                if not item.get("missing"):
+                    item["missing"] = True
+                    changed = True
+
+        return changed
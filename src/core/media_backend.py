@@ -0,0 +1,232 @@
+"""
+Media Backends
+Pluggable engines that enumerate, extract, fetch and postprocess TikTok media
+"""
+
+import os
+import sys
+from pathlib import Path
+from typing import Any, Protocol, runtime_checkable
+
+import yt_dlp
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from src.core.segmented_fetcher import SegmentError, SegmentedFetcher
+from src.utils.logger import get_logger
+
+DEFAULT_MEDIA_BACKEND = "yt-dlp"
+
+# Options used for listing a profile without resolving each video
+FLAT_OPTIONS = {
+    'quiet': True,
+    'no_warnings': True,
+    'extract_flat': True,
+    'skip_download': True,
+}
+
+
+@runtime_checkable
+class MediaBackend(Protocol):
+    """
+    Interface every download engine implements.
+
+    Options use yt-dlp's parameter names (``outtmpl``, ``format``,
+    ``progress_hooks``, ``postprocessors`` ...) since that is what
+    ``YTDLP_OPTIONS`` and the settings are written in; a backend reads the
+    keys it understands and ignores the rest.
+    """
+
+    name: str
+
+    def enumerate_profile(self, profile_url: str) -> dict:
+        """Return ``{"title": ..., "entries": [...]}`` for a profile without resolving each video."""
+        ...
+
+    def extract(self, url: str, options: dict) -> dict:
+        """Return the metadata for one video without downloading it."""
+        ...
+
+    def fetch(self, info: dict, options: dict) -> tuple[dict, Path]:
+        """Download the media described by ``info``; return the updated info and the file written."""
+        ...
+
+    def postprocess(self, info: dict, path: Path, options: dict) -> Path:
+        """Run the ``postprocessors`` in ``options`` on a fetched file; return the final file."""
+        ...
+
+
+class YtDlpBackend:
+    """Default backend: yt-dlp in-process"""
+
+    name = DEFAULT_MEDIA_BACKEND
+
+    def __init__(self, info_extractors=None, config=None):
+        """
+        Args:
+            info_extractors: yt-dlp extractor classes to use instead of the
+                built-in ones (e.g. the benchmark stub extractor)
+            config: ConfigManager for the segmented download settings
+        """
+        self.info_extractors = list(info_extractors or [])
+        self.config = config
+
+    def create_ydl(self, options):
+        """Create a YoutubeDL, registering custom extractors when configured"""
+        if not self.info_extractors:
+            return yt_dlp.YoutubeDL(options)  # type: ignore
+        ydl = yt_dlp.YoutubeDL(options, auto_init=False)  # type: ignore
+        for extractor_class in self.info_extractors:
+            # Extractors hold a reference to their YoutubeDL, so one instance each
+            ydl.add_info_extractor(extractor_class())
+        return ydl
+
+    def enumerate_profile(self, profile_url):
+        with self.create_ydl(dict(FLAT_OPTIONS)) as ydl:
+            info = ydl.extract_info(profile_url, download=False) or {}
+        return {
+            "title": info.get('title', 'Unknown'),
+            "uploader": info.get('uploader') or info.get('uploader_id'),
+            "entries": [entry for entry in info.get('entries') or [] if entry],
+        }
+
+    def extract(self, url, options):
+        with self.create_ydl(options) as ydl:
+            return ydl.extract_info(url, download=False, process=False)
+
+    def fetch(self, info, options):
+        # Postprocessors run in postprocess() so each stage can be timed and swapped
+        fetch_options = {key: value for key, value in options.items() if key != 'postprocessors'}
+        fetcher = self._segmented_fetcher(fetch_options)
+        with self.create_ydl(fetch_options) as ydl:
+            if fetcher is None:
+                info = ydl.process_ie_result(info, download=True)
+                return info, Path(ydl.prepare_filename(info))
+            
+            # Pick the format first so its direct URL and size are known
+            info = ydl.process_ie_result(info, download=False)
+            try:
+                path = self._fetch_segmented(ydl, fetcher, info, fetch_options)
+            except SegmentError:
+                # Retry the whole file over yt-dlp's single connection
+                path = None
+            if path is None:
+                ydl.process_info(info)
+                path = Path(info.get('filepath') or ydl.prepare_filename(info))
+            return info, path
+
+    def _segmented_fetcher(self, options):
+        """Return a SegmentedFetcher when segmented downloads apply to these options"""
+        if self.config is None or not self.config.get_setting("segmented_download", False):
+            return None
+        if options.get('ratelimit'):
+            # yt-dlp enforces the rate limit; parallel ranges would bypass it
+            return None
+        return SegmentedFetcher(connections=self.config.get_setting("segment_connections", 4))
+
+    def _fetch_segmented(self, ydl, fetcher, info, options):
+        """
+        Download the selected format over parallel ranges if it qualifies
+
+        Returns:
+            Path | None: The written file, or None to fall back to yt-dlp
+        """
+        url = info.get('url')
+        if not url or info.get('requested_formats') or info.get('protocol') not in ('http', 'https'):
+            return None
+        threshold = float(self.config.get_setting("segment_min_mb", 16)) * 1024 * 1024
+        known_size = info.get('filesize') or info.get('filesize_approx')
+        if known_size and known_size < threshold:
+            return None
+        
+        headers = dict(info.get('http_headers') or {})
+        cookie_header = getattr(ydl.cookiejar, 'get_cookie_header', lambda _url: None)(url)
+        if cookie_header:
+            headers['Cookie'] = cookie_header
+        total_size = fetcher.probe(url, headers)
+        if not total_size or total_size < threshold:
+            return None
+        
+        hooks = list(options.get('progress_hooks') or [])
+        
+        def progress_hook(status):
+            for hook in hooks:
+                hook(status)
+        
+        path = Path(ydl.prepare_filename(info))
+        fetcher.fetch(url, path, total_size, headers=headers, progress_hook=progress_hook)
+        info['filepath'] = str(path)
+        return path
+
+    def postprocess(self, info, path, options):
+        if not options.get('postprocessors'):
+            return path
+        with self.create_ydl(options) as ydl:
+            info = ydl.post_process(str(path), dict(info))
+        return Path(info.get('filepath') or path)
+
+
+# Backend name -> factory taking keyword arguments
+MEDIA_BACKENDS: dict[str, Any] = {
+    YtDlpBackend.name: YtDlpBackend,
+}
+
+
+def register_backend(name, factory):
+    """
+    Make a backend selectable by name (e.g. from the ``media_backend`` setting)
+
+    Args:
+        name: Backend name
+        factory: Callable returning a MediaBackend; receives ``config`` as a
+            keyword argument when created from the settings
+    """
+    MEDIA_BACKENDS[name] = factory
+
+
+def create_backend(name=None, **kwargs):
+    """
+    Instantiate a registered backend
+
+    Args:
+        name: Backend name (defaults to yt-dlp)
+        **kwargs: Passed to the backend factory
+
+    Returns:
+        MediaBackend: The backend instance
+
+    Raises:
+        ValueError: If no backend is registered under ``name``
+    """
+    name = name or DEFAULT_MEDIA_BACKEND
+    factory = MEDIA_BACKENDS.get(name)
+    if factory is None:
+        raise ValueError(f"Unknown media backend: {name}")
+    return factory(**kwargs)
+
+
+def resolve_backend(backend=None, config=None):
+    """
+    Return a backend instance from an instance, a name, or the settings
+
+    Falls back to yt-dlp (with a warning) when the configured name is unknown,
+    so a stale setting never stops the app from downloading.
+
+    Args:
+        backend: MediaBackend instance or registered name
+        config: ConfigManager used when ``backend`` is not given
+
+    Returns:
+        MediaBackend: The backend instance
+    """
+    if backend is not None and not isinstance(backend, str):
+        return backend
+    name = backend
+    if name is None and config is not None:
+        name = config.get_setting("media_backend", DEFAULT_MEDIA_BACKEND)
+    try:
+        return create_backend(name, config=config)
+    except ValueError:
+        if backend is not None:
+            raise
+        get_logger("MediaBackend").warning(f"Unknown media backend '{name}', using {DEFAULT_MEDIA_BACKEND}")
+        return create_backend(DEFAULT_MEDIA_BACKEND, config=config)
@@ -0,0 +1,116 @@
+"""
+Metadata Prefetch
+Resolve video metadata for upcoming queue items while earlier transfers run
+"""
+
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from src.utils.logger import get_logger
+from src.utils.metrics import get_metrics
+
+DEFAULT_PREFETCH_WINDOW = 4
+DEFAULT_PREFETCH_WORKERS = 2
+
+
+class MetadataPrefetcher:
+    """
+    Bounded lookahead of metadata extraction.
+
+    ``schedule()`` starts extracting the given URLs in the background until
+    ``window`` results are outstanding; ``take()`` hands a result to the
+    download step (waiting if it is still being resolved). A failed prefetch
+    yields None so the download extracts again and reports the real error.
+    """
+
+    def __init__(self, extract, window=DEFAULT_PREFETCH_WINDOW, workers=DEFAULT_PREFETCH_WORKERS):
+        """
+        Args:
+            extract: Callable taking a URL and returning its info dict
+            window: Most prefetched results held at once (0 = disabled)
+            workers: Extraction threads
+        """
+        self.extract = extract
+        self.window = max(0, int(window))
+        self._futures = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        self._executor = None
+        if self.window:
+            self._executor = ThreadPoolExecutor(
+                max_workers=max(1, min(workers, self.window)), thread_name_prefix="prefetch"
+            )
+        self.logger = get_logger("MetadataPrefetcher")
+
+    def schedule(self, urls):
+        """
+        Start prefetching URLs in order while the window has room
+
+        Args:
+            urls: Upcoming video URLs, soonest first
+        """
+        if not self.window:
+            return
+        with self._lock:
+            for url in urls:
+                if self._closed or len(self._futures) >= self.window:
+                    break
+                if url in self._futures:
+                    continue
+                self._futures[url] = self._executor.submit(self.extract, url)
+
+    def take(self, url):
+        """
+        Claim the prefetched info for a URL
+
+        Args:
+            url: Video URL about to be downloaded
+
+        Returns:
+            dict | None: The info, or None if it was not prefetched or failed
+        """
+        with self._lock:
+            future = self._futures.pop(url, None)
+        if future is None:
+            get_metrics().inc("prefetch_total", result="miss")
+            return None
+        try:
+            info = future.result()
+        except Exception as e:
+            self.logger.debug(f"Prefetch failed for {url}: {e}")
+            get_metrics().inc("prefetch_total", result="error")
+            return None
+        get_metrics().inc("prefetch_total", result="hit")
+        return info
+
+    def discard(self, url):
+        """
+        Drop a URL that will not be downloaded after all, freeing its window slot
+
+        Args:
+            url: Video URL passed to schedule()
+        """
+        with self._lock:
+            future = self._futures.pop(url, None)
+        if future is not None:
+            future.cancel()
+
+    def close(self):
+        """Drop unclaimed results and stop the extraction threads"""
+        with self._lock:
+            self._closed = True
+            futures, self._futures = list(self._futures.values()), {}
+        for future in futures:
+            future.cancel()
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
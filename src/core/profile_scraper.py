@@ -3,29 +3,44 @@ Profile Scraper
 Download multiple videos from TikTok profiles
 """
 
-import yt_dlp
 import os
 from pathlib import Path
 import sys
 import re
-from typing import Any
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 from config import DOWNLOADS_DIR
 from src.core.downloader import TikTokDownloader
+from src.core.scheduler import PRIORITY_BATCH
+from src.core.prefetch import DEFAULT_PREFETCH_WINDOW, MetadataPrefetcher
+from src.core.progress_model import get_progress_model
+from src.core.circuit_breaker import CircuitBreaker, update_ytdlp_if_enabled
+from src.core.failures import ERROR_CANCELLED, get_failure_store
+from src.core.library import LibraryScanner, extract_video_id_from_url
 from src.utils.validators import is_valid_tiktok_url
 from src.utils.config_manager import ConfigManager
 from src.utils.file_manager import FileManager
-from src.utils.logger import get_logger
+from src.utils.logger import get_logger, run_context
+from src.utils.metrics import get_metrics, metrics_export_session
+from src.utils.profiling import profile_session
+from src.utils.timing import collect_stages, stage_span
+from src.utils.tracing import trace_session
 
 
 class ProfileScraper:
     """Handle bulk downloads from TikTok profiles"""
     
-    def __init__(self):
-        self.downloader = TikTokDownloader()
+    def __init__(self, backend=None):
+        """
+        Args:
+            backend: MediaBackend instance or registered backend name
+                (defaults to the "media_backend" setting)
+        """
+        self.downloader = TikTokDownloader(backend=backend)
+        self.backend = self.downloader.backend
         self.config = ConfigManager()
         self.file_manager = FileManager()
+        self.library = LibraryScanner(self.config)
         self.logger = get_logger("ProfileScraper")
     
     def get_profile_video_count(self, profile_url):
@@ -39,20 +54,7 @@ class ProfileScraper:
             int: Number of videos
         """
         try:
-            ydl_opts: dict[str, Any] = {
-                'quiet': True,
-                'no_warnings': True,
-                'extract_flat': True,
-                'skip_download': True,
-            }
-            
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(profile_url, download=False)
-                
-                if 'entries' in info:
-                    return len(list(info['entries']))
-                
-                return 0
+            return len(self.backend.enumerate_profile(profile_url)["entries"])
                 
         except Exception as e:
             raise Exception(f"Failed to fetch profile info: {str(e)}")
@@ -75,7 +77,8 @@ class ProfileScraper:
     
     def download_from_profile(self, profile_url, limit=0, create_folder=True,
                              convert_to_mp3=False, skip_existing=True,
-                             progress_callback=None, pause_check=None, stop_check=None):
+                             progress_callback=None, pause_check=None, stop_check=None,
+                             byte_progress_callback=None, priority=PRIORITY_BATCH, cancel_token=None):
         """
         Download videos from a TikTok profile
         
@@ -88,61 +91,204 @@ class ProfileScraper:
             progress_callback: Function to call with progress updates
             pause_check: Function that returns True if should pause
             stop_check: Function that returns True if should stop
+            byte_progress_callback: Function called with DownloadProgress events
+            priority: Scheduler class for every video (PRIORITY_BACKGROUND for bulk dumps)
+            cancel_token: CancellationToken; pauses and stops take effect inside
+                the current transfer instead of after it (replaces the checks)
         
         Returns:
             dict: Download results
         """
+        if cancel_token:
+            pause_check, stop_check = cancel_token.is_paused, cancel_token.is_cancelled
+        with run_context(), \
+                metrics_export_session(self.config), \
+                trace_session(self.config, f"profile_{self.extract_username(profile_url)}", self.logger), \
+                profile_session(self.config, f"profile_{self.extract_username(profile_url)}", self.logger) as profiler, \
+                collect_stages() as run_timer:
+            result = self._download_from_profile(
+                profile_url, limit, create_folder, convert_to_mp3, skip_existing,
+                progress_callback, pause_check, stop_check, byte_progress_callback, profiler, priority,
+                cancel_token,
+            )
+        self.logger.info(run_timer.format_report(f"Profile run stage timings ({profile_url})"))
+        return result
+    
+    def resolve_output_path(self, username, create_folder=True):
+        """
+        Return the folder a profile downloads into, creating it if needed
+        
+        Args:
+            username: Profile handle without the @
+            create_folder: Use a per-profile @username subfolder
+        
+        Returns:
+            Path: Output folder
+        """
+        download_path = self.config.get_setting("download_path") or DOWNLOADS_DIR
+        output_path = Path(download_path)
+        
+        if create_folder:
+            output_path = output_path / f"@{username}"
+            output_path.mkdir(parents=True, exist_ok=True)
+        
+        return output_path
+    
+    def list_videos(self, profile_url, limit=0):
+        """
+        Enumerate a profile's videos with the size hints the listing carries
+        
+        Args:
+            profile_url: TikTok profile URL
+            limit: Number of videos to return (0 = all)
+        
+        Returns:
+            list: Dicts with "url", "id", "duration" and "filesize_approx"
+                (None when the listing does not say), in listing order
+        """
+        username = self.extract_username(profile_url)
+        videos = []
+        
+        with stage_span("enumerate"):
+            entries = self.backend.enumerate_profile(profile_url)["entries"]
+        
+        # Apply limit
+        if limit > 0:
+            entries = entries[:limit]
+        
+        for entry in entries:
+            if 'url' in entry:
+                url = entry['url']
+            elif 'id' in entry:
+                # Construct URL from ID
+                url = f"https://www.tiktok.com/@{username}/video/{entry['id']}"
+            else:
+                continue
+            videos.append({
+                "url": url,
+                "id": entry.get('id'),
+                "duration": entry.get('duration'),
+                "filesize_approx": entry.get('filesize_approx') or entry.get('filesize'),
+            })
+        
+        return videos
+    
+    def list_video_urls(self, profile_url, limit=0):
+        """
+        Enumerate a profile's video URLs
+        
+        Args:
+            profile_url: TikTok profile URL
+            limit: Number of videos to return (0 = all)
+        
+        Returns:
+            list: Video URLs in the order the backend lists them
+        """
+        return [video["url"] for video in self.list_videos(profile_url, limit)]
+    
+    def _create_breaker(self, progress_callback):
+        """Circuit breaker that reports trips through the profile progress callback"""
+        def on_trip(signature):
+            if progress_callback:
+                progress_callback(
+                    message=f"⏸ Paused: every video fails to extract ({signature[:80]}). Update yt-dlp.",
+                    status="paused"
+                )
+            update_ytdlp_if_enabled(self.config, self.logger)
+        
+        def on_reset():
+            if progress_callback:
+                progress_callback(message="▶ Extraction works again, resuming", status="resumed")
+        
+        return CircuitBreaker.from_config(self.config, on_trip=on_trip, on_reset=on_reset)
+    
+    def _download_from_profile(self, profile_url, limit, create_folder, convert_to_mp3, skip_existing,
+                               progress_callback, pause_check, stop_check, byte_progress_callback, profiler,
+                               priority, cancel_token=None):
+        """Body of download_from_profile, run inside a stage collector"""
+        prefetcher = None
+        progress_model = get_progress_model()
+        # Videos listed as queued in the download manager by this run
+        wanted = []
         try:
             # Extract username for folder name
             username = self.extract_username(profile_url)
-            
-            # Prepare output path
-            download_path = self.config.get_setting("download_path") or DOWNLOADS_DIR
-            output_path = Path(download_path)
-            
-            if create_folder:
-                output_path = output_path / f"@{username}"
-                output_path.mkdir(parents=True, exist_ok=True)
-            
-            # Get video list
-            ydl_opts = {
-                'quiet': True,
-                'no_warnings': True,
-                'extract_flat': True,
-                'skip_download': True,
-            }
-            
-            video_urls = []
-            
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(profile_url, download=False)
-                
-                if 'entries' in info:
-                    entries = list(info['entries'])
-                    
-                    # Apply limit
-                    if limit > 0:
-                        entries = entries[:limit]
-                    
-                    for entry in entries:
-                        if entry and 'url' in entry:
-                            video_urls.append(entry['url'])
-                        elif entry and 'id' in entry:
-                            # Construct URL from ID
-                            video_urls.append(f"https://www.tiktok.com/@{username}/video/{entry['id']}")
+            output_path = self.resolve_output_path(username, create_folder)
+            video_urls = self.list_video_urls(profile_url, limit)
             
             # Download videos
             downloaded = 0
             failed = 0
             skipped = 0
             
+            # Video IDs already on disk, recovered from filenames in one walk
+            existing_ids = self.library.scan(output_path) if skip_existing else {}
+            
+            metrics = get_metrics()
+            
+            # Videos an earlier run found removed or private
+            failure_store = get_failure_store() if self.config.get_setting("skip_known_failures", True) else None
+            
+            # Videos still to fetch, resolved a few ahead while the current one transfers
+            wanted = [
+                url for url in video_urls
+                if extract_video_id_from_url(url) not in existing_ids
+                and not (failure_store and failure_store.get(url))
+            ]
+            # Listed as queued in the download manager until downloaded or the run stops
+            progress_model.enqueue_many([(url, "") for url in wanted])
+            window = int(self.downloader.config.get_setting("prefetch_window", DEFAULT_PREFETCH_WINDOW) or 0)
+            prefetcher = MetadataPrefetcher(self.downloader.prefetch_info, window)
+            next_wanted = 0
+            breaker = self._create_breaker(progress_callback)
+            
             for idx, video_url in enumerate(video_urls, 1):
+                metrics.set("queue_depth", len(video_urls) - idx, queue="profile")
+                if idx > 1:
+                    profiler.tick()
+                
                 # Check if should stop
                 if stop_check and stop_check():
                     break
                 
+                video_id = extract_video_id_from_url(video_url)
+                if video_id and video_id in existing_ids:
+                    skipped += 1
+                    if progress_callback:
+                        progress_callback(
+                            message=f"⏭ Skipped video {idx} (already downloaded)",
+                            current=idx,
+                            total=len(video_urls),
+                            video_name=f"Video {idx}",
+                            status="skipped"
+                        )
+                    continue
+                
+                known_failure = failure_store.get(video_url) if failure_store else None
+                if known_failure:
+                    skipped += 1
+                    if progress_callback:
+                        progress_callback(
+                            message=f"⏭ Skipped video {idx} ({known_failure.get('error_class')} in an earlier run)",
+                            current=idx,
+                            total=len(video_urls),
+                            video_name=f"Video {idx}",
+                            status="skipped"
+                        )
+                    continue
+                
+                next_wanted += 1
+                prefetcher.schedule(wanted[next_wanted:next_wanted + prefetcher.window])
+                
+                # Wait out a tripped breaker without losing our place
+                if not breaker.wait_until_allowed(stop_check):
+                    break
+                
                 # Handle pause
-                if pause_check:
+                if cancel_token:
+                    if not cancel_token.wait_if_paused():
+                        break
+                elif pause_check:
                     while pause_check() and not (stop_check and stop_check()):
                         import time
                         time.sleep(0.1)
@@ -164,8 +310,15 @@ class ProfileScraper:
                         url=video_url,
                         output_path=str(output_path),
                         convert_to_mp3=convert_to_mp3,
-                        source="profile"
+                        source="profile",
+                        progress_callback=byte_progress_callback,
+                        priority=priority,
+                        info=prefetcher.take(video_url),
+                        cancel_token=cancel_token,
                     )
+                    if result.get("error_class") == ERROR_CANCELLED:
+                        break
+                    breaker.record(result)
                     
                     if result["success"]:
                         downloaded += 1
@@ -195,8 +348,9 @@ class ProfileScraper:
                 
                 except Exception as e:
                     failed += 1
-                    # Log detailed exception for debugging
-                    self.logger.error(f"Exception downloading video {idx} ({video_url}): {str(e)}", exc_info=True)
+                    # One line per failure; the traceback only at debug level
+                    self.logger.error(f"Exception downloading video {idx} ({video_url}): {str(e)}")
+                    self.logger.debug("Traceback for video %s", idx, exc_info=True)
                     
                     # Show simple status to user
                     if progress_callback:
@@ -208,6 +362,8 @@ class ProfileScraper:
                             status="error"
                         )
             
+            metrics.set("queue_depth", 0, queue="profile")
+            
             return {
                 "success": True,
                 "downloaded": downloaded,
@@ -219,6 +375,12 @@ class ProfileScraper:
             
         except Exception as e:
             raise Exception(f"Profile download failed: {str(e)}")
+        
+        finally:
+            # Stop the extraction threads and unlist unstarted videos however the run ends
+            if prefetcher is not None:
+                prefetcher.close()
+            progress_model.withdraw(wanted)
     
     def get_profile_info(self, profile_url):
         """
@@ -231,23 +393,15 @@ class ProfileScraper:
             dict: Profile information
         """
         try:
-            ydl_opts = {
-                'quiet': True,
-                'no_warnings': True,
-                'extract_flat': True,
-                'skip_download': True,
+            info = self.backend.enumerate_profile(profile_url)
+            
+            return {
+                "success": True,
+                "username": self.extract_username(profile_url),
+                "title": info["title"],
+                "video_count": len(info["entries"]),
             }
             
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(profile_url, download=False)
-                
-                return {
-                    "success": True,
-                    "username": self.extract_username(profile_url),
-                    "title": info.get('title', 'Unknown'),
-                    "video_count": len(list(info.get('entries', []))),
-                }
-                
         except Exception as e:
             return {
                 "success": False,
@@ -0,0 +1,176 @@
+"""
+Download Progress
+Turn yt-dlp progress hooks into rate-limited DownloadProgress events
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from src.core.app_models import DownloadProgress
+
+
+STAGE_QUEUED = "queued"
+STAGE_EXTRACTING = "extracting"
+STAGE_DOWNLOADING = "downloading"
+STAGE_POSTPROCESSING = "postprocessing"
+STAGE_FINISHED = "finished"
+STAGE_ERROR = "error"
+STAGE_CANCELLED = "cancelled"
+STAGE_SKIPPED = "skipped"
+
+
+class ProgressTracker:
+    """Convert yt-dlp hook dicts into DownloadProgress events for one task"""
+
+    def __init__(self, callback, task_id, min_interval=0.25, smoothing=0.3):
+        """
+        Args:
+            callback: Function called with a DownloadProgress
+            task_id: Identifier of the download (usually its URL)
+            min_interval: Minimum seconds between byte updates
+            smoothing: Weight of the newest sample in the smoothed rate
+        """
+        self.callback = callback
+        self.task_id = task_id
+        self.min_interval = min_interval
+        self.smoothing = smoothing
+        self.stage_name = None
+        self._lock = threading.Lock()
+        self._last_emit = 0.0
+        self._last_sample = None
+        self._smoothed_speed = None
+        self._bytes_done = 0
+        self._bytes_total = None
+        self._filename = ""
+
+    def stage(self, name):
+        """Report a stage transition (always delivered, never rate-limited)."""
+        with self._lock:
+            self.stage_name = name
+            event = self._build(None, None)
+        self._emit(event)
+
+    def hook(self, status):
+        """yt-dlp ``progress_hooks`` entry point."""
+        state = status.get("status")
+        if state == "finished":
+            with self._lock:
+                self._bytes_done = status.get("downloaded_bytes") or status.get("total_bytes") or self._bytes_done
+                self._bytes_total = status.get("total_bytes") or self._bytes_done or self._bytes_total
+                self._filename = status.get("filename") or self._filename
+                self.stage_name = STAGE_DOWNLOADING
+                event = self._build(0.0, 0.0)
+            self._emit(event)
+            return
+        if state == "error":
+            self.stage(STAGE_ERROR)
+            return
+        if state != "downloading":
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            done = status.get("downloaded_bytes") or 0
+            self._bytes_done = done
+            self._bytes_total = status.get("total_bytes") or status.get("total_bytes_estimate") or self._bytes_total
+            self._filename = status.get("filename") or self._filename
+            self.stage_name = STAGE_DOWNLOADING
+
+            speed = None
+            if self._last_sample is not None:
+                last_time, last_done = self._last_sample
+                elapsed = now - last_time
+                if elapsed > 0 and done >= last_done:
+                    speed = (done - last_done) / elapsed
+            if speed is None:
+                speed = status.get("speed")
+            self._last_sample = (now, done)
+
+            if speed is not None:
+                if self._smoothed_speed is None:
+                    self._smoothed_speed = speed
+                else:
+                    self._smoothed_speed += self.smoothing * (speed - self._smoothed_speed)
+
+            if now - self._last_emit < self.min_interval:
+                return
+            event = self._build(speed, None)
+        self._emit(event)
+
+    def postprocessor_hook(self, status):
+        """yt-dlp ``postprocessor_hooks`` entry point."""
+        if status.get("status") == "started" and self.stage_name != STAGE_POSTPROCESSING:
+            self.stage(STAGE_POSTPROCESSING)
+
+    def finish(self, filename=None):
+        """Report the final state of the task."""
+        with self._lock:
+            if filename:
+                self._filename = str(filename)
+            self.stage_name = STAGE_FINISHED
+            if self._bytes_total is None and self._bytes_done:
+                self._bytes_total = self._bytes_done
+            event = self._build(0.0, 0.0)
+        self._emit(event)
+
+    def _build(self, speed, eta):
+        if eta is None and self._smoothed_speed and self._bytes_total:
+            eta = max(0.0, (self._bytes_total - self._bytes_done) / self._smoothed_speed)
+        return DownloadProgress(
+            task_id=self.task_id,
+            stage=self.stage_name or STAGE_EXTRACTING,
+            bytes_done=self._bytes_done,
+            bytes_total=self._bytes_total,
+            speed=speed,
+            smoothed_speed=self._smoothed_speed,
+            eta=eta,
+            filename=self._filename,
+        )
+
+    def _emit(self, event):
+        self._last_emit = time.monotonic()
+        try:
+            self.callback(event)
+        except Exception:
+            # A failing listener must not abort the transfer itself.
+            pass
+
+
+def format_bytes(size):
+    """Format a byte count like FileManager.get_file_size."""
+    size = float(size or 0)
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if size < 1024.0:
+            return f"{size:.1f} {unit}"
+        size /= 1024.0
+    return f"{size:.1f} TB"
+
+
+def describe_progress(progress):
+    """
+    Build a short human-readable line for a DownloadProgress
+
+    Args:
+        progress: DownloadProgress event
+
+    Returns:
+        str: e.g. "12.3 MB / 45.6 MB • 2.1 MB/s • ETA 0:15"
+    """
+    if progress.stage == STAGE_EXTRACTING:
+        return "Fetching video information..."
+    if progress.stage == STAGE_POSTPROCESSING:
+        return "Processing media..."
+
+    parts = [format_bytes(progress.bytes_done)]
+    if progress.bytes_total:
+        parts[0] += f" / {format_bytes(progress.bytes_total)}"
+    if progress.stage == STAGE_DOWNLOADING:
+        if progress.smoothed_speed:
+            parts.append(f"{format_bytes(progress.smoothed_speed)}/s")
+        if progress.eta is not None:
+            minutes, seconds = divmod(int(progress.eta), 60)
+            parts.append(f"ETA {minutes}:{seconds:02d}")
+    return " • ".join(parts)
@@ -0,0 +1,242 @@
+"""
+Progress Model
+Shared state of every queued and running download, read by the download manager view
+"""
+
+import dataclasses
+import itertools
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from src.core.app_models import TaskProgress
+from src.core.failures import ERROR_CANCELLED
+from src.core.progress import (
+    STAGE_CANCELLED,
+    STAGE_DOWNLOADING,
+    STAGE_ERROR,
+    STAGE_EXTRACTING,
+    STAGE_FINISHED,
+    STAGE_POSTPROCESSING,
+    STAGE_QUEUED,
+    STAGE_SKIPPED,
+)
+from src.utils.config_manager import ConfigManager
+from src.utils.logger import get_logger
+
+ACTIVE_STAGES = {STAGE_EXTRACTING, STAGE_DOWNLOADING, STAGE_POSTPROCESSING}
+DEFAULT_KEEP_FINISHED = 500
+
+
+class ProgressModel:
+    """
+    Thread-safe table of download tasks, one TaskProgress per task id.
+
+    Queue owners (the batch runner, the profile scraper) list tasks as they
+    are queued; download_video() moves them through the transfer stages and
+    finishes them. Rows are immutable snapshots, so views can read a slice
+    with rows() without copying or holding the lock. Every change bumps
+    ``version`` and notifies subscribers; views use that to redraw only when
+    something changed. Only the newest ``keep_finished`` finished rows are
+    kept so a long session does not grow without bound.
+    """
+
+    def __init__(self, keep_finished=DEFAULT_KEEP_FINISHED):
+        """
+        Args:
+            keep_finished: Finished, failed and skipped rows kept for display
+        """
+        self.keep_finished = max(0, int(keep_finished))
+        self.version = 0
+        self._tasks = {}
+        self._active = set()
+        self._finished = {}
+        self._listeners = []
+        self._lock = threading.Lock()
+        self.logger = get_logger("ProgressModel")
+
+    def __len__(self):
+        with self._lock:
+            return len(self._tasks)
+
+    def subscribe(self, listener):
+        """
+        Call ``listener()`` after every change, from the thread that made it
+
+        Returns:
+            callable: Function that removes the listener again
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+        def unsubscribe():
+            with self._lock:
+                if listener in self._listeners:
+                    self._listeners.remove(listener)
+
+        return unsubscribe
+
+    def enqueue(self, task_id, title=""):
+        """List a task as queued; a finished or failed task starts over"""
+        self.enqueue_many([(task_id, title)])
+
+    def enqueue_many(self, tasks):
+        """
+        List many tasks as queued in one change
+
+        Args:
+            tasks: (task_id, title) pairs, in queue order
+        """
+        with self._lock:
+            for task_id, title in tasks:
+                current = self._tasks.get(task_id)
+                if current is not None and current.stage in ACTIVE_STAGES:
+                    continue
+                self._finished.pop(task_id, None)
+                self._tasks[task_id] = TaskProgress(
+                    task_id=task_id, title=title or (current.title if current else "")
+                )
+        self._changed()
+
+    def apply(self, progress):
+        """
+        Record a DownloadProgress event
+
+        Args:
+            progress: DownloadProgress from a ProgressTracker
+        """
+        with self._lock:
+            current = self._tasks.get(progress.task_id) or TaskProgress(task_id=progress.task_id)
+            self._finished.pop(progress.task_id, None)
+            self._active.add(progress.task_id)
+            self._tasks[progress.task_id] = dataclasses.replace(
+                current,
+                title=current.title or os.path.basename(progress.filename or ""),
+                stage=progress.stage,
+                bytes_done=progress.bytes_done,
+                bytes_total=progress.bytes_total,
+                speed=progress.smoothed_speed if progress.smoothed_speed is not None else progress.speed,
+                eta=progress.eta,
+            )
+        self._changed()
+
+    def finish(self, task_id, result):
+        """
+        Record the outcome of a download
+
+        Args:
+            task_id: Task id used for its progress events
+            result: download_video() result dict
+        """
+        if result.get("success"):
+            stage = STAGE_FINISHED
+        elif result.get("error_class") == ERROR_CANCELLED:
+            stage = STAGE_CANCELLED
+        else:
+            stage = STAGE_ERROR
+        self._settle(task_id, stage, result.get("title") or "", result.get("error") or "")
+
+    def skip(self, task_id, reason=""):
+        """Mark a queued task as skipped without downloading it"""
+        self._settle(task_id, STAGE_SKIPPED, "", reason)
+
+    def withdraw(self, task_ids):
+        """Drop tasks that are still queued, e.g. after the run that queued them stopped"""
+        with self._lock:
+            for task_id in task_ids:
+                current = self._tasks.get(task_id)
+                if current is not None and current.stage == STAGE_QUEUED:
+                    del self._tasks[task_id]
+        self._changed()
+
+    def clear_finished(self):
+        """Drop every finished, failed, cancelled and skipped row"""
+        with self._lock:
+            for task_id in self._finished:
+                self._tasks.pop(task_id, None)
+            self._finished.clear()
+        self._changed()
+
+    def rows(self, start, count):
+        """
+        Return a slice of the table in listing order
+
+        Args:
+            start: Index of the first row
+            count: Most rows to return
+
+        Returns:
+            list: TaskProgress snapshots
+        """
+        with self._lock:
+            return list(itertools.islice(self._tasks.values(), max(0, start), max(0, start) + max(0, count)))
+
+    def totals(self):
+        """
+        Summarise the table
+
+        Returns:
+            dict: Row counts per state ("finished" includes skipped and cancelled
+                rows) and aggregate transfer speed in bytes/s
+        """
+        with self._lock:
+            active = [self._tasks[task_id] for task_id in self._active]
+            failed = sum(1 for task_id in self._finished if self._tasks[task_id].stage == STAGE_ERROR)
+            return {
+                "total": len(self._tasks),
+                "active": len(active),
+                "queued": len(self._tasks) - len(active) - len(self._finished),
+                "finished": len(self._finished) - failed,
+                "failed": failed,
+                "speed": sum(task.speed or 0 for task in active if task.stage == STAGE_DOWNLOADING),
+            }
+
+    def _settle(self, task_id, stage, title, error):
+        with self._lock:
+            current = self._tasks.get(task_id) or TaskProgress(task_id=task_id)
+            self._active.discard(task_id)
+            bytes_done = current.bytes_done
+            if stage == STAGE_FINISHED and current.bytes_total:
+                bytes_done = current.bytes_total
+            self._tasks[task_id] = dataclasses.replace(
+                current,
+                title=title or current.title,
+                stage=stage,
+                bytes_done=bytes_done,
+                speed=None,
+                eta=None,
+                error=str(error)[:200],
+            )
+            self._finished.pop(task_id, None)
+            self._finished[task_id] = True
+            while len(self._finished) > self.keep_finished:
+                oldest = next(iter(self._finished))
+                del self._finished[oldest]
+                del self._tasks[oldest]
+        self._changed()
+
+    def _changed(self):
+        with self._lock:
+            self.version += 1
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener()
+            except Exception as e:
+                # A closed view must not break the download reporting to it
+                self.logger.debug(f"Progress listener failed: {e}")
+
+
+_model = None
+_model_lock = threading.Lock()
+
+
+def get_progress_model():
+    """Return the process-wide ProgressModel."""
+    global _model
+    with _model_lock:
+        if _model is None:
+            keep = ConfigManager().get_setting("manager_keep_finished", DEFAULT_KEEP_FINISHED)
+            _model = ProgressModel(keep_finished=DEFAULT_KEEP_FINISHED if keep is None else keep)
+        return _model
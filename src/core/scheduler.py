@@ -0,0 +1,173 @@
+"""
+Download Scheduler
+Hand out download slots by priority so interactive work never waits behind batches
+"""
+
+import heapq
+import itertools
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from src.core.concurrency import AdaptiveConcurrency
+from src.utils.config_manager import ConfigManager
+from src.utils.metrics import get_metrics
+from src.utils.timing import StageTimer, record_stage
+
+# Lower value = served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 1
+PRIORITY_BACKGROUND = 2
+
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_BATCH: "batch",
+    PRIORITY_BACKGROUND: "background",
+}
+
+DEFAULT_SLOTS = 2
+
+
+class DownloadScheduler:
+    """
+    Priority slot pool shared by every download in the process.
+
+    Each download holds a slot for one item, so a batch gives its slot back
+    between items and a waiting interactive download takes the next free one.
+    Within a priority class, slots are handed out first come, first served.
+    When "adaptive_concurrency" is on, the slot count follows the controller
+    instead of "max_concurrent_downloads".
+    """
+
+    def __init__(self, config=None, slots=None, controller=None):
+        """
+        Args:
+            config: Object with get_setting(); "max_concurrent_downloads" is
+                re-read on every acquire so changes apply immediately
+            slots: Fixed slot count, overriding the setting
+            controller: AdaptiveConcurrency fed by observe()
+        """
+        self.config = config
+        self.slots = slots
+        self.controller = controller
+        self._active = 0
+        self._waiting = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._wait_timer = StageTimer()
+
+    def capacity(self):
+        """Return the number of downloads allowed to run at once"""
+        if self.slots is not None:
+            return max(1, int(self.slots))
+        if self.adaptive():
+            return self.controller.limit
+        if self.config is None:
+            return DEFAULT_SLOTS
+        try:
+            return max(1, int(self.config.get_setting("max_concurrent_downloads", DEFAULT_SLOTS)))
+        except (TypeError, ValueError):
+            return DEFAULT_SLOTS
+
+    def acquire(self, priority=PRIORITY_INTERACTIVE):
+        """
+        Block until a slot is free and no higher-priority request is waiting
+
+        Args:
+            priority: One of the PRIORITY_* constants
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        name = PRIORITY_NAMES.get(priority, str(priority))
+        metrics = get_metrics()
+        started = time.perf_counter()
+        ticket = (priority, next(self._sequence))
+        with self._condition:
+            heapq.heappush(self._waiting, ticket)
+            metrics.inc("scheduler_waiting", priority=name)
+            try:
+                while self._waiting[0] != ticket or self._active >= self.capacity():
+                    self._condition.wait()
+            finally:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                metrics.dec("scheduler_waiting", priority=name)
+                # The next ticket may already fit in a free slot
+                self._condition.notify_all()
+            self._active += 1
+        waited = time.perf_counter() - started
+        self._wait_timer.record(name, waited)
+        record_stage(f"queue_wait_{name}", waited, started)
+        return waited
+
+    def release(self):
+        """Return a slot and wake the waiters"""
+        with self._condition:
+            self._active = max(0, self._active - 1)
+            self._condition.notify_all()
+
+    def adaptive(self):
+        """Return True when the controller sets the slot count"""
+        if self.controller is None:
+            return False
+        return self.config is None or bool(self.config.get_setting("adaptive_concurrency", False))
+
+    def observe(self, latency, error=None):
+        """
+        Report a finished download to the concurrency controller
+
+        Args:
+            latency: Seconds the download held its slot
+            error: Error message if it failed, else None
+        """
+        if not self.adaptive():
+            return
+        self.controller.observe(latency, error)
+        with self._condition:
+            # A raised limit may admit waiting downloads
+            self._condition.notify_all()
+
+    @contextmanager
+    def slot(self, priority=PRIORITY_INTERACTIVE):
+        """Hold a slot for the enclosed block"""
+        self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    @contextmanager
+    def yielded(self, priority=PRIORITY_INTERACTIVE):
+        """Give a held slot to waiting downloads for the enclosed block, then queue for one again"""
+        self.release()
+        try:
+            yield
+        finally:
+            self.acquire(priority)
+
+    def wait_stats(self):
+        """
+        Summarise queue wait times per priority class
+
+        Returns:
+            dict: class name -> {"count", "total", "mean", "p50", "p95", "p99", "max"}
+        """
+        return self._wait_timer.stats()
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """Return the process-wide DownloadScheduler, sized from the app settings."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            config = ConfigManager()
+            _scheduler = DownloadScheduler(config, controller=AdaptiveConcurrency(config))
+        return _scheduler
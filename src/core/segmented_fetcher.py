@@ -0,0 +1,246 @@
+"""
+Segmented Fetcher
+Download one media file over several parallel HTTP Range connections
+"""
+
+import os
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+CONTENT_RANGE_RE = re.compile(r"bytes\s+(\d+)-(\d+)/(\d+|\*)")
+
+
+class SegmentError(Exception):
+    """A segment could not be completed within its retry budget"""
+
+
+class RangeNotSupportedError(SegmentError):
+    """The server answered a Range request with the whole body"""
+
+
+class SegmentedFetcher:
+    """Fetch a direct media URL in N byte ranges written straight into place"""
+
+    def __init__(self, connections=4, max_retries=3, chunk_size=256 * 1024, timeout=30, retry_delay=0.5):
+        """
+        Args:
+            connections: Parallel Range requests per file
+            max_retries: Attempts per segment after the first
+            chunk_size: Bytes read from a response per write
+            timeout: Socket timeout in seconds
+            retry_delay: Base delay before retrying a segment (doubles per attempt)
+        """
+        self.connections = max(1, int(connections))
+        self.max_retries = max(0, int(max_retries))
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.retry_delay = retry_delay
+
+    def probe(self, url, headers=None):
+        """
+        Check Range support and return the total size
+
+        Args:
+            url: Direct media URL
+            headers: HTTP headers to send (e.g. from yt-dlp ``http_headers``)
+
+        Returns:
+            int | None: Size in bytes, or None if the server cannot serve ranges
+        """
+        request = urllib.request.Request(url, headers={**(headers or {}), "Range": "bytes=0-0"})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                if response.status != 206:
+                    return None
+                match = CONTENT_RANGE_RE.match(response.headers.get("Content-Range", ""))
+        except (urllib.error.URLError, OSError, ValueError):
+            return None
+        if not match or match.group(3) == "*":
+            return None
+        return int(match.group(3))
+
+    def fetch(self, url, destination, total_size, headers=None, progress_hook=None):
+        """
+        Download ``url`` to ``destination`` using parallel ranges
+
+        The file is preallocated and every segment writes at its own offset,
+        so no reassembly pass is needed. A failed segment resumes from the
+        last byte it wrote without disturbing the others.
+
+        Args:
+            url: Direct media URL
+            destination: Final file path
+            total_size: Size reported by probe()
+            headers: HTTP headers to send with every request
+            progress_hook: Called with yt-dlp style progress dicts
+
+        Returns:
+            Path: The written file
+
+        Raises:
+            SegmentError: If a segment fails or the size does not verify
+        """
+        destination = Path(destination)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        segments = self._split(total_size)
+        progress = _ProgressAggregator(destination, total_size, progress_hook)
+
+        fd = os.open(destination, os.O_RDWR | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+        try:
+            self._preallocate(fd, total_size)
+            writer = _PositionalWriter(fd)
+            abort = threading.Event()
+            with ThreadPoolExecutor(max_workers=len(segments), thread_name_prefix="segment") as pool:
+                futures = [
+                    pool.submit(self._fetch_segment, url, headers or {}, start, end, writer, progress, abort)
+                    for start, end in segments
+                ]
+                try:
+                    written = sum(future.result() for future in futures)
+                except BaseException:
+                    # Stop the surviving segments instead of finishing a doomed file
+                    abort.set()
+                    raise
+            if written != total_size or os.fstat(fd).st_size != total_size:
+                raise SegmentError(f"Size mismatch: expected {total_size} bytes, wrote {written}")
+            os.fsync(fd)
+        except BaseException:
+            os.close(fd)
+            destination.unlink(missing_ok=True)
+            progress.error()
+            raise
+        os.close(fd)
+        progress.finished()
+        return destination
+
+    def _split(self, total_size):
+        """Return inclusive (start, end) byte ranges, one per connection"""
+        count = max(1, min(self.connections, total_size // self.chunk_size or 1))
+        step = -(-total_size // count)
+        return [(start, min(start + step, total_size) - 1) for start in range(0, total_size, step)]
+
+    def _fetch_segment(self, url, headers, start, end, writer, progress, abort):
+        """Fetch one range, resuming from the last written byte on failure"""
+        position = start
+        attempt = 0
+        while position <= end and not abort.is_set():
+            request = urllib.request.Request(url, headers={**headers, "Range": f"bytes={position}-{end}"})
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    if response.status != 206:
+                        raise RangeNotSupportedError(f"Server ignored Range request (HTTP {response.status})")
+                    while position <= end and not abort.is_set():
+                        chunk = response.read(min(self.chunk_size, end - position + 1))
+                        if not chunk:
+                            break
+                        writer.write(chunk, position)
+                        position += len(chunk)
+                        progress.add(len(chunk))
+                if position <= end and not abort.is_set():
+                    raise SegmentError(f"Connection closed at byte {position} of range {start}-{end}")
+            except RangeNotSupportedError:
+                raise
+            except (urllib.error.URLError, OSError, SegmentError) as e:
+                attempt += 1
+                if attempt > self.max_retries or abort.is_set():
+                    raise SegmentError(f"Range {start}-{end} failed after {attempt} attempts: {e}") from e
+                abort.wait(self.retry_delay * (2 ** (attempt - 1)))
+        return position - start
+
+    @staticmethod
+    def _preallocate(fd, size):
+        """Reserve the full file size up front to avoid fragmentation"""
+        if hasattr(os, "posix_fallocate"):
+            try:
+                os.posix_fallocate(fd, 0, size)
+                return
+            except OSError:
+                pass
+        os.ftruncate(fd, size)
+
+
+class _PositionalWriter:
+    """Write at absolute offsets; os.pwrite where available, a locked seek elsewhere"""
+
+    def __init__(self, fd):
+        self.fd = fd
+        self._lock = None if hasattr(os, "pwrite") else threading.Lock()
+
+    def write(self, data, offset):
+        view = memoryview(data)
+        while view:
+            if self._lock is None:
+                written = os.pwrite(self.fd, view, offset)
+            else:
+                with self._lock:
+                    os.lseek(self.fd, offset, os.SEEK_SET)
+                    written = os.write(self.fd, view)
+            view = view[written:]
+            offset += written
+
+
+class _ProgressAggregator:
+    """
+    Merge per-segment byte counts into yt-dlp style progress hook calls
+
+    Counters are kept under a short lock; the hook runs outside it, because
+    hooks may sleep (bandwidth cap) or wait out a pause. Hook calls are still
+    serialised, so a throttling sleep holds back the other segments' next
+    report and the cap applies to the whole file.
+    """
+
+    def __init__(self, destination, total_size, hook, min_interval=0.1):
+        self.destination = str(destination)
+        self.total_size = total_size
+        self.hook = hook
+        self.min_interval = min_interval
+        self.downloaded = 0
+        self.started = time.monotonic()
+        self._last_emit = 0.0
+        self._lock = threading.Lock()
+        self._hook_lock = threading.Lock()
+
+    def add(self, count):
+        with self._lock:
+            self.downloaded += count
+            now = time.monotonic()
+            if self.hook is None or now - self._last_emit < self.min_interval:
+                return
+            self._last_emit = now
+            status = self._status("downloading", now)
+        self._call_hook(status)
+
+    def finished(self):
+        with self._lock:
+            self.downloaded = self.total_size
+            status = self._status("finished", time.monotonic())
+        if self.hook:
+            self._call_hook(status)
+
+    def error(self):
+        with self._lock:
+            status = self._status("error", time.monotonic())
+        if self.hook:
+            self._call_hook(status)
+
+    def _call_hook(self, status):
+        with self._hook_lock:
+            self.hook(status)
+
+    def _status(self, status, now):
+        elapsed = max(now - self.started, 1e-6)
+        speed = self.downloaded / elapsed
+        return {
+            "status": status,
+            "filename": self.destination,
+            "downloaded_bytes": self.downloaded,
+            "total_bytes": self.total_size,
+            "elapsed": elapsed,
+            "speed": speed,
+            "eta": (self.total_size - self.downloaded) / speed if speed else None,
+        }
@@ -0,0 +1,251 @@
+"""
+Download Manager
+Virtualized list of queued and running downloads, drawn from the shared progress model
+"""
+
+import tkinter as tk
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from config import COLORS, FONTS
+from src.core.progress import (
+    STAGE_CANCELLED,
+    STAGE_DOWNLOADING,
+    STAGE_ERROR,
+    STAGE_FINISHED,
+    STAGE_QUEUED,
+    STAGE_SKIPPED,
+    format_bytes,
+)
+from src.core.progress_model import get_progress_model
+from src.gui.progress_bus import DEFAULT_TICK_MS, ProgressBus
+from src.gui.styles import create_styled_button
+from src.utils.translator import translate
+
+ROW_HEIGHT = 22
+# Column name and left edge as a fraction of the list width
+COLUMNS = [
+    ("title", 0.0),
+    ("stage", 0.46),
+    ("bytes", 0.60),
+    ("speed", 0.80),
+    ("eta", 0.92),
+]
+STAGE_COLORS = {
+    STAGE_FINISHED: "success",
+    STAGE_ERROR: "danger",
+    STAGE_CANCELLED: "warning",
+    STAGE_SKIPPED: "text_secondary",
+    STAGE_QUEUED: "text_secondary",
+}
+
+
+def format_eta(seconds):
+    """Format an ETA in seconds as m:ss, or an empty string when unknown"""
+    if seconds is None:
+        return ""
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes}:{seconds:02d}"
+
+
+def format_row(task):
+    """
+    Build the cell texts for one task
+
+    Args:
+        task: TaskProgress
+
+    Returns:
+        dict: Text per column name
+    """
+    transferred = format_bytes(task.bytes_done) if task.bytes_done else ""
+    if task.bytes_total:
+        transferred = f"{format_bytes(task.bytes_done)} / {format_bytes(task.bytes_total)}"
+    return {
+        "title": task.title or task.task_id,
+        "stage": task.stage,
+        "bytes": transferred,
+        "speed": f"{format_bytes(task.speed)}/s" if task.speed and task.stage == STAGE_DOWNLOADING else "",
+        "eta": format_eta(task.eta) if task.stage == STAGE_DOWNLOADING else "",
+    }
+
+
+def format_totals(totals, tr=translate):
+    """Build the summary line from ProgressModel.totals()"""
+    return tr(
+        "manager_summary",
+        "{active} active • {queued} queued • {finished} done • {failed} failed • {speed}/s",
+    ).format(
+        active=totals["active"],
+        queued=totals["queued"],
+        finished=totals["finished"],
+        failed=totals["failed"],
+        speed=format_bytes(totals["speed"]),
+    )
+
+
+class DownloadManagerPanel:
+    """
+    Download list that draws only the rows in view.
+
+    The canvas scroll region spans every task, but only enough canvas items
+    for one screen of rows exist; scrolling or a model change repositions and
+    relabels them. Worker threads never touch the panel: model changes post a
+    coalesced refresh to the progress bus, and refresh() skips redrawing when
+    neither the model nor the viewport changed since the last draw.
+    """
+
+    def __init__(self, parent, bus, model=None, height=240):
+        """
+        Args:
+            parent: Parent widget
+            bus: ProgressBus drained by the parent window
+            model: ProgressModel to show (defaults to the shared one)
+            height: Initial list height in pixels
+        """
+        self.tr = translate
+        self.model = model or get_progress_model()
+        self.bus = bus
+        self._pool = []
+        self._drawn_view = None
+
+        self.frame = tk.Frame(parent, bg=COLORS["card"])
+
+        header = tk.Frame(self.frame, bg=COLORS["card"])
+        header.pack(fill="x", padx=10, pady=(8, 4))
+        self.summary_label = tk.Label(
+            header,
+            text="",
+            font=FONTS["body_bold"],
+            bg=COLORS["card"],
+            fg=COLORS["text"],
+            anchor="w",
+        )
+        self.summary_label.pack(side="left", fill="x", expand=True)
+        clear_btn = create_styled_button(
+            header,
+            text=self.tr("manager_clear_finished", "Clear finished"),
+            command=self.model.clear_finished,
+            bg=COLORS["card"],
+            hover_bg=COLORS["border"],
+            font=FONTS["small"],
+        )
+        clear_btn.pack(side="right")
+
+        body = tk.Frame(self.frame, bg=COLORS["card"])
+        body.pack(fill="both", expand=True, padx=10, pady=(0, 8))
+        self.canvas = tk.Canvas(
+            body,
+            height=height,
+            bg=COLORS["background"],
+            highlightthickness=0,
+            yscrollincrement=ROW_HEIGHT,
+        )
+        scrollbar = tk.Scrollbar(body, orient="vertical", command=self._on_scroll)
+        self.canvas.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+
+        self.canvas.bind("<Configure>", lambda e: self.refresh())
+        self.canvas.bind("<MouseWheel>", self._on_mousewheel)
+        self.canvas.bind("<Button-4>", lambda e: self._scroll_rows(-3))
+        self.canvas.bind("<Button-5>", lambda e: self._scroll_rows(3))
+        self.frame.bind("<Destroy>", self._on_destroy)
+
+        self._unsubscribe = self.model.subscribe(
+            lambda: self.bus.update(("download_manager", id(self)), self.refresh)
+        )
+        self.refresh()
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def grid(self, **kwargs):
+        self.frame.grid(**kwargs)
+
+    def refresh(self):
+        """Redraw the rows in view; must be called on the Tk thread"""
+        total = len(self.model)
+        width = max(1, self.canvas.winfo_width())
+        height = max(1, self.canvas.winfo_height())
+        self.canvas.configure(scrollregion=(0, 0, width, max(height, total * ROW_HEIGHT)))
+
+        first = int(self.canvas.canvasy(0) // ROW_HEIGHT)
+        visible = height // ROW_HEIGHT + 2
+        view = (self.model.version, first, visible, width)
+        if view == self._drawn_view:
+            return
+        self._drawn_view = view
+
+        rows = self.model.rows(first, visible)
+        while len(self._pool) < len(rows):
+            self._pool.append(self._create_row())
+        for offset, items in enumerate(self._pool):
+            if offset < len(rows):
+                self._draw_row(items, first + offset, rows[offset], width)
+            else:
+                for item in items.values():
+                    self.canvas.itemconfigure(item, state="hidden")
+        self.summary_label.config(text=format_totals(self.model.totals(), self.tr))
+
+    def _create_row(self):
+        items = {"background": self.canvas.create_rectangle(0, 0, 0, 0, width=0)}
+        for name, _left in COLUMNS:
+            items[name] = self.canvas.create_text(0, 0, anchor="w", font=FONTS["small"])
+        return items
+
+    def _draw_row(self, items, index, task, width):
+        top = index * ROW_HEIGHT
+        stripe = COLORS["card"] if index % 2 else COLORS["background"]
+        self.canvas.coords(items["background"], 0, top, width, top + ROW_HEIGHT)
+        self.canvas.itemconfigure(items["background"], fill=stripe, state="normal")
+
+        cells = format_row(task)
+        color = COLORS[STAGE_COLORS.get(task.stage, "text")]
+        for column, (name, left) in enumerate(COLUMNS):
+            right = COLUMNS[column + 1][1] if column + 1 < len(COLUMNS) else 1.0
+            # Rough character budget so long titles do not run into the next column
+            budget = max(4, int((right - left) * width / 7))
+            text = cells[name]
+            if len(text) > budget:
+                text = text[:budget - 1] + "…"
+            self.canvas.coords(items[name], 6 + left * width, top + ROW_HEIGHT / 2)
+            self.canvas.itemconfigure(
+                items[name],
+                text=text,
+                fill=color if name == "stage" else COLORS["text"],
+                state="normal",
+            )
+
+    def _on_scroll(self, *args):
+        self.canvas.yview(*args)
+        self.refresh()
+
+    def _scroll_rows(self, rows):
+        self.canvas.yview_scroll(rows, "units")
+        self.refresh()
+
+    def _on_mousewheel(self, event):
+        self._scroll_rows(-3 if event.delta > 0 else 3)
+
+    def _on_destroy(self, event):
+        if event.widget is self.frame:
+            self._unsubscribe()
+
+
+class DownloadManagerWindow:
+    """Standalone window with the download manager panel"""
+
+    def __init__(self, parent, model=None):
+        self.window = tk.Toplevel(parent)
+        self.tr = translate
+        self.window.title(self.tr("manager_window_title", "Download Manager"))
+        self.window.geometry("820x480")
+        self.window.configure(bg=COLORS["background"])
+
+        self.progress_bus = ProgressBus()
+        self.panel = DownloadManagerPanel(self.window, self.progress_bus, model, height=400)
+        self.panel.pack(fill="both", expand=True, padx=15, pady=15)
+        self.progress_bus.attach(self.window, DEFAULT_TICK_MS)
+        self.window.bind('<Escape>', lambda e: self.window.destroy())
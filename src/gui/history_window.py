@@ -7,20 +7,22 @@ from tkinter import ttk, messagebox
 import sys
 import os
 import subprocess
+import threading
 from pathlib import Path
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 from config import COLORS, FONTS
 from src.gui.styles import create_styled_button, create_styled_frame, create_styled_entry
 from src.gui.progress_dialog import InlineStatus
-from src.utils.config_manager import ConfigManager
+from src.controllers.app_controller import AppController
+from src.core.progress import format_bytes
 from src.utils.translator import translate
 
 
 class HistoryWindow:
     """Window for viewing download history"""
     
-    def __init__(self, parent):
+    def __init__(self, parent, controller=None):
         self.window = tk.Toplevel(parent)
         self.tr = translate
         self.window.title(self.tr("history_window_title", "Download History"))
@@ -31,7 +33,8 @@ class HistoryWindow:
         self.window.transient(parent)
         self.window.grab_set()
         
-        self.config = ConfigManager()
+        self.controller = controller or AppController()
+        self.config = self.controller.config
         self.all_history = []
         self.filtered_history = []
         self.filter_type = "all"  # all, video, mp3, profile
@@ -254,6 +257,24 @@ class HistoryWindow:
         )
         refresh_btn.pack(side="left", padx=5, ipadx=10, ipady=5)
         
+        self.rescan_btn = create_styled_button(
+            button_frame,
+            text=self.tr("history_button_rescan", "🔍 Rescan Library"),
+            command=self.rescan_library,
+            bg=COLORS["secondary"],
+            hover_bg=COLORS["secondary_hover"]
+        )
+        self.rescan_btn.pack(side="left", padx=5, ipadx=10, ipady=5)
+        
+        self.dedupe_btn = create_styled_button(
+            button_frame,
+            text=self.tr("history_button_dedupe", "🧬 Find Duplicates"),
+            command=self.dedupe_library,
+            bg=COLORS["secondary"],
+            hover_bg=COLORS["secondary_hover"]
+        )
+        self.dedupe_btn.pack(side="left", padx=5, ipadx=10, ipady=5)
+        
         close_btn = create_styled_button(
             button_frame,
             text=self.tr("history_button_close", "✖ Close"),
@@ -523,6 +544,106 @@ class HistoryWindow:
                     self.tr("history_status_count_plural", "Showing {count} items").format(count=count)
                 )
     
+    def rescan_library(self):
+        """Rescan the download folder in the background and refresh history"""
+        self.rescan_btn.config(state="disabled")
+        self.history_status.show_info(self.tr("history_status_rescanning", "Rescanning library..."))
+        
+        def worker():
+            try:
+                result = self.controller.rescan_library()
+                message = self.tr(
+                    "history_status_rescan_done",
+                    "Library rescanned: {files} files, {relinked} relinked, {missing} missing",
+                ).format(files=result.files_indexed, relinked=result.history_relinked, missing=result.history_missing)
+                self.window.after(0, self._finish_rescan, message, None)
+            except Exception as e:
+                self.window.after(0, self._finish_rescan, None, str(e))
+        
+        threading.Thread(target=worker, daemon=True).start()
+    
+    def _finish_rescan(self, message, error):
+        """Restore the rescan button and report the outcome"""
+        if not self.window.winfo_exists():
+            return
+        self.rescan_btn.config(state="normal")
+        if error:
+            self.history_status.show_error(
+                self.tr("history_status_rescan_failed", "Rescan failed: {error}").format(error=error[:60])
+            )
+            return
+        self.load_history()
+        self.history_status.show_success(message)
+    
+    def dedupe_library(self):
+        """Look for duplicate downloads in the background, then offer to link them"""
+        self.dedupe_btn.config(state="disabled")
+        self.history_status.show_info(self.tr("history_status_deduping", "Looking for duplicate downloads..."))
+        self._run_dedupe(dry_run=True)
+    
+    def _run_dedupe(self, dry_run):
+        """Run a dedupe pass on a worker thread and report back on the Tk thread"""
+        def worker():
+            try:
+                result = self.controller.dedupe_library(dry_run=dry_run)
+                self.window.after(0, self._finish_dedupe, result, dry_run, None)
+            except Exception as e:
+                self.window.after(0, self._finish_dedupe, None, dry_run, str(e))
+        
+        threading.Thread(target=worker, daemon=True).start()
+    
+    def _finish_dedupe(self, result, dry_run, error):
+        """Show a dedupe result; after a dry run, ask before linking anything"""
+        if not self.window.winfo_exists():
+            return
+        if error:
+            self.dedupe_btn.config(state="normal")
+            self.history_status.show_error(
+                self.tr("history_status_dedupe_failed", "Duplicate check failed: {error}").format(error=error[:60])
+            )
+            return
+        
+        reclaimed = format_bytes(result.bytes_reclaimed)
+        if dry_run:
+            if not result.duplicate_groups:
+                self.dedupe_btn.config(state="normal")
+                self.history_status.show_success(
+                    self.tr("history_status_dedupe_none", "No duplicates among {files} files").format(
+                        files=result.files_considered
+                    )
+                )
+                return
+            confirm = messagebox.askyesno(
+                self.tr("history_confirm_dedupe_title", "Link Duplicates"),
+                self.tr(
+                    "history_confirm_dedupe_message",
+                    "Found {groups} sets of identical files ({files} copies, {size} reclaimable).\n\n"
+                    "Replace the copies with hardlinks to one file?",
+                ).format(groups=result.duplicate_groups, files=result.files_linked, size=reclaimed),
+                parent=self.window,
+            )
+            if confirm:
+                self.history_status.show_info(self.tr("history_status_deduping", "Looking for duplicate downloads..."))
+                self._run_dedupe(dry_run=False)
+            else:
+                self.dedupe_btn.config(state="normal")
+                self.history_status.show_info(self.tr("history_status_dedupe_skipped", "No files were changed"))
+            return
+        
+        self.dedupe_btn.config(state="normal")
+        message = self.tr(
+            "history_status_dedupe_done",
+            "Linked {files} duplicate files, {size} reclaimed",
+        ).format(files=result.files_linked, size=reclaimed)
+        if result.errors:
+            self.history_status.show_error(
+                message + self.tr("history_status_dedupe_errors", " ({count} errors, see log)").format(
+                    count=len(result.errors)
+                )
+            )
+        else:
+            self.history_status.show_success(message)
+    
     def clear_history(self):
         """Clear all history"""
         if not self.all_history:
@@ -14,11 +14,26 @@ from src.controllers.app_controller import AppController
 from src.gui.styles import apply_styles, create_styled_button, create_styled_entry, create_styled_frame
 from src.gui.profile_downloader import ProfileDownloaderWindow
 from src.gui.history_window import HistoryWindow
+from src.gui.download_manager import DownloadManagerWindow
 from src.gui.settings_window import SettingsWindow
 from src.gui.progress_dialog import ProgressDialog, InlineStatus
+from src.gui.progress_bus import DEFAULT_TICK_MS, ProgressBus
+from src.core.batch_runner import (
+    EVENT_BREAKER_CLOSED,
+    EVENT_BREAKER_OPEN,
+    EVENT_ITEM_FINISHED,
+    EVENT_TASK_FINISHED,
+    BatchRunner,
+)
+from src.core.cancellation import CancellationToken
+from src.core.progress import describe_progress
 from src.utils.validators import is_valid_tiktok_url
 from src.utils.translator import translate
-from src.utils.logger import get_logger
+from src.utils.logger import get_logger, run_context
+from src.utils.metrics import metrics_export_session
+from src.utils.profiling import profile_session
+from src.utils.timing import collect_stages
+from src.utils.tracing import trace_session
 import threading
 
 
@@ -39,6 +54,10 @@ class MainWindow:
         self.should_stop = False
         self.is_downloading = False
         self.is_batch_downloading = False
+        # Reaches into running transfers; replaced for every profile or batch run
+        self.cancel_token = CancellationToken()
+        # Worker threads post UI changes here; the Tk loop applies them on a fixed tick
+        self.progress_bus = ProgressBus()
         
         # Configure window
         self.root.title(self.tr("app_title", APP_NAME))
@@ -57,6 +76,10 @@ class MainWindow:
         
         # Keyboard shortcuts
         self.setup_shortcuts()
+        self.progress_bus.attach(
+            self.root,
+            max(1, self.controller.safe_int(self.config.get_setting("progress_tick_ms"), DEFAULT_TICK_MS)),
+        )
         
         # Center window
         self.center_window()
@@ -197,7 +220,7 @@ class MainWindow:
         )
         self.download_btn.pack(pady=15, ipadx=20, ipady=8)
         
-        # Control buttons frame (for profile downloads)
+        # Control buttons frame (for profile and batch downloads)
         self.control_buttons_frame = tk.Frame(main_card, bg=COLORS["card"])
         self.control_buttons_frame.pack(pady=5)
         self.control_buttons_frame.pack_forget()  # Hide initially
@@ -262,6 +285,16 @@ class MainWindow:
         )
         settings_btn.pack(side="left", padx=5, ipadx=10, ipady=5)
         
+        manager_btn = create_styled_button(
+            bottom_frame,
+            text=self.tr("manager_button", "\u2B07 Downloads"),
+            command=self.open_download_manager,
+            bg=COLORS["card"],
+            hover_bg=COLORS["border"],
+            font=FONTS["emoji"]
+        )
+        manager_btn.pack(side="left", padx=5, ipadx=10, ipady=5)
+        
         folder_btn = create_styled_button(
             bottom_frame,
             text=self.tr("open_downloads_folder", "\U0001F4C1 Open Downloads Folder"),
@@ -446,103 +479,30 @@ class MainWindow:
         return "break"
 
     def _batch_download_thread(self, tasks, ignored_links, duplicate_links):
-        """Perform sequential downloads for imported links."""
+        """Download the imported links on the batch runner."""
         convert_to_mp3 = self.config.get_setting("convert_to_mp3", False)
         create_folders = self.config.get_setting("create_profile_folders", True)
         profile_limit = self.controller.safe_int(self.config.get_setting("profile_video_limit", 10))
 
-        success_count = 0
         failures = []
         total = len(tasks)
 
         def report(status_method: str, message: str) -> None:
-            self.root.after(0, getattr(self.download_status, status_method), message)
-
-        try:
-            for index, task in enumerate(tasks, start=1):
-                url = task.url
-                kind = task.task_type
-                prefix = self.tr(
-                    "batch_progress_prefix",
-                    "[{index}/{total}]",
-                ).format(index=index, total=total)
-
-                progress_detail = self.tr(
-                    "batch_progress_message",
-                    "Downloading {index}/{total}...",
-                ).format(index=index, total=total)
-                report("show_info", f"{prefix} {progress_detail}")
-
-                if kind == "profile":
-                    try:
-                        result = self.profile_scraper.download_from_profile(
-                            profile_url=url,
-                            limit=profile_limit,
-                            create_folder=create_folders,
-                            convert_to_mp3=convert_to_mp3,
-                            skip_existing=True,
-                            progress_callback=lambda idx=index, total_count=total, **payload: self._report_profile_batch_progress(idx, total_count, payload),
-                            pause_check=lambda: False,
-                            stop_check=lambda: False,
-                        )
-                        if result.get("success"):
-                            success_count += 1
-                            downloaded = result.get("downloaded", 0)
-                            failed_items = result.get("failed", 0)
-                            base_msg = self.tr(
-                                "batch_profile_success",
-                                "{prefix} Profile done: {downloaded} downloaded",
-                            ).format(prefix=prefix, downloaded=downloaded)
-                            if failed_items:
-                                warn_msg = base_msg + " " + self.tr(
-                                    "batch_profile_partial",
-                                    "({failed} failed)",
-                                ).format(failed=failed_items)
-                                report("show_warning", warn_msg)
-                            else:
-                                report("show_success", base_msg)
-                        else:
-                            failures.append({"url": url, "error": result.get("error", "Unknown error")})
-                            report("show_error", f"{prefix} {self.tr('batch_profile_failed', 'Profile download failed.')}")
-                    except Exception as exc:  # capture scraper exceptions
-                        failures.append({"url": url, "error": str(exc)})
-                        report("show_error", f"{prefix} {self.tr('batch_profile_failed', 'Profile download failed.')}")
-                else:
-                    try:
-                        result = self.downloader.download_video(
-                            url,
-                            convert_to_mp3=convert_to_mp3,
-                            source="batch",
-                        )
-                        if result.get("success"):
-                            success_count += 1
-                            title = result.get("title", "")[:50]
-                            report(
-                                "show_success",
-                                f"{prefix} "
-                                + self.tr("batch_video_success", "Video downloaded: {title}").format(title=title),
-                            )
-                        else:
-                            failures.append({"url": url, "error": result.get("error", "Unknown error")})
-                            report(
-                                "show_error",
-                                f"{prefix} "
-                                + self.tr("batch_video_failed", "Video failed: {error}").format(
-                                    error=str(result.get("error", "Unknown error"))[:60]
-                                ),
-                            )
-                    except Exception as exc:
-                        failures.append({"url": url, "error": str(exc)})
-                        report(
-                            "show_error",
-                            f"{prefix} "
-                            + self.tr("batch_video_failed", "Video failed: {error}").format(error=str(exc)[:60]),
-                        )
-        except Exception as exc:  # Catch unexpected errors to restore UI properly
-            failures.append({"url": "unexpected", "error": str(exc)})
+            self.progress_bus.update("status", getattr(self.download_status, status_method), message)
+
+        with run_context(), \
+                metrics_export_session(self.config), \
+                trace_session(self.config, "batch", self.logger), \
+                profile_session(self.config, "batch", self.logger) as profiler, \
+                collect_stages() as run_timer:
+            success_count = self._run_batch_tasks(
+                tasks, convert_to_mp3, create_folders, profile_limit, failures, report, profiler
+            )
+        self.logger.info(run_timer.format_report(f"Batch stage timings ({total} tasks)"))
+        self._log_queue_waits()
 
-        self.root.after(
-            0,
+        self.progress_bus.update("progress_label", self.progress_label.config, text="")
+        self.progress_bus.emit(
             self._on_batch_download_complete,
             tasks,
             success_count,
@@ -551,6 +511,108 @@ class MainWindow:
             duplicate_links,
         )
 
+    def _run_batch_tasks(self, tasks, convert_to_mp3, create_folders, profile_limit, failures, report, profiler):
+        """Download the batch on the fair-share runner; returns the number of successful tasks."""
+        total = len(tasks)
+
+        def prefix_for(outcome):
+            return self.tr(
+                "batch_progress_prefix",
+                "[{index}/{total}]",
+            ).format(index=outcome.index, total=total)
+
+        def on_event(event, outcome, result):
+            if event == EVENT_ITEM_FINISHED:
+                profiler.tick()
+                if outcome.task.task_type == "profile":
+                    done = outcome.downloaded + outcome.failed + outcome.skipped
+                    self._report_profile_batch_progress(outcome.index, total, {
+                        "current": done,
+                        "total": outcome.total,
+                        "video_name": result.get("title") or f"Video {done}",
+                        "status": "success" if result.get("success") else "failed",
+                    })
+            elif event == EVENT_TASK_FINISHED:
+                self._report_batch_task_outcome(outcome, prefix_for(outcome), report)
+            elif event == EVENT_BREAKER_OPEN:
+                report("show_error", self.tr(
+                    "batch_breaker_open",
+                    "Downloads paused: TikTok extraction keeps failing. Update yt-dlp in Settings.",
+                ))
+            elif event == EVENT_BREAKER_CLOSED:
+                report("show_info", self.tr("batch_breaker_closed", "Extraction works again, resuming downloads."))
+
+        runner = BatchRunner(self.downloader, self.profile_scraper, self.config)
+        try:
+            outcomes = runner.run(
+                tasks,
+                convert_to_mp3=convert_to_mp3,
+                create_folders=create_folders,
+                profile_limit=profile_limit,
+                on_event=on_event,
+                byte_progress_callback=lambda outcome, progress: self._report_byte_progress(prefix_for(outcome), progress),
+                cancel_token=self.cancel_token,
+            )
+        except Exception as exc:  # Catch unexpected errors to restore UI properly
+            failures.append({"url": "unexpected", "error": str(exc)})
+            return 0
+
+        success_count = 0
+        for outcome in outcomes:
+            if outcome.success:
+                success_count += 1
+            else:
+                failures.append({
+                    "url": outcome.task.url,
+                    "error": outcome.error or "Unknown error",
+                    "error_class": outcome.error_class,
+                })
+        return success_count
+
+    def _report_batch_task_outcome(self, outcome, prefix, report):
+        """Show the final status line for one finished batch task."""
+        if outcome.task.task_type == "profile":
+            if not outcome.success:
+                report("show_error", f"{prefix} {self.tr('batch_profile_failed', 'Profile download failed.')}")
+                return
+            base_msg = self.tr(
+                "batch_profile_success",
+                "{prefix} Profile done: {downloaded} downloaded",
+            ).format(prefix=prefix, downloaded=outcome.downloaded)
+            if outcome.failed:
+                warn_msg = base_msg + " " + self.tr(
+                    "batch_profile_partial",
+                    "({failed} failed)",
+                ).format(failed=outcome.failed)
+                report("show_warning", warn_msg)
+            else:
+                report("show_success", base_msg)
+        elif outcome.success:
+            report(
+                "show_success",
+                f"{prefix} "
+                + self.tr("batch_video_success", "Video downloaded: {title}").format(title=outcome.title[:50]),
+            )
+        else:
+            report(
+                "show_error",
+                f"{prefix} "
+                + self.tr("batch_video_failed", "Video failed: {error}").format(
+                    error=str(outcome.error or "Unknown error")[:60]
+                ),
+            )
+
+    def _log_queue_waits(self):
+        """Log how long downloads of each priority class waited for a slot"""
+        stats = self.controller.get_queue_wait_stats()
+        if not stats:
+            return
+        waits = ", ".join(
+            f"{name} p50 {values['p50'] * 1000:.0f}ms p95 {values['p95'] * 1000:.0f}ms ({values['count']})"
+            for name, values in sorted(stats.items())
+        )
+        self.logger.info(f"Scheduler queue waits: {waits}")
+
     def _report_profile_batch_progress(self, index, total, payload):
         """Route profile progress updates to the inline status widget."""
         message = payload.get("message")
@@ -580,7 +642,12 @@ class MainWindow:
             else:
                 self.download_status.show_info(text)
 
-        self.root.after(0, update)
+        self.progress_bus.update("status", update)
+
+    def _report_byte_progress(self, prefix, progress):
+        """Show byte-level transfer progress for the item currently downloading."""
+        text = f"{prefix} {describe_progress(progress)}" if prefix else describe_progress(progress)
+        self.progress_bus.update("progress_label", self.progress_label.config, text=text)
 
     def _on_batch_download_complete(self, tasks, success_count, failures, ignored_links, duplicate_links):
         """Handle UI updates after batch download finishes."""
@@ -595,7 +662,8 @@ class MainWindow:
             for idx, failure in enumerate(failures, 1):
                 url = failure.get("url", "Unknown URL")
                 error = failure.get("error", "Unknown error")
-                self.logger.error(f"  Failure {idx}: {url} - {error}")
+                error_class = failure.get("error_class") or "unknown"
+                self.logger.error(f"  Failure {idx} [{error_class}]: {url} - {error}")
 
         summary = self.tr(
             "batch_complete_summary",
@@ -629,6 +697,8 @@ class MainWindow:
             self.download_status.show_error(summary)
 
         self.download_btn.config(state="normal")
+        self.control_buttons_frame.pack_forget()
+        self.pause_btn.config(text=self.tr("pause_label", "\u23F8\uFE0F Pause"))
 
         self.is_batch_downloading = False
         self.url_entry.config(state="normal")
@@ -670,6 +740,10 @@ class MainWindow:
             return
 
         self.is_batch_downloading = True
+        self.is_paused = False
+        self.should_stop = False
+        self.cancel_token = CancellationToken()
+        self.control_buttons_frame.pack(pady=5)
         self.download_btn.config(state="disabled")
         self.url_entry.config(state="disabled")
 
@@ -780,43 +854,59 @@ class MainWindow:
             self.download_status.show_error(self.tr("invalid_url_error_strict", "Invalid TikTok URL!"))
             return
         
+        # Show progress dialog
+        progress = ProgressDialog(
+            self.root,
+            self.tr("progress_title_downloading", "Downloading Video"),
+            mode="indeterminate",
+        )
+        progress.update_status(self.tr("progress_status_fetching", "Fetching video information..."))
+        
+        # Download off the Tk thread; waiting for a scheduler slot must not freeze the window
+        thread = threading.Thread(
+            target=self._download_single_thread,
+            args=(url, progress),
+            daemon=True
+        )
+        thread.start()
+    
+    def _download_single_thread(self, url, progress):
+        """Single video download thread"""
         try:
-            # Show progress dialog
-            progress = ProgressDialog(
-                self.root,
-                self.tr("progress_title_downloading", "Downloading Video"),
-                mode="indeterminate",
-            )
-            progress.update_status(self.tr("progress_status_fetching", "Fetching video information..."))
-            
-            # Download video
             result = self.downloader.download_video(
                 url,
-                convert_to_mp3=self.config.get_setting("convert_to_mp3", False)
+                convert_to_mp3=self.config.get_setting("convert_to_mp3", False),
+                progress_callback=lambda event: self.progress_bus.update(
+                    "single_progress", progress.update_transfer, event
+                ),
             )
-            
-            progress.close()
-            
-            if result["success"]:
-                self.download_status.show_success(
-                    self.tr("download_success_message", "Downloaded: {title}...").format(
-                        title=result["title"][:50]
-                    )
-                )
-                self.url_entry.delete(0, tk.END)
-                self.url_validation_label.config(text="")
-            else:
-                self.download_status.show_error(
-                    self.tr("download_failed_message", "Download failed: {error}").format(
-                        error=result.get("error", "Unknown")[:50]
-                    )
-                )
-                
         except Exception as e:
-            if 'progress' in locals():
-                progress.close()
+            result = {
+                "success": False,
+                "error": self.tr("generic_error_message", "Error: {error}").format(error=str(e)[:50]),
+                "unexpected": True,
+            }
+        self.progress_bus.emit(self._on_single_download_complete, progress, result)
+    
+    def _on_single_download_complete(self, progress, result):
+        """Close the progress dialog and report a single video download"""
+        progress.close()
+        
+        if result["success"]:
+            self.download_status.show_success(
+                self.tr("download_success_message", "Downloaded: {title}...").format(
+                    title=result["title"][:50]
+                )
+            )
+            self.url_entry.delete(0, tk.END)
+            self.url_validation_label.config(text="")
+        elif result.get("unexpected"):
+            self.download_status.show_error(result["error"])
+        else:
             self.download_status.show_error(
-                self.tr("generic_error_message", "Error: {error}").format(error=str(e)[:50])
+                self.tr("download_failed_message", "Download failed: {error}").format(
+                    error=result.get("error", "Unknown")[:50]
+                )
             )
     
     def download_profile(self):
@@ -830,6 +920,7 @@ class MainWindow:
         self.is_paused = False
         self.should_stop = False
         self.is_downloading = True
+        self.cancel_token = CancellationToken()
         
         # Show control buttons
         self.control_buttons_frame.pack(pady=5)
@@ -847,27 +938,32 @@ class MainWindow:
     def _download_profile_thread(self, url, limit):
         """Profile download thread"""
         try:
-            self.download_status.show_info(self.tr("profile_download_start", "Starting profile download..."))
+            self.progress_bus.update(
+                "status",
+                self.download_status.show_info,
+                self.tr("profile_download_start", "Starting profile download..."),
+            )
             
             result = self.profile_scraper.download_from_profile(
                 profile_url=url,
                 limit=limit,
                 convert_to_mp3=self.config.get_setting("convert_to_mp3", False),
                 progress_callback=self.download_progress_callback,
-                pause_check=lambda: self.is_paused,
-                stop_check=lambda: self.should_stop
+                byte_progress_callback=lambda progress: self._report_byte_progress("", progress),
+                cancel_token=self.cancel_token,
             )
             
             # Update UI in main thread
-            self.root.after(0, self._on_profile_download_complete, result)
+            self._log_queue_waits()
+            self.progress_bus.emit(self._on_profile_download_complete, result)
             
         except Exception as e:
-            self.root.after(
-                0,
+            self.progress_bus.update(
+                "status",
                 self.download_status.show_error,
                 self.tr("generic_error_message", "Error: {error}").format(error=str(e)[:50]),
             )
-            self.root.after(0, self._reset_ui)
+            self.progress_bus.emit(self._reset_ui)
     
     def download_progress_callback(self, *args, **kwargs):
         """Update progress for profile downloads from scraper callbacks."""
@@ -888,11 +984,6 @@ class MainWindow:
         if video_name is None:
             video_name = ""
 
-        # Wait while paused, keeping UI responsive.
-        while self.is_paused and not self.should_stop:
-            self.root.update()
-            self.root.after(100)
-
         if message:
             progress_text = message
         else:
@@ -901,7 +992,7 @@ class MainWindow:
                 "Downloading {current}/{total}: {video}...",
             ).format(current=current or 0, total=total or 0, video=video_name[:40])
 
-        self.root.after(0, self.progress_label.config, {"text": progress_text})
+        self.progress_bus.update("progress_label", self.progress_label.config, text=progress_text)
     
     def _on_profile_download_complete(self, result):
         """Handle profile download completion"""
@@ -936,16 +1027,19 @@ class MainWindow:
         """Toggle pause/resume"""
         self.is_paused = not self.is_paused
         if self.is_paused:
+            self.cancel_token.pause()
             self.pause_btn.config(text=self.tr("resume_label", "\u25B6 Resume"))
             self.download_status.show_info(self.tr("download_paused", "Download paused"))
         else:
+            self.cancel_token.resume()
             self.pause_btn.config(text=self.tr("pause_label", "\u23F8\uFE0F Pause"))
             self.download_status.show_info(self.tr("download_resumed", "Download resumed"))
     
     def stop_download(self):
-        """Stop profile download"""
+        """Stop the running profile or batch download, including the file in flight"""
         self.should_stop = True
         self.is_paused = False
+        self.cancel_token.cancel()
         self.download_status.show_warning(self.tr("stopping_download", "Stopping download..."))
     
     def fetch_profile_info(self, url):
@@ -986,12 +1080,16 @@ class MainWindow:
     
     def open_history(self):
         """Open download history window"""
-        HistoryWindow(self.root)
+        HistoryWindow(self.root, self.controller)
     
     def open_settings(self):
         """Open settings window"""
         SettingsWindow(self.root)
     
+    def open_download_manager(self):
+        """Open the list of queued and running downloads"""
+        DownloadManagerWindow(self.root)
+    
     def open_downloads_folder(self):
         """Open downloads folder in file explorer"""
         download_path = self.config.get_setting("download_path")
@@ -13,7 +13,12 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 from config import COLORS, FONTS
 from src.gui.styles import create_styled_button, create_styled_entry, create_styled_frame
 from src.gui.progress_dialog import InlineStatus
+from src.gui.download_manager import DownloadManagerPanel
+from src.gui.progress_bus import DEFAULT_LOG_LINES, DEFAULT_TICK_MS, ProgressBus, append_capped_log
+from src.core.cancellation import CancellationToken
 from src.core.profile_scraper import ProfileScraper
+from src.core.scheduler import PRIORITY_BACKGROUND
+from src.core.progress import describe_progress
 from src.utils.config_manager import ConfigManager
 from src.utils.validators import is_valid_profile_url
 import pyperclip
@@ -33,10 +38,21 @@ class ProfileDownloaderWindow:
         self.is_downloading = False
         self.should_stop = False
         self.should_pause = False
+        self.cancel_token = CancellationToken()
+        # The download thread posts UI changes here instead of touching widgets
+        self.progress_bus = ProgressBus()
         
         self.create_widgets()
         self.center_window()
         self.setup_shortcuts()
+        self.progress_bus.attach(self.window, self._setting_int("progress_tick_ms", DEFAULT_TICK_MS))
+    
+    def _setting_int(self, key, default):
+        """Read a positive integer setting, falling back to the default"""
+        try:
+            return max(1, int(self.config.get_setting(key, default)))
+        except (TypeError, ValueError):
+            return default
     
     def center_window(self):
         """Center window on screen"""
@@ -267,10 +283,14 @@ class ProfileDownloaderWindow:
         )
         progress_label.pack(pady=(10, 5), anchor="w", padx=20)
         
+        # Per-video progress, fed by the shared progress model
+        self.manager_panel = DownloadManagerPanel(card, self.progress_bus, height=150)
+        self.manager_panel.pack(padx=10, fill="x")
+        
         # Progress text
         self.progress_text = scrolledtext.ScrolledText(
             card,
-            height=10,
+            height=6,
             font=FONTS["small"],
             bg=COLORS["background"],
             fg=COLORS["text"],
@@ -348,22 +368,29 @@ class ProfileDownloaderWindow:
         self.should_pause = not self.should_pause
         
         if self.should_pause:
+            self.cancel_token.pause()
             self.pause_btn.config(text="▶ Resume")
             self.log_progress("⏸ Download paused...")
         else:
+            self.cancel_token.resume()
             self.pause_btn.config(text="⏸ Pause")
             self.log_progress("▶ Download resumed...")
     
     def stop_download(self):
         """Stop the download"""
         self.should_stop = True
+        self.cancel_token.cancel()
         self.log_progress("🛑 Stopping download...")
     
     def log_progress(self, message):
-        """Log message to progress text"""
-        self.progress_text.insert(tk.END, f"{message}\n")
-        self.progress_text.see(tk.END)
-        self.window.update()
+        """Queue a line for the progress log; safe to call from any thread"""
+        self.progress_bus.log(self._append_log, message)
+    
+    def _append_log(self, message):
+        """Append to the progress log, dropping the oldest lines past "progress_log_lines" """
+        append_capped_log(
+            self.progress_text, message, self._setting_int("progress_log_lines", DEFAULT_LOG_LINES)
+        )
     
     def fetch_profile_info(self):
         """Fetch profile information"""
@@ -425,6 +452,7 @@ class ProfileDownloaderWindow:
         # Reset flags
         self.should_stop = False
         self.should_pause = False
+        self.cancel_token = CancellationToken()
         
         # Start download in thread
         thread = threading.Thread(
@@ -437,7 +465,7 @@ class ProfileDownloaderWindow:
     def bulk_download_thread(self, url, limit):
         """Bulk download in separate thread"""
         self.is_downloading = True
-        self.toggle_inputs(False)
+        self.progress_bus.emit(self.toggle_inputs, False)
         
         try:
             self.log_progress(f"\n{'='*60}")
@@ -453,8 +481,10 @@ class ProfileDownloaderWindow:
                 convert_to_mp3=self.convert_mp3_var.get(),
                 skip_existing=self.skip_existing_var.get(),
                 progress_callback=self.download_progress_callback,
-                pause_check=lambda: self.should_pause,
-                stop_check=lambda: self.should_stop
+                byte_progress_callback=self.byte_progress_callback,
+                # Bulk profile dumps yield slots to pasted links and batches
+                priority=PRIORITY_BACKGROUND,
+                cancel_token=self.cancel_token
             )
             
             self.log_progress(f"\n{'='*60}")
@@ -468,7 +498,8 @@ class ProfileDownloaderWindow:
                 self.log_progress(f"Failed: {result['failed']}")
                 self.log_progress(f"Skipped: {result['skipped']}")
                 
-                messagebox.showinfo(
+                self.progress_bus.emit(
+                    messagebox.showinfo,
                     "Complete",
                     f"Bulk download completed!\n\n"
                     f"Downloaded: {result['downloaded']}\n"
@@ -480,15 +511,15 @@ class ProfileDownloaderWindow:
             
         except Exception as e:
             self.log_progress(f"\n❌ Error: {str(e)}")
-            messagebox.showerror("Error", f"Bulk download failed:\n{str(e)}")
+            self.progress_bus.emit(messagebox.showerror, "Error", f"Bulk download failed:\n{str(e)}")
         
         finally:
             self.is_downloading = False
             self.should_stop = False
             self.should_pause = False
-            self.toggle_inputs(True)
-            self.current_video_label.config(text="")
-            self.status_label.config(text="Ready")
+            self.progress_bus.emit(self.toggle_inputs, True)
+            self.progress_bus.update("current_video", self.current_video_label.config, text="")
+            self.progress_bus.update("status", self.status_label.config, text="Ready")
     
     def download_progress_callback(self, message, current=None, total=None, video_name=None, status=None):
         """Enhanced progress callback with current video info"""
@@ -497,18 +528,11 @@ class ProfileDownloaderWindow:
         # Update current video display
         if video_name:
             if current and total:
-                self.current_video_label.config(
-                    text=f"📹 [{current}/{total}] {video_name[:60]}..."
-                )
+                text = f"📹 [{current}/{total}] {video_name[:60]}..."
             else:
-                self.current_video_label.config(text=f"📹 {video_name[:60]}...")
-        
-        # Handle pause
-        while self.should_pause and not self.should_stop:
-            self.window.update()
-            import time
-            time.sleep(0.1)
-        
-        # Check if should stop
-        if self.should_stop:
-            raise Exception("Download stopped by user")
+                text = f"📹 {video_name[:60]}..."
+            self.progress_bus.update("current_video", self.current_video_label.config, text=text)
+    
+    def byte_progress_callback(self, progress):
+        """Show byte-level progress of the current video"""
+        self.progress_bus.update("status", self.status_label.config, text=describe_progress(progress))
@@ -0,0 +1,146 @@
+"""
+Progress Bus
+Thread-safe channel from download workers to the Tk thread, drained on a fixed tick
+"""
+
+import itertools
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from src.utils.logger import get_logger
+
+DEFAULT_TICK_MS = 33  # ~30 Hz
+DEFAULT_MAX_EVENTS = 1000
+DEFAULT_LOG_LINES = 1000
+
+
+class ProgressBus:
+    """
+    Queue of UI calls posted by worker threads and run by the Tk thread.
+
+    ``update(key, ...)`` keeps only the latest call per key, so a download
+    reporting progress hundreds of times a second costs one widget update
+    per tick. ``log(...)`` queues log lines, bounded by ``max_events``; the
+    oldest lines are dropped on overflow. ``emit(...)`` queues calls that
+    must all run (completion handlers, re-enabling inputs) and never drops
+    them. Calls run in the order they were last posted.
+    """
+
+    def __init__(self, max_events=DEFAULT_MAX_EVENTS):
+        """
+        Args:
+            max_events: Most log lines held between ticks
+        """
+        self.max_events = max_events
+        self.dropped = 0
+        self._pending = OrderedDict()
+        self._events = 0
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._widget = None
+        self._interval_ms = DEFAULT_TICK_MS
+        self._after_id = None
+        self.logger = get_logger("ProgressBus")
+
+    def update(self, key, callback, *args, **kwargs):
+        """
+        Post a state update; replaces any pending update with the same key
+
+        Args:
+            key: Hashable identity of the state (e.g. ("task", 3))
+            callback: Function run on the Tk thread
+        """
+        with self._lock:
+            self._pending.pop(("update", key), None)
+            self._pending[("update", key)] = (callback, args, kwargs)
+
+    def log(self, callback, *args, **kwargs):
+        """Post a log line; the oldest pending line is dropped once ``max_events`` are waiting"""
+        with self._lock:
+            if self._events >= self.max_events:
+                for pending_key in self._pending:
+                    if pending_key[0] == "log":
+                        del self._pending[pending_key]
+                        self._events -= 1
+                        self.dropped += 1
+                        break
+            self._pending[("log", next(self._sequence))] = (callback, args, kwargs)
+            self._events += 1
+
+    def emit(self, callback, *args, **kwargs):
+        """Post a call that must run, such as a completion handler; never dropped"""
+        with self._lock:
+            self._pending[("event", next(self._sequence))] = (callback, args, kwargs)
+
+    def drain(self):
+        """
+        Take everything posted since the last drain
+
+        Returns:
+            list: (callback, args, kwargs) in posting order
+        """
+        with self._lock:
+            calls = list(self._pending.values())
+            self._pending.clear()
+            self._events = 0
+        return calls
+
+    def run_pending(self):
+        """Run the drained calls; must be called on the Tk thread"""
+        for callback, args, kwargs in self.drain():
+            try:
+                callback(*args, **kwargs)
+            except Exception as e:
+                # A closed widget must not stop the rest of the tick
+                self.logger.error(f"UI update failed: {e}")
+
+    def attach(self, widget, interval_ms=DEFAULT_TICK_MS):
+        """
+        Start draining on ``widget``'s event loop every ``interval_ms``
+
+        Args:
+            widget: Any Tk widget (used for after())
+            interval_ms: Tick length in milliseconds
+        """
+        self._widget = widget
+        self._interval_ms = interval_ms
+        if self._after_id is None:
+            self._after_id = widget.after(interval_ms, self._tick)
+
+    def detach(self):
+        """Stop the tick and drop pending calls; used when the window closes"""
+        if self._widget is not None and self._after_id is not None:
+            try:
+                self._widget.after_cancel(self._after_id)
+            except Exception:
+                pass
+        self._after_id = None
+        self._widget = None
+        self.drain()
+
+    def _tick(self):
+        self.run_pending()
+        if self._widget is None:
+            return
+        try:
+            self._after_id = self._widget.after(self._interval_ms, self._tick)
+        except Exception:
+            # Window destroyed; late posts from workers are simply dropped
+            self._after_id = None
+            self._widget = None
+
+
+def append_capped_log(text_widget, message, max_lines=DEFAULT_LOG_LINES):
+    """
+    Append a line to a Text widget and trim the oldest lines past ``max_lines``
+
+    Must be called on the Tk thread.
+    """
+    text_widget.insert("end", f"{message}\n")
+    line_count = int(text_widget.index("end-1c").split(".")[0])
+    if line_count > max_lines + 1:
+        text_widget.delete("1.0", f"{line_count - max_lines}.0")
+    text_widget.see("end")
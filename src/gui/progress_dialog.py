@@ -9,6 +9,7 @@ import os
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 from config import COLORS, FONTS
+from src.core.progress import describe_progress
 
 
 class ProgressDialog:
@@ -91,6 +92,14 @@ class ProgressDialog:
         
         self.window.update()
     
+    def update_transfer(self, progress):
+        """Update from a byte-level DownloadProgress event"""
+        fraction = progress.fraction
+        if fraction is not None:
+            self.progress_bar.stop()
+            self.progress_bar.config(mode="determinate", maximum=100, value=fraction * 100)
+        self.details_label.config(text=describe_progress(progress))
+    
     def close(self):
         """Close the dialog"""
         try:
@@ -686,6 +686,14 @@ class SettingsWindow:
         self.profile_limit_entry.configure(highlightbackground=COLORS["border"], highlightcolor=COLORS["accent"])
         self.profile_limit_error.config(text="")
 
+    def handle_bandwidth_change(self, _event=None):
+        self.clear_bandwidth_error()
+        self.mark_dirty()
+
+    def clear_bandwidth_error(self):
+        self.bandwidth_entry.configure(highlightbackground=COLORS["border"], highlightcolor=COLORS["accent"])
+        self.bandwidth_error.config(text="")
+
     def apply_theme_preview(self, theme_name):
         if theme_name == self.preview_theme and not self.suppress_change:
             return
@@ -710,6 +718,7 @@ class SettingsWindow:
     def validate_settings(self):
         valid = True
         profile_limit_value = 0
+        bandwidth_value = 0
 
         path = self.path_entry.get().strip()
         if not path:
@@ -736,7 +745,22 @@ class SettingsWindow:
             )
             valid = False
 
-        return valid, max(profile_limit_value, 0)
+        try:
+            bandwidth_value = int(self.bandwidth_entry.get().strip() or 0)
+            if bandwidth_value < 0:
+                raise ValueError
+            self.clear_bandwidth_error()
+        except ValueError:
+            self.bandwidth_entry.configure(highlightbackground=COLORS["danger"], highlightcolor=COLORS["danger"])
+            self.bandwidth_error.config(
+                text=self.tr(
+                    "settings_bandwidth_error",
+                    "Enter a whole number of KB/s (0 means unlimited).",
+                ),
+            )
+            valid = False
+
+        return valid, max(profile_limit_value, 0), max(bandwidth_value, 0)
 
     def create_general_tab(self):
         """Create General settings tab."""
@@ -1086,6 +1110,49 @@ class SettingsWindow:
             ),
         )
 
+        bandwidth_section = self.create_setting_section(
+            download_frame,
+            title=self.tr("settings_bandwidth_title", "Bandwidth Limit"),
+            icon="🚦",
+            description=self.tr(
+                "settings_bandwidth_description",
+                "Cap the total speed of all downloads combined, shared evenly between them.",
+            ),
+        )
+
+        bandwidth_label = tk.Label(
+            bandwidth_section,
+            text=self.tr("settings_bandwidth_label", "Maximum speed (KB/s):"),
+            font=FONTS["body"],
+            bg=bandwidth_section.cget("bg"),
+            fg=COLORS["text"],
+        )
+        self.register_themable(bandwidth_label, bg="background", fg="text")
+        bandwidth_label.pack(anchor="w", pady=(0, 4))
+
+        self.bandwidth_entry = create_styled_entry(bandwidth_section, width=15)
+        self.bandwidth_entry.pack(anchor="w", ipady=3)
+        self.bandwidth_entry.bind("<KeyRelease>", self.handle_bandwidth_change)
+
+        self.bandwidth_error = tk.Label(
+            bandwidth_section,
+            text="",
+            font=FONTS["small"],
+            bg=bandwidth_section.cget("bg"),
+            fg=COLORS["danger"],
+            wraplength=360,
+            justify="left",
+        )
+        self.register_themable(self.bandwidth_error, bg="background", fg="danger")
+        self.bandwidth_error.pack(anchor="w", pady=(3, 0))
+        self.create_hint_label(
+            bandwidth_section,
+            self.tr(
+                "settings_bandwidth_hint",
+                "Set to 0 for unlimited. Changes apply to running downloads within a second.",
+            ),
+        )
+
     def create_advanced_tab(self):
         """Create Advanced settings tab."""
         advanced_frame = tk.Frame(self.notebook, bg=COLORS["card"])
@@ -1136,6 +1203,23 @@ class SettingsWindow:
             ),
         )
         self.toggle_switches.append(folder_toggle)
+
+        self.dedupe_var = tk.BooleanVar()
+        dedupe_toggle = ToggleSwitch(
+            options_section,
+            text=self.tr("settings_dedupe_toggle", "Link duplicate downloads automatically"),
+            variable=self.dedupe_var,
+            command=self.mark_dirty,
+        )
+        dedupe_toggle.pack(anchor="w", pady=4)
+        Tooltip(
+            dedupe_toggle,
+            self.tr(
+                "settings_dedupe_tooltip",
+                "After each download, replaces byte-identical copies already in the download folder with a hardlink to one file.",
+            ),
+        )
+        self.toggle_switches.append(dedupe_toggle)
         self.create_hint_label(
             options_section,
             self.tr(
@@ -1349,6 +1433,7 @@ class SettingsWindow:
         self.auto_update_var.set(bool(self.config.get_setting("auto_update_ytdlp", True)))
         self.save_history_var.set(bool(self.config.get_setting("save_history", True)))
         self.profile_folders_var.set(bool(self.config.get_setting("create_profile_folders", True)))
+        self.dedupe_var.set(bool(self.config.get_setting("dedupe_on_download", False)))
         self.convert_mp3_var.set(bool(self.config.get_setting("convert_to_mp3", False)))
 
         limit = self.config.get_setting("profile_video_limit", 10)
@@ -1356,6 +1441,10 @@ class SettingsWindow:
         self.profile_limit_entry.insert(0, str(limit))
         self.clear_profile_limit_error()
 
+        self.bandwidth_entry.delete(0, tk.END)
+        self.bandwidth_entry.insert(0, str(self.config.get_setting("bandwidth_limit_kb", 0)))
+        self.clear_bandwidth_error()
+
         self.suppress_change = False
         self.dirty = False
         self.update_save_state()
@@ -1396,6 +1485,7 @@ class SettingsWindow:
         self.auto_update_var.set(defaults.get("auto_update_ytdlp", True))
         self.save_history_var.set(defaults.get("save_history", True))
         self.profile_folders_var.set(defaults.get("create_profile_folders", True))
+        self.dedupe_var.set(defaults.get("dedupe_on_download", False))
         self.convert_mp3_var.set(defaults.get("convert_to_mp3", False))
 
         profile_limit = defaults.get("profile_video_limit", 10)
@@ -1403,6 +1493,10 @@ class SettingsWindow:
         self.profile_limit_entry.insert(0, str(profile_limit))
         self.clear_profile_limit_error()
 
+        self.bandwidth_entry.delete(0, tk.END)
+        self.bandwidth_entry.insert(0, str(defaults.get("bandwidth_limit_kb", 0)))
+        self.clear_bandwidth_error()
+
         self.suppress_change = False
         self.dirty = True
         self.update_save_state()
@@ -1465,7 +1559,7 @@ class SettingsWindow:
 
     def save_settings(self):
         """Save settings."""
-        valid, profile_limit = self.validate_settings()
+        valid, profile_limit, bandwidth_limit = self.validate_settings()
         if not valid:
             self.settings_status.show_error(
                 self.tr("settings_validation_error", "Fix highlighted fields before saving."),
@@ -1491,7 +1585,9 @@ class SettingsWindow:
             "auto_update_ytdlp": self.auto_update_var.get(),
             "save_history": self.save_history_var.get(),
             "create_profile_folders": self.profile_folders_var.get(),
+            "dedupe_on_download": self.dedupe_var.get(),
             "profile_video_limit": profile_limit,
+            "bandwidth_limit_kb": bandwidth_limit,
             "convert_to_mp3": self.convert_mp3_var.get(),
         }
 
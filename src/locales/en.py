@@ -92,6 +92,10 @@ STRINGS = {
     "profile_info_failed": "⚠️ Could not fetch profile info",
     "history_button": "📜 History",
     "settings_button": "⚙ Settings",
+    "manager_button": "⬇ Downloads",
+    "manager_window_title": "Download Manager",
+    "manager_summary": "{active} active • {queued} queued • {finished} done • {failed} failed • {speed}/s",
+    "manager_clear_finished": "Clear finished",
     "open_downloads_folder": "📁 Open Downloads Folder",
     "footer_text": "Built with Ryu | v{version} | © 2026",
     "stop_label": "⏹ Stop",
@@ -118,6 +122,8 @@ STRINGS = {
     "batch_video_failed": "Video failed: {error}",
     "batch_profile_success": "{prefix} Profile done: {downloaded} downloaded",
     "batch_profile_failed": "Profile download failed.",
+    "batch_breaker_open": "Downloads paused: TikTok extraction keeps failing. Update yt-dlp in Settings.",
+    "batch_breaker_closed": "Extraction works again, resuming downloads.",
     "batch_profile_partial": "({failed} failed)",
     "batch_profile_processing": "Processing profile downloads...",
     "batch_profile_video_progress": "Downloading {current}/{total}: {video}",
@@ -183,4 +189,24 @@ STRINGS = {
     "history_profile_entry_single": "👤 {profile} • {count} video",
     "history_profile_entry_plural": "👤 {profile} • {count} videos",
     "history_profile_no_urls": "No URLs available for this profile",
+    "history_button_rescan": "🔍 Rescan Library",
+    "history_status_rescanning": "Rescanning library...",
+    "history_status_rescan_done": "Library rescanned: {files} files, {relinked} relinked, {missing} missing",
+    "history_status_rescan_failed": "Rescan failed: {error}",
+    "history_button_dedupe": "🧬 Find Duplicates",
+    "history_status_deduping": "Looking for duplicate downloads...",
+    "history_status_dedupe_none": "No duplicates among {files} files",
+    "history_confirm_dedupe_title": "Link Duplicates",
+    "history_confirm_dedupe_message": "Found {groups} sets of identical files ({files} copies, {size} reclaimable).\n\nReplace the copies with hardlinks to one file?",
+    "history_status_dedupe_skipped": "No files were changed",
+    "history_status_dedupe_done": "Linked {files} duplicate files, {size} reclaimed",
+    "history_status_dedupe_errors": " ({count} errors, see log)",
+    "history_status_dedupe_failed": "Duplicate check failed: {error}",
+    "settings_dedupe_toggle": "Link duplicate downloads automatically",
+    "settings_dedupe_tooltip": "After each download, replaces byte-identical copies already in the download folder with a hardlink to one file.",
+    "settings_bandwidth_title": "Bandwidth Limit",
+    "settings_bandwidth_description": "Cap the total speed of all downloads combined, shared evenly between them.",
+    "settings_bandwidth_label": "Maximum speed (KB/s):",
+    "settings_bandwidth_hint": "Set to 0 for unlimited. Changes apply to running downloads within a second.",
+    "settings_bandwidth_error": "Enter a whole number of KB/s (0 means unlimited).",
 }
@@ -23,13 +23,17 @@ def main():
     root = None
     logger = None
     try:
-        # Setup logger
-        logger = setup_logger()
-        logger.info(f"Starting {APP_NAME}")
-        
         # Initialize configuration
         config = ConfigManager()
         
+        # Setup logger
+        logger = setup_logger(
+            json_format=config.get_setting("log_format", "text") == "json",
+            max_bytes=int(float(config.get_setting("log_max_mb", 5) or 5) * 1024 * 1024),
+            backup_count=int(config.get_setting("log_backup_count", 5) or 0),
+        )
+        logger.info(f"Starting {APP_NAME}")
+        
         # Apply language and theme from settings
         language = config.get_setting("language", "en") or "en"
         set_language(language)
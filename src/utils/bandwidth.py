@@ -0,0 +1,228 @@
+"""
+Bandwidth Governor
+Process-wide bandwidth cap shared fairly by every concurrent transfer
+"""
+
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from src.utils.config_manager import ConfigManager
+from src.utils.metrics import get_metrics
+
+
+def parse_schedule(schedule):
+    """
+    Normalise the ``bandwidth_schedule`` setting
+
+    Each entry is ``{"start": "HH:MM", "end": "HH:MM", "limit_kb": N}``; windows
+    may wrap past midnight and ``limit_kb`` 0 means unlimited. Malformed entries
+    are skipped.
+
+    Args:
+        schedule: List of schedule entries
+
+    Returns:
+        list: (start_minute, end_minute, bytes_per_second) tuples
+    """
+    windows = []
+    for entry in schedule or []:
+        try:
+            start = _minute_of_day(entry["start"])
+            end = _minute_of_day(entry["end"])
+            limit = max(0, int(float(entry.get("limit_kb", 0)) * 1024))
+        except (KeyError, TypeError, ValueError, AttributeError):
+            continue
+        windows.append((start, end, limit))
+    return windows
+
+
+def _minute_of_day(value):
+    hours, minutes = str(value).split(":")
+    minute = int(hours) * 60 + int(minutes)
+    if not 0 <= minute <= 24 * 60:
+        raise ValueError(value)
+    return minute
+
+
+def scheduled_limit(windows, base_limit, when=None):
+    """
+    Return the cap in force at ``when``: the first matching window, else the base limit
+
+    Args:
+        windows: Output of parse_schedule()
+        base_limit: Bytes per second outside every window
+        when: datetime to evaluate (defaults to now)
+
+    Returns:
+        int: Bytes per second (0 = unlimited)
+    """
+    when = when or datetime.now()
+    minute = when.hour * 60 + when.minute
+    for start, end, limit in windows:
+        if start <= end:
+            if start <= minute < end:
+                return limit
+        elif minute >= start or minute < end:
+            return limit
+    return base_limit
+
+
+class TransferLease:
+    """One transfer's fair share of the governor: a token bucket refilled at cap / active transfers"""
+
+    def __init__(self, governor, cancel_token=None):
+        self.governor = governor
+        self.cancel_token = cancel_token
+        self.tokens = 0.0
+        self.last_refill = None
+        self.last_seen = None
+        self._reported = {}
+        self._lock = threading.Lock()
+
+    def progress_hook(self, status):
+        """yt-dlp ``progress_hooks`` entry that throttles by bytes since the last call"""
+        if status.get("status") not in ("downloading", "finished"):
+            return
+        # "finished" settles whatever arrived since the last report
+        filename = status.get("filename") or ""
+        done = status.get("downloaded_bytes") or status.get("total_bytes") or 0
+        with self._lock:
+            previous = self._reported.get(filename, 0)
+            self._reported[filename] = max(previous, done)
+        if done > previous:
+            self.governor.consume(self, done - previous)
+
+
+class BandwidthGovernor:
+    """Token-bucket bandwidth cap divided evenly between active transfers"""
+
+    def __init__(self, config=None, refresh_interval=1.0, burst_seconds=0.25, idle_after=2.0,
+                 sleep_slice=0.25, clock=time.monotonic, sleep=time.sleep):
+        """
+        Args:
+            config: Object with get_setting(); re-read every ``refresh_interval``
+                so cap and schedule changes apply to running batches
+            refresh_interval: Seconds between settings reads
+            burst_seconds: Share of a second each transfer may send ahead of its rate
+            idle_after: Seconds without progress before a transfer stops counting as active
+            sleep_slice: Longest single sleep, so a stop or pause is noticed quickly
+            clock: Monotonic time source
+            sleep: Sleep function (injectable for tests)
+        """
+        self.config = config
+        self.refresh_interval = refresh_interval
+        self.burst_seconds = burst_seconds
+        self.idle_after = idle_after
+        self.sleep_slice = sleep_slice
+        self._clock = clock
+        self._sleep = sleep
+        self._leases = set()
+        self._limit = 0
+        self._refreshed = None
+        self._lock = threading.Lock()
+
+    def current_limit(self):
+        """Return the cap in bytes per second now in force (0 = unlimited)"""
+        with self._lock:
+            return self._refresh(self._clock())
+
+    @contextmanager
+    def lease(self, cancel_token=None):
+        """
+        Register a transfer for the duration of the block and yield its TransferLease
+
+        Args:
+            cancel_token: CancellationToken of the transfer; throttling
+                sleeps end early once it is cancelled or paused
+        """
+        lease = TransferLease(self, cancel_token)
+        with self._lock:
+            self._leases.add(lease)
+        try:
+            yield lease
+        finally:
+            with self._lock:
+                self._leases.discard(lease)
+
+    def consume(self, lease, nbytes):
+        """
+        Charge ``nbytes`` to a lease, sleeping until its share allows them
+
+        yt-dlp reports progress in blocks of up to several MB, so at a low cap
+        one call can owe many seconds. The delay is slept in short slices and
+        cut short when the lease's token is cancelled or paused; the debt stays
+        on the lease and is slept off after a resume.
+
+        Args:
+            lease: TransferLease from lease()
+            nbytes: Bytes just transferred
+        """
+        with self._lock:
+            now = self._clock()
+            limit = self._refresh(now)
+            lease.last_seen = now
+            if not limit:
+                lease.last_refill = now
+                return
+            share = limit / self._active_count(now)
+            if lease.last_refill is not None:
+                lease.tokens = min(share * self.burst_seconds, lease.tokens + (now - lease.last_refill) * share)
+            lease.last_refill = now
+            lease.tokens -= nbytes
+            delay = -lease.tokens / share if lease.tokens < 0 else 0.0
+        if delay > 0:
+            self._throttle(lease, delay)
+
+    def _throttle(self, lease, delay):
+        """Sleep ``delay`` seconds in slices, returning early if the transfer stops or pauses"""
+        token = lease.cancel_token
+        deadline = self._clock() + delay
+        while True:
+            remaining = deadline - self._clock()
+            if remaining <= 0:
+                return
+            if token is not None and (token.is_cancelled() or token.is_paused()):
+                return
+            self._sleep(min(remaining, self.sleep_slice))
+
+    def _active_count(self, now):
+        """Transfers that reported progress recently; idle ones do not hold back a share"""
+        active = sum(
+            1 for lease in self._leases
+            if lease.last_seen is not None and now - lease.last_seen <= self.idle_after
+        )
+        return max(1, active)
+
+    def _refresh(self, now):
+        """Re-read the cap and schedule from settings at most once per refresh interval"""
+        if self.config is None:
+            return self._limit
+        if self._refreshed is not None and now - self._refreshed < self.refresh_interval:
+            return self._limit
+        self._refreshed = now
+        try:
+            base_limit = max(0, int(float(self.config.get_setting("bandwidth_limit_kb", 0) or 0) * 1024))
+        except (TypeError, ValueError):
+            base_limit = 0
+        windows = parse_schedule(self.config.get_setting("bandwidth_schedule", []))
+        self._limit = scheduled_limit(windows, base_limit)
+        get_metrics().set("rate_limit_bytes_per_second", self._limit)
+        return self._limit
+
+
+_governor = None
+_governor_lock = threading.Lock()
+
+
+def get_bandwidth_governor():
+    """Return the process-wide BandwidthGovernor, reading limits from the app settings."""
+    global _governor
+    with _governor_lock:
+        if _governor is None:
+            _governor = BandwidthGovernor(ConfigManager())
+        return _governor
@@ -19,6 +19,8 @@ class ConfigManager:
     _settings_cache = None
     _settings_mtime = None
     _cache_lock = threading.RLock()
+    # Serialises history.json updates across instances and download threads
+    _history_lock = threading.RLock()
 
     def __init__(self):
         self.settings_file = SETTINGS_FILE
@@ -146,22 +148,16 @@ class ConfigManager:
         if not self.get_setting("save_history"):
             return
         
-        history = self.get_history()
-        
         # Add timestamp
         item['date'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
-        history.append(item)
-        
-        # Keep only last 100 items
-        if len(history) > 100:
-            history = history[-100:]
+        def append(history):
+            history.append(item)
+            # Keep only last 100 items
+            del history[:-100]
+            return True
         
-        try:
-            with open(self.history_file, 'w', encoding='utf-8') as f:
-                json.dump(history, f, indent=4)
-        except Exception as e:
-            print(f"Error saving history: {e}")
+        self.update_history(append)
     
     def get_history(self):
         """
@@ -170,22 +166,67 @@ class ConfigManager:
         Returns:
             list: History items
         """
-        if not self.history_file.exists():
-            return []
+        with ConfigManager._history_lock:
+            try:
+                return self._read_history()
+            except Exception:
+                return []
+    
+    def update_history(self, update):
+        """
+        Read, change and write the history as one step
         
-        try:
-            with open(self.history_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except:
-            return []
+        Concurrent downloads add entries at the same time, so every
+        read-modify-write of history.json goes through here. An unreadable
+        file is left alone rather than replaced with a near-empty one.
+        
+        Args:
+            update: Function that changes the history list in place and
+                returns True if it should be written
+        """
+        with ConfigManager._history_lock:
+            try:
+                history = self._read_history()
+            except Exception as e:
+                print(f"Error reading history, not updating it: {e}")
+                return
+            if update(history):
+                self._write_history(history)
+    
+    def save_history(self, history):
+        """
+        Replace the stored download history
+        
+        Args:
+            history: List of history items
+        """
+        with ConfigManager._history_lock:
+            self._write_history(history)
     
     def clear_history(self):
         """Clear download history"""
+        with ConfigManager._history_lock:
+            self._write_history([])
+    
+    def _read_history(self):
+        """Load history.json; raises if it exists but cannot be parsed"""
+        if not self.history_file.exists():
+            return []
+        with open(self.history_file, 'r', encoding='utf-8') as f:
+            history = json.load(f)
+        if not isinstance(history, list):
+            raise ValueError("History file root must be a JSON list")
+        return history
+    
+    def _write_history(self, history):
+        """Write history.json through a temp file so readers never see a partial file"""
+        temp_file = self.history_file.with_name(f"{self.history_file.name}.tmp")
         try:
-            with open(self.history_file, 'w', encoding='utf-8') as f:
-                json.dump([], f)
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(history, f, indent=4)
+            os.replace(temp_file, self.history_file)
         except Exception as e:
-            print(f"Error clearing history: {e}")
+            print(f"Error saving history: {e}")
     
     def export_settings(self, export_path):
         """
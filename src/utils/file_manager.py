@@ -3,11 +3,13 @@ File Manager
 Handle file operations and management
 """
 
+import errno
 import os
 import shutil
 from pathlib import Path
 import re
 import sys
+import threading
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 from config import DOWNLOADS_DIR
@@ -16,6 +18,12 @@ from config import DOWNLOADS_DIR
 class FileManager:
     """Manage files and directories"""
     
+    # Placeholders created by reserve_unique_filename and not yet replaced or
+    # released: absolute path -> identity of the empty file we made. The
+    # ctime is part of it because a freed inode number is often reused at once.
+    _reservations = {}
+    _reservations_lock = threading.Lock()
+    
     @staticmethod
     def create_directory(path):
         """
@@ -78,6 +86,106 @@ class FileManager:
         
         return unique_filename
     
+    @staticmethod
+    def reserve_unique_filename(directory, filename):
+        """
+        Atomically claim a unique filename in a directory
+        
+        Each name is claimed on disk with an empty placeholder created via
+        ``O_CREAT | O_EXCL``, so the filesystem decides which names are free
+        and concurrent writers (threads or processes) never get the same one.
+        When ``filename`` is taken, a free ``name_N`` suffix is located with a
+        doubling then bisecting search, which needs O(log k) lookups for k
+        existing copies instead of one per copy. The caller is expected to
+        replace the placeholder with the real file (``relocate_file``) or
+        call ``release_filename``.
+        
+        Args:
+            directory: Target directory
+            filename: Desired filename
+        
+        Returns:
+            str: Reserved filename
+        """
+        directory = Path(directory)
+        base_name = Path(filename).stem
+        extension = Path(filename).suffix
+        
+        if FileManager._claim_filename(directory / filename):
+            return filename
+        
+        counter = FileManager._find_free_suffix(directory, base_name, extension)
+        while True:
+            candidate = f"{base_name}_{counter}{extension}"
+            if FileManager._claim_filename(directory / candidate):
+                return candidate
+            # Claimed by a concurrent writer since the search; try the next one.
+            counter += 1
+    
+    @staticmethod
+    def release_filename(directory, filename):
+        """
+        Give up a name claimed with reserve_unique_filename
+        
+        Only the placeholder this process created is removed, and only while
+        it is still empty. A file moved into place since (even an empty one)
+        or a name that someone else created is left untouched.
+        
+        Args:
+            directory: Directory the name was reserved in
+            filename: Reserved filename
+        """
+        path = Path(directory) / filename
+        with FileManager._reservations_lock:
+            placeholder = FileManager._reservations.pop(os.path.abspath(path), None)
+        if placeholder is None:
+            return
+        try:
+            stat = path.lstat()
+            if FileManager._file_identity(stat) == placeholder and stat.st_size == 0:
+                path.unlink()
+        except OSError:
+            pass
+    
+    @staticmethod
+    def _claim_filename(path):
+        """Create an empty placeholder at ``path``; False if the name is taken."""
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+        try:
+            stat = os.fstat(fd)
+        finally:
+            os.close(fd)
+        with FileManager._reservations_lock:
+            FileManager._reservations[os.path.abspath(path)] = FileManager._file_identity(stat)
+        return True
+    
+    @staticmethod
+    def _find_free_suffix(directory, base_name, extension):
+        """
+        Return a suffix N for which ``base_name_N`` looks free
+        
+        Assumes copies are numbered from 1 without gaps: doubles N until a
+        free name is seen, then bisects back to the first free one. With gaps
+        it may return a higher free number, which is still unique.
+        """
+        def taken(counter):
+            return os.path.lexists(directory / f"{base_name}_{counter}{extension}")
+        
+        high = 1
+        while taken(high):
+            high *= 2
+        low = high // 2
+        while high - low > 1:
+            middle = (low + high) // 2
+            if taken(middle):
+                low = middle
+            else:
+                high = middle
+        return high
+    
     @staticmethod
     def get_file_size(file_path):
         """
@@ -115,11 +223,144 @@ class FileManager:
             bool: Success status
         """
         try:
-            shutil.move(str(source), str(destination))
+            if Path(source).is_dir():
+                shutil.move(str(source), str(destination))
+                return True
+            destination = Path(destination)
+            if destination.is_dir():
+                destination = destination / Path(source).name
+            FileManager.relocate_file(source, destination)
             return True
         except:
             return False
     
+    @staticmethod
+    def relocate_file(source, destination):
+        """
+        Move a file, using an in-kernel copy when it has to cross filesystems
+        
+        A plain rename is tried first. When the destination lives on another
+        filesystem the data is copied with ``os.copy_file_range`` or
+        ``os.sendfile`` where available (falling back to a buffered copy),
+        metadata is preserved and the copy is fsynced before the source is
+        removed.
+        
+        Args:
+            source: Source file path
+            destination: Destination file path
+        
+        Returns:
+            Path: Final destination path
+        """
+        source = Path(source)
+        destination = Path(destination)
+        
+        try:
+            os.replace(source, destination)
+            FileManager._forget_reservation(destination)
+            return destination
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+        
+        temp_destination = destination.with_name(f".{destination.name}.relocating")
+        try:
+            FileManager._copy_file_contents(source, temp_destination)
+            shutil.copystat(source, temp_destination)
+            os.replace(temp_destination, destination)
+            FileManager._forget_reservation(destination)
+            FileManager._fsync_directory(destination.parent)
+        except BaseException:
+            try:
+                os.remove(temp_destination)
+            except OSError:
+                pass
+            raise
+        
+        os.remove(source)
+        return destination
+    
+    @staticmethod
+    def _file_identity(stat):
+        return (stat.st_dev, stat.st_ino, stat.st_ctime_ns)
+    
+    @staticmethod
+    def _forget_reservation(path):
+        """A reserved name now holds the real file; it is no longer ours to release."""
+        with FileManager._reservations_lock:
+            FileManager._reservations.pop(os.path.abspath(path), None)
+    
+    @staticmethod
+    def _copy_file_contents(source, destination):
+        """Copy file data, preferring zero-copy kernel paths, then fsync it."""
+        with open(source, 'rb') as src, open(destination, 'wb') as dst:
+            size = os.fstat(src.fileno()).st_size
+            copied = 0
+            
+            for copier in (FileManager._copy_with_copy_file_range, FileManager._copy_with_sendfile):
+                if copied >= size:
+                    break
+                copied = copier(src.fileno(), dst.fileno(), copied, size)
+            
+            if copied < size:
+                src.seek(copied)
+                dst.seek(copied)
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+            
+            dst.flush()
+            os.fsync(dst.fileno())
+    
+    @staticmethod
+    def _copy_with_copy_file_range(src_fd, dst_fd, offset, size):
+        """Copy with copy_file_range; returns the offset reached."""
+        if not hasattr(os, "copy_file_range"):
+            return offset
+        try:
+            while offset < size:
+                sent = os.copy_file_range(src_fd, dst_fd, size - offset, offset, offset)
+                if sent == 0:
+                    break
+                offset += sent
+        except OSError as e:
+            # Unsupported by this kernel/filesystem pair; let the next copier continue.
+            if e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EBADF):
+                raise
+        return offset
+    
+    @staticmethod
+    def _copy_with_sendfile(src_fd, dst_fd, offset, size):
+        """Copy with sendfile; returns the offset reached."""
+        # Only Linux sends to a regular file; macOS and the BSDs need a socket (ENOTSOCK)
+        if not hasattr(os, "sendfile") or not sys.platform.startswith("linux"):
+            return offset
+        try:
+            os.lseek(dst_fd, offset, os.SEEK_SET)
+            while offset < size:
+                sent = os.sendfile(dst_fd, src_fd, offset, min(size - offset, 1 << 30))
+                if sent == 0:
+                    break
+                offset += sent
+        except OSError as e:
+            if e.errno not in (errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EBADF):
+                raise
+        return offset
+    
+    @staticmethod
+    def _fsync_directory(directory):
+        """Persist a directory entry change where the platform allows it."""
+        if sys.platform == "win32":
+            return
+        try:
+            fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+    
     @staticmethod
     def delete_file(file_path):
         """
@@ -3,26 +3,93 @@ Logger
 Application logging utilities
 """
 
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
+import queue
 import sys
 import os
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
 from pathlib import Path
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 from config import LOG_FILE, DATA_DIR
 
 
-def setup_logger(name="TikTokDownloader", level=logging.INFO):
+ROOT_LOGGER_NAME = "TikTokDownloader"
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - [%(run_id)s] - %(message)s'
+
+_run_id = ContextVar("log_run_id", default="-")
+_listener = None
+
+
+class CorrelationFilter(logging.Filter):
+    """Stamp each record with the run ID of the context that logged it"""
+
+    def filter(self, record):
+        record.run_id = _run_id.get()
+        return True
+
+
+class _PreparedQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that keeps the traceback separate from the message"""
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Format records as one JSON object per line"""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "run_id": getattr(record, "run_id", "-"),
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def setup_logger(name=ROOT_LOGGER_NAME, level=logging.INFO, json_format=False,
+                 max_bytes=5 * 1024 * 1024, backup_count=5):
     """
     Setup application logger
     
+    Records are handed to a queue on the calling thread and written to the
+    rotating log file and stdout by a background listener, so download
+    threads never wait on file I/O.
+    
     Args:
         name: Logger name
         level: Logging level
+        json_format: Write the log file as JSON lines instead of text
+        max_bytes: Rotate the log file once it reaches this size
+        backup_count: Number of rotated log files to keep
     
     Returns:
         Logger: Configured logger instance
     """
+    global _listener
+    
     # Ensure data directory exists
     DATA_DIR.mkdir(exist_ok=True)
     
@@ -30,11 +97,20 @@ def setup_logger(name="TikTokDownloader", level=logging.INFO):
     logger = logging.getLogger(name)
     logger.setLevel(level)
     
-    # Remove existing handlers
+    # Remove existing handlers and stop a previous listener
     logger.handlers.clear()
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
     
-    # File handler
-    file_handler = logging.FileHandler(LOG_FILE, encoding='utf-8')
+    # File handler (size-based rotation)
+    file_handler = logging.handlers.RotatingFileHandler(
+        LOG_FILE,
+        maxBytes=max_bytes,
+        backupCount=backup_count,
+        encoding='utf-8',
+        delay=True
+    )
     file_handler.setLevel(level)
     
     # Console handler
@@ -42,29 +118,79 @@ def setup_logger(name="TikTokDownloader", level=logging.INFO):
     console_handler.setLevel(level)
     
     # Formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
+    text_formatter = logging.Formatter(TEXT_FORMAT, datefmt='%Y-%m-%d %H:%M:%S')
+    
+    file_handler.setFormatter(JsonLinesFormatter() if json_format else text_formatter)
+    console_handler.setFormatter(text_formatter)
     
-    file_handler.setFormatter(formatter)
-    console_handler.setFormatter(formatter)
+    # Queue handler on the logger, real handlers on the listener thread
+    log_queue = queue.SimpleQueue()
+    queue_handler = _PreparedQueueHandler(log_queue)
+    queue_handler.addFilter(CorrelationFilter())
+    logger.addHandler(queue_handler)
     
-    # Add handlers
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    _listener = logging.handlers.QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    _listener.start()
     
     return logger
 
 
-def get_logger(name="TikTokDownloader"):
+def shutdown_logger():
+    """Flush queued records and stop the background listener."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logger)
+
+
+def get_logger(name=ROOT_LOGGER_NAME):
     """
     Get existing logger instance
     
+    Component loggers are children of the application logger so their
+    records reach the configured handlers.
+    
     Args:
         name: Logger name
     
     Returns:
         Logger: Logger instance
     """
+    if name != ROOT_LOGGER_NAME and not name.startswith(f"{ROOT_LOGGER_NAME}."):
+        name = f"{ROOT_LOGGER_NAME}.{name}"
     return logging.getLogger(name)
+
+
+def new_run_id():
+    """Generate a short correlation ID for a run."""
+    return uuid.uuid4().hex[:8]
+
+
+def current_run_id():
+    """Return the correlation ID of the current context ('-' outside a run)."""
+    return _run_id.get()
+
+
+@contextmanager
+def run_context(run_id=None):
+    """
+    Tag every log record in this context with a correlation ID
+
+    Nested runs keep the outer ID unless one is passed explicitly.
+    
+    Args:
+        run_id: Correlation ID to use (generated when omitted)
+    """
+    if run_id is None:
+        outer = _run_id.get()
+        run_id = outer if outer != "-" else new_run_id()
+    token = _run_id.set(run_id)
+    try:
+        yield run_id
+    finally:
+        _run_id.reset(token)
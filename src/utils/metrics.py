@@ -0,0 +1,253 @@
+"""
+Metrics
+Downloader counters and gauges, exported as a Prometheus textfile and JSON
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from config import METRICS_DIR
+from src.utils.timing import get_stage_stats
+
+
+METRIC_PREFIX = "tiktok_downloader"
+
+# name -> (type, help)
+METRIC_DEFINITIONS = {
+    "downloads_started_total": ("counter", "Downloads started."),
+    "downloads_succeeded_total": ("counter", "Downloads finished successfully."),
+    "downloads_failed_total": ("counter", "Downloads that failed, by error class."),
+    "bytes_transferred_total": ("counter", "Bytes of media written to the library."),
+    "active_workers": ("gauge", "Downloads currently in flight."),
+    "queue_depth": ("gauge", "Items waiting in batch and profile queues, by queue."),
+    "rate_limit_bytes_per_second": ("gauge", "Current bandwidth cap in bytes per second (0 = unlimited)."),
+    "scheduler_waiting": ("gauge", "Downloads waiting for a scheduler slot, by priority class."),
+    "prefetch_total": ("counter", "Metadata prefetch lookups, by result (hit, miss, error)."),
+    "concurrency_limit": ("gauge", "Download slots allowed by the adaptive concurrency controller."),
+}
+
+
+class MetricsRegistry:
+    """Thread-safe store of labelled counters and gauges"""
+
+    def __init__(self):
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name, value=1, **labels):
+        """Increase a counter (or gauge) by ``value``."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def dec(self, name, value=1, **labels):
+        """Decrease a gauge by ``value``."""
+        self.inc(name, -value, **labels)
+
+    def set(self, name, value, **labels):
+        """Set a gauge to ``value``."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._values[key] = value
+
+    def get(self, name, **labels):
+        """Read the current value of a metric."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            return self._values.get(key, 0)
+
+    def reset(self):
+        """Forget every value (mostly for tests)."""
+        with self._lock:
+            self._values.clear()
+
+    def snapshot(self):
+        """
+        Build a JSON-serialisable view of all metrics
+
+        Returns:
+            dict: {"timestamp", "metrics": {name: [{"labels", "value"}]}, "stages": {...}}
+        """
+        with self._lock:
+            items = list(self._values.items())
+
+        metrics = {}
+        for (name, labels), value in sorted(items):
+            metrics.setdefault(name, []).append({"labels": dict(labels), "value": value})
+
+        return {"timestamp": time.time(), "metrics": metrics, "stages": get_stage_stats()}
+
+    def to_prometheus(self):
+        """Render all metrics in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines = []
+
+        for name, samples in snapshot["metrics"].items():
+            metric_type, help_text = METRIC_DEFINITIONS.get(name, ("untyped", name))
+            full_name = f"{METRIC_PREFIX}_{name}"
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} {metric_type}")
+            for sample in samples:
+                lines.append(f"{full_name}{_format_labels(sample['labels'])} {_format_value(sample['value'])}")
+
+        if snapshot["stages"]:
+            full_name = f"{METRIC_PREFIX}_stage_duration_seconds"
+            lines.append(f"# HELP {full_name} Download pipeline stage durations.")
+            lines.append(f"# TYPE {full_name} summary")
+            for stage, stats in sorted(snapshot["stages"].items()):
+                for quantile, key in (("0.5", "p50"), ("0.95", "p95"), ("0.99", "p99")):
+                    labels = _format_labels({"stage": stage, "quantile": quantile})
+                    lines.append(f"{full_name}{labels} {_format_value(stats[key])}")
+                lines.append(f"{full_name}_sum{_format_labels({'stage': stage})} {_format_value(stats['total'])}")
+                lines.append(f"{full_name}_count{_format_labels({'stage': stage})} {stats['count']}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    pairs = (f'{key}="{_escape_label(value)}"' for key, value in sorted(labels.items()))
+    return "{" + ",".join(pairs) + "}"
+
+
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value):
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+def _write_atomic(path, text):
+    """Write via a unique hidden temp file and rename, so readers never see a partial file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        # mkstemp creates 0600; node_exporter usually runs as another user
+        os.chmod(temp_name, 0o666 & ~_UMASK)
+        os.replace(temp_name, path)
+    except BaseException:
+        try:
+            os.unlink(temp_name)
+        except OSError:
+            pass
+        raise
+
+
+def _read_umask():
+    # os.umask can only be read by setting it; done once at import, before
+    # download threads exist, so no file is created under the temporary 0
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+_UMASK = _read_umask()
+
+_registry = MetricsRegistry()
+
+
+def get_metrics():
+    """Return the process-wide MetricsRegistry."""
+    return _registry
+
+
+class MetricsExporter:
+    """Periodically write the registry to a Prometheus textfile and a JSON snapshot"""
+
+    def __init__(self, registry=None, textfile=None, json_file=None, interval=15.0):
+        """
+        Args:
+            registry: MetricsRegistry to export (defaults to the global one)
+            textfile: Path of the .prom file for node_exporter's textfile collector
+            json_file: Path of the JSON snapshot
+            interval: Seconds between writes
+        """
+        self.registry = registry or _registry
+        self.textfile = Path(textfile) if textfile else METRICS_DIR / f"{METRIC_PREFIX}.prom"
+        self.json_file = Path(json_file) if json_file else METRICS_DIR / "metrics.json"
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_config(cls, config):
+        """Build an exporter from the metrics_* settings."""
+        return cls(
+            textfile=config.get_setting("metrics_textfile_path") or None,
+            json_file=config.get_setting("metrics_json_path") or None,
+            interval=float(config.get_setting("metrics_interval_seconds", 15) or 15),
+        )
+
+    def write(self):
+        """Write both export files now."""
+        try:
+            _write_atomic(self.textfile, self.registry.to_prometheus())
+            _write_atomic(self.json_file, json.dumps(self.registry.snapshot(), indent=2))
+        except OSError as e:
+            print(f"Error writing metrics: {e}")
+
+    def start(self):
+        """Start the background writer thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="MetricsExporter", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the writer thread and write a final snapshot."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+        self.write()
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            self.write()
+
+
+_session_lock = threading.Lock()
+_session_exporter = None
+_session_users = 0
+
+
+@contextmanager
+def metrics_export_session(config):
+    """
+    Keep the shared exporter running for the duration of a batch or profile run
+
+    Nested runs (a profile inside a batch) share one exporter; the final
+    snapshot is written when the outermost run finishes.
+    """
+    global _session_exporter, _session_users
+    enabled = bool(config.get_setting("metrics_export", False))
+    if enabled:
+        with _session_lock:
+            if _session_exporter is None:
+                _session_exporter = MetricsExporter.from_config(config)
+                _session_exporter.start()
+            _session_users += 1
+    try:
+        yield
+    finally:
+        if enabled:
+            with _session_lock:
+                _session_users -= 1
+                if _session_users == 0 and _session_exporter is not None:
+                    _session_exporter.stop()
+                    _session_exporter = None
@@ -0,0 +1,215 @@
+"""
+Profiling
+Opt-in cProfile and tracemalloc capture for batch and profile runs
+"""
+
+import cProfile
+import os
+import pstats
+import re
+import sys
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from config import PROFILES_DIR
+
+
+PROFILE_ENV_VAR = "TIKTOK_DL_PROFILE"
+
+
+class RunProfiler:
+    """
+    cProfile the run and diff tracemalloc snapshots taken every N items
+
+    cProfile only sees the thread that enabled it, so worker threads wrap
+    their loop in profile_thread(); their stats are merged into the run's
+    .pstats file when it stops.
+    """
+
+    def __init__(self, run_name, snapshot_every=50, top=15):
+        """
+        Args:
+            run_name: Name used for the output files
+            snapshot_every: Take a tracemalloc snapshot every N items (0 = start/end only)
+            top: Number of allocation sites reported in the diff
+        """
+        self.run_name = run_name
+        self.snapshot_every = snapshot_every
+        self.top = top
+        self.items = 0
+        self.snapshots = []
+        self.profile = cProfile.Profile()
+        self.thread_profiles = []
+        self._started_tracemalloc = False
+        self._lock = threading.Lock()
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+            self._started_tracemalloc = True
+        self._snapshot("start")
+        self.profile.enable()
+
+    @contextmanager
+    def profile_thread(self):
+        """Profile the calling thread for the enclosed block and keep its stats for the dump"""
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Python 3.12+ profiles through sys.monitoring, which already covers every thread
+            yield
+            return
+        try:
+            yield
+        finally:
+            profile.disable()
+            with self._lock:
+                self.thread_profiles.append(profile)
+
+    def tick(self):
+        """Mark one finished item; snapshots memory every ``snapshot_every`` items."""
+        with self._lock:
+            self.items += 1
+            due = self.snapshot_every and self.items % self.snapshot_every == 0
+        if due:
+            self._snapshot(f"item {self.items}")
+
+    def stop(self):
+        """
+        Stop profiling and write the .pstats file plus a memory report
+
+        Returns:
+            tuple: (pstats path, memory report path)
+        """
+        self.profile.disable()
+        self._snapshot("end")
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+
+        PROFILES_DIR.mkdir(parents=True, exist_ok=True)
+        safe_name = re.sub(r"[^A-Za-z0-9._-]+", "_", self.run_name).strip("_") or "run"
+        stem = f"{safe_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        stats_path = PROFILES_DIR / f"{stem}.pstats"
+        memory_path = PROFILES_DIR / f"{stem}_memory.txt"
+
+        stats = pstats.Stats(self.profile)
+        with self._lock:
+            thread_profiles = list(self.thread_profiles)
+        for profile in thread_profiles:
+            try:
+                stats.add(profile)
+            except TypeError:
+                # A thread that never ran any Python code has no stats to add
+                pass
+        stats.dump_stats(str(stats_path))
+        with open(memory_path, 'w', encoding='utf-8') as f:
+            f.write(self.memory_report())
+        return stats_path, memory_path
+
+    def memory_report(self):
+        """Traced memory per snapshot and the top allocation growth from first to last."""
+        lines = [f"Memory profile for {self.run_name} ({self.items} items)", ""]
+        for label, snapshot, current, peak in self.snapshots:
+            lines.append(f"{label:<16} current={current / 1024 / 1024:.1f} MB peak={peak / 1024 / 1024:.1f} MB")
+
+        if len(self.snapshots) >= 2:
+            first = self.snapshots[0][1]
+            last = self.snapshots[-1][1]
+            lines.append("")
+            lines.append(f"Top {self.top} allocation sites by growth:")
+            for stat in last.compare_to(first, "lineno")[: self.top]:
+                lines.append(f"  {stat}")
+        return "\n".join(lines) + "\n"
+
+    def _snapshot(self, label):
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        current, peak = tracemalloc.get_traced_memory()
+        with self._lock:
+            self.snapshots.append((label, snapshot, current, peak))
+
+
+class _NullProfiler:
+    """Stand-in used when profiling is off."""
+
+    def tick(self):
+        pass
+
+
+def profiling_enabled(config):
+    """Profiling is on when the profile_runs setting or the TIKTOK_DL_PROFILE env var is set."""
+    env_value = os.environ.get(PROFILE_ENV_VAR, "").strip().lower()
+    if env_value in {"1", "true", "yes", "on"}:
+        return True
+    return bool(config.get_setting("profile_runs", False))
+
+
+_session_lock = threading.Lock()
+_active_profiler = None
+# Profiler of the run the current context belongs to; copied into worker threads with the context
+_current_profiler = ContextVar("run_profiler", default=None)
+
+
+@contextmanager
+def profile_thread():
+    """Profile the calling thread into the current run's profile, if the run is being profiled"""
+    profiler = _current_profiler.get()
+    if profiler is None:
+        yield
+        return
+    with profiler.profile_thread():
+        yield
+
+
+@contextmanager
+def profile_session(config, run_name, logger=None):
+    """
+    Profile a batch or profile run when profiling is enabled
+
+    Yields an object with ``tick()`` to call once per finished item. A run
+    nested inside an already profiled run reuses the outer profiler, since
+    only one cProfile can be active at a time.
+    """
+    global _active_profiler
+    if not profiling_enabled(config):
+        yield _NullProfiler()
+        return
+
+    with _session_lock:
+        if _active_profiler is not None:
+            outer = _active_profiler
+        else:
+            outer = None
+            _active_profiler = RunProfiler(
+                run_name,
+                snapshot_every=int(config.get_setting("profile_snapshot_every", 50) or 0),
+            )
+        profiler = outer or _active_profiler
+
+    if outer is not None:
+        yield profiler
+        return
+
+    profiler.start()
+    token = _current_profiler.set(profiler)
+    try:
+        yield profiler
+    finally:
+        _current_profiler.reset(token)
+        try:
+            stats_path, memory_path = profiler.stop()
+            if logger:
+                logger.info(f"Profile written to {stats_path}; memory report {memory_path}")
+        except Exception as e:
+            if logger:
+                logger.error(f"Failed to write profile: {e}")
+        finally:
+            with _session_lock:
+                _active_profiler = None
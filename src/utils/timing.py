@@ -0,0 +1,163 @@
+"""
+Stage Timing
+Per-stage spans for the download pipeline, summarised as percentiles
+"""
+
+import math
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from src.utils.tracing import record_trace
+
+
+class StageTimer:
+    """Collect durations per pipeline stage and report p50/p95/p99"""
+
+    def __init__(self, max_samples=10000):
+        """
+        Args:
+            max_samples: Samples kept per stage (oldest are dropped first)
+        """
+        self.max_samples = max_samples
+        self._samples = {}
+        self._counts = {}
+        self._totals = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds):
+        """Record one duration for a stage."""
+        with self._lock:
+            samples = self._samples.setdefault(stage, [])
+            samples.append(seconds)
+            if len(samples) > self.max_samples:
+                del samples[: len(samples) - self.max_samples]
+            self._counts[stage] = self._counts.get(stage, 0) + 1
+            self._totals[stage] = self._totals.get(stage, 0.0) + seconds
+
+    def stats(self):
+        """
+        Summarise every stage
+
+        Returns:
+            dict: stage -> {"count", "total", "mean", "p50", "p95", "p99", "max"}
+        """
+        with self._lock:
+            snapshot = {stage: sorted(samples) for stage, samples in self._samples.items()}
+            counts = dict(self._counts)
+            totals = dict(self._totals)
+
+        summary = {}
+        for stage, samples in snapshot.items():
+            if not samples:
+                continue
+            summary[stage] = {
+                "count": counts[stage],
+                "total": totals[stage],
+                "mean": totals[stage] / counts[stage],
+                "p50": _percentile(samples, 50),
+                "p95": _percentile(samples, 95),
+                "p99": _percentile(samples, 99),
+                "max": samples[-1],
+            }
+        return summary
+
+    def reset(self):
+        """Forget all recorded samples."""
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+            self._totals.clear()
+
+    def format_report(self, title="Stage timings"):
+        """Render the stats as a small fixed-width table for the log."""
+        stats = self.stats()
+        if not stats:
+            return f"{title}: no samples"
+        lines = [f"{title}:", f"  {'stage':<14}{'count':>7}{'p50':>10}{'p95':>10}{'p99':>10}{'total':>11}"]
+        for stage, values in sorted(stats.items(), key=lambda item: -item[1]["total"]):
+            lines.append(
+                f"  {stage:<14}{values['count']:>7}"
+                f"{values['p50'] * 1000:>8.0f}ms{values['p95'] * 1000:>8.0f}ms"
+                f"{values['p99'] * 1000:>8.0f}ms{values['total']:>10.2f}s"
+            )
+        return "\n".join(lines)
+
+
+def _percentile(sorted_samples, percent):
+    """Nearest-rank percentile of an already sorted list."""
+    rank = max(0, min(len(sorted_samples) - 1, math.ceil(percent / 100 * len(sorted_samples)) - 1))
+    return sorted_samples[rank]
+
+
+# Process-wide timer plus per-run collectors active in the current context.
+_global_timer = StageTimer()
+_collectors = ContextVar("stage_collectors", default=())
+
+
+def get_stage_timer():
+    """Return the process-wide StageTimer."""
+    return _global_timer
+
+
+def get_stage_stats():
+    """Return cumulative per-stage stats for this process."""
+    return _global_timer.stats()
+
+
+def record_stage(stage, seconds, started=None):
+    """Record a duration into the global timer, active run collectors and the tracer."""
+    _global_timer.record(stage, seconds)
+    for collector in _collectors.get():
+        collector.record(stage, seconds)
+    if started is None:
+        started = time.perf_counter() - seconds
+    record_trace(stage, "stage", started, seconds)
+
+
+@contextmanager
+def stage_span(stage):
+    """Time the enclosed block as one sample of ``stage``."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - started, started)
+
+
+@contextmanager
+def collect_stages():
+    """
+    Collect the spans recorded in this context into a fresh StageTimer
+
+    Used by batch and profile runs so each run can report its own
+    percentiles while the global timer keeps process totals.
+    """
+    timer = StageTimer()
+    token = _collectors.set(_collectors.get() + (timer,))
+    try:
+        yield timer
+    finally:
+        _collectors.reset(token)
+
+
+class PostprocessTimer:
+    """yt-dlp ``postprocessor_hooks`` entry that records a postprocess span per postprocessor"""
+
+    def __init__(self):
+        self.total = 0.0
+        self._started = {}
+
+    def hook(self, status):
+        name = status.get("postprocessor")
+        if status.get("status") == "started":
+            self._started[name] = time.perf_counter()
+        elif status.get("status") == "finished" and name in self._started:
+            started = self._started.pop(name)
+            elapsed = time.perf_counter() - started
+            self.total += elapsed
+            record_stage("postprocess", elapsed, started)
@@ -0,0 +1,163 @@
+"""
+Tracing
+Opt-in Chrome trace (Perfetto / about:tracing) timeline of batch runs
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from config import TRACES_DIR
+
+
+TRACE_ENV_VAR = "TIKTOK_DL_TRACE"
+
+
+class ChromeTracer:
+    """Record per-thread complete events and write them as Chrome trace JSON"""
+
+    def __init__(self, max_events=500000):
+        self.max_events = max_events
+        self.events = []
+        self.dropped = 0
+        self._thread_names = {}
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def add_complete(self, name, category, started, duration, args=None):
+        """
+        Record one finished span
+
+        Args:
+            name: Event name (stage or task)
+            category: Trace category, e.g. "stage" or "task"
+            started: time.perf_counter() value at the start of the span
+            duration: Span length in seconds
+            args: Extra details shown in the trace viewer
+        """
+        thread = threading.current_thread()
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (started - self._origin) * 1_000_000,
+            "dur": duration * 1_000_000,
+            "pid": os.getpid(),
+            "tid": thread.ident,
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            if len(self.events) >= self.max_events:
+                self.dropped += 1
+                return
+            self.events.append(event)
+            self._thread_names.setdefault(thread.ident, thread.name)
+
+    def to_dict(self):
+        """Build the trace document, including thread name metadata."""
+        with self._lock:
+            events = list(self.events)
+            thread_names = dict(self._thread_names)
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": name}}
+            for tid, name in thread_names.items()
+        ]
+        return {
+            "traceEvents": metadata + events,
+            "displayTimeUnit": "ms",
+            "otherData": {"dropped_events": self.dropped},
+        }
+
+    def write(self, path):
+        """Write the trace JSON to ``path``."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f)
+        return path
+
+
+_session_lock = threading.Lock()
+_active_tracer = None
+_session_users = 0
+
+
+def get_active_tracer():
+    """Return the tracer of the running session, or None when tracing is off."""
+    return _active_tracer
+
+
+def record_trace(name, category, started, duration, args=None):
+    """Record a span into the active tracer if there is one."""
+    tracer = _active_tracer
+    if tracer is not None:
+        tracer.add_complete(name, category, started, duration, args)
+
+
+@contextmanager
+def trace_span(name, category="task", **args):
+    """Record the enclosed block as one trace event when tracing is on."""
+    if _active_tracer is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_trace(name, category, started, time.perf_counter() - started, args or None)
+
+
+def tracing_enabled(config):
+    """Tracing is on when the trace_runs setting or the TIKTOK_DL_TRACE env var is set."""
+    env_value = os.environ.get(TRACE_ENV_VAR, "").strip().lower()
+    if env_value in {"1", "true", "yes", "on"}:
+        return True
+    return bool(config.get_setting("trace_runs", False))
+
+
+@contextmanager
+def trace_session(config, run_name, logger=None):
+    """
+    Trace a batch or profile run and write a Chrome trace when it ends
+
+    Nested runs share the outer session's tracer; the file is written once
+    the outermost run finishes, to data/traces/<run>_<timestamp>.json.
+    """
+    global _active_tracer, _session_users
+    if not tracing_enabled(config):
+        yield None
+        return
+
+    with _session_lock:
+        if _active_tracer is None:
+            _active_tracer = ChromeTracer()
+        _session_users += 1
+        tracer = _active_tracer
+
+    try:
+        with trace_span(run_name, category="run"):
+            yield tracer
+    finally:
+        with _session_lock:
+            _session_users -= 1
+            finished = _session_users == 0
+            if finished:
+                _active_tracer = None
+        if finished:
+            safe_name = re.sub(r"[^A-Za-z0-9._-]+", "_", run_name).strip("_") or "run"
+            filename = f"{safe_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            try:
+                path = tracer.write(TRACES_DIR / filename)
+                if logger:
+                    logger.info(f"Chrome trace written to {path} ({len(tracer.events)} events)")
+            except OSError as e:
+                if logger:
+                    logger.error(f"Failed to write trace: {e}")
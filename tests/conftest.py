@@ -0,0 +1,12 @@
+import os
+import shutil
+import tempfile
+
+# config.py creates the data folder and resolves every data file at import
+# time, so point it at a scratch folder before any test module imports it.
+_DATA_DIR = tempfile.mkdtemp(prefix="tiktok-tests-")
+os.environ["TIKTOK_DL_DATA_DIR"] = _DATA_DIR
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(_DATA_DIR, ignore_errors=True)
@@ -0,0 +1,85 @@
+import sys
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.core.cancellation import CancellationToken
+from src.utils.bandwidth import BandwidthGovernor, parse_schedule, scheduled_limit
+
+
+class _Config:
+    def __init__(self, **settings):
+        self.settings = settings
+
+    def get_setting(self, key, default=None):
+        return self.settings.get(key, default)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def test_active_transfers_split_the_cap_and_changes_apply_at_runtime():
+    clock = _Clock()
+    config = _Config(bandwidth_limit_kb=100)
+    governor = BandwidthGovernor(config, refresh_interval=1.0, burst_seconds=0, clock=clock, sleep=clock.sleep)
+
+    with governor.lease() as first, governor.lease() as second:
+        first.last_seen = second.last_seen = clock.now
+        governor.consume(first, 50 * 1024)
+        # Two active transfers: 50 KB at a 50 KB/s share takes one second, slept in slices
+        assert clock.slept == [0.25, 0.25, 0.25, 0.25]
+
+        config.settings["bandwidth_limit_kb"] = 0
+        clock.now += 1.0
+        governor.consume(second, 10 * 1024 * 1024)
+        assert sum(clock.slept) == 1.0
+
+
+def test_throttling_sleep_ends_early_on_stop_and_pause():
+    clock = _Clock()
+    token = CancellationToken()
+
+    def sleep(seconds):
+        clock.sleep(seconds)
+        if len(clock.slept) == 2:
+            token.pause()
+
+    governor = BandwidthGovernor(_Config(bandwidth_limit_kb=100), burst_seconds=0, clock=clock, sleep=sleep)
+
+    with governor.lease(token) as lease:
+        # A 4 MB block at 100 KB/s owes 40 seconds
+        governor.consume(lease, 4 * 1024 * 1024)
+        assert clock.slept == [0.25, 0.25]
+
+        # The debt is kept and slept off after the resume, until a stop
+        token.resume()
+        clock.slept.clear()
+        token.cancel()
+        governor.consume(lease, 1024)
+        assert clock.slept == []
+        assert lease.tokens < -39 * 100 * 1024
+
+
+def test_schedule_windows_wrap_midnight_and_fall_back_to_base_limit():
+    windows = parse_schedule([
+        {"start": "22:00", "end": "06:00", "limit_kb": 0},
+        {"start": "09:00", "end": "18:00", "limit_kb": 512},
+        {"start": "bad"},
+    ])
+
+    assert scheduled_limit(windows, 1024, datetime(2024, 1, 1, 23, 30)) == 0
+    assert scheduled_limit(windows, 1024, datetime(2024, 1, 1, 10, 0)) == 512 * 1024
+    assert scheduled_limit(windows, 1024, datetime(2024, 1, 1, 19, 0)) == 1024
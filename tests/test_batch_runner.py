@@ -0,0 +1,209 @@
+import sys
+import threading
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.core.app_models import BatchTask
+from src.core.batch_runner import ORDER_SHORTEST_FIRST, BatchRunner, FairQueue, expected_bytes
+
+
+def test_fair_queue_interleaves_flows_and_respects_creator_cap():
+    queue = FairQueue(per_creator_limit=1)
+    for index in range(3):
+        queue.put("profile:1", f"big-{index}", creator="big")
+    queue.put("links", "link-a", creator="a")
+    queue.put("links", "link-b", creator="b")
+
+    first = queue.get()
+    second = queue.get()
+    # "big" already has one in flight, so its next video must wait
+    third = queue.get()
+    assert [first, second, third] == ["big-0", "link-a", "link-b"]
+
+    queue.task_done(first)
+    assert queue.get() == "big-1"
+
+
+def test_shortest_first_serves_smallest_eligible_item():
+    queue = FairQueue(per_creator_limit=1, order=ORDER_SHORTEST_FIRST)
+    queue.put("profile:1", "big-large", creator="big", cost=900)
+    queue.put("profile:1", "big-small", creator="big", cost=100)
+    queue.put("links", "link-medium", creator="a", cost=500)
+
+    first = queue.get()
+    # "big" is at its cap, so the link runs before the profile's larger video
+    assert [first, queue.get()] == ["big-small", "link-medium"]
+    queue.task_done(first)
+    assert queue.get() == "big-large"
+
+
+def test_expected_bytes_falls_back_from_size_to_duration():
+    assert expected_bytes({"filesize_approx": 1234, "duration": 10}) == 1234
+    assert expected_bytes({"duration": 10}) > expected_bytes({"duration": 5})
+    assert expected_bytes({}) > 0
+
+
+class _Config:
+    def __init__(self, **settings):
+        self.settings = settings
+
+    def get_setting(self, key, default=None):
+        return self.settings.get(key, default)
+
+
+class _Downloader:
+    def __init__(self):
+        self.order = []
+        self.lock = threading.Lock()
+
+    def prefetch_info(self, url):
+        return {"webpage_url": url}
+
+    def download_video(self, url, **kwargs):
+        with self.lock:
+            self.order.append(url)
+        return {"success": True, "path": url, "title": url}
+
+
+class _Scraper:
+    library = None
+
+    def extract_username(self, url):
+        return url.rsplit("@", 1)[-1]
+
+    def resolve_output_path(self, username, create_folder=True):
+        return Path("out") / f"@{username}"
+
+    def list_videos(self, profile_url, limit=0):
+        return [{"url": f"https://www.tiktok.com/@big/video/{7300000000000000000 + i}", "id": None,
+                 "duration": None, "filesize_approx": (limit - i) * 1024 * 1024} for i in range(limit)]
+
+
+def test_links_are_not_stuck_behind_a_large_profile():
+    downloader = _Downloader()
+    tasks = [BatchTask(url="https://www.tiktok.com/@big", task_type="profile")]
+    tasks += [BatchTask(url=f"https://www.tiktok.com/@user{i}/video/{7200000000000000000 + i}", task_type="video")
+              for i in range(3)]
+
+    outcomes = BatchRunner(downloader, _Scraper(), _Config(), workers=1).run(
+        tasks, profile_limit=10, skip_existing=False
+    )
+
+    assert [outcome.downloaded for outcome in outcomes] == [10, 1, 1, 1]
+    assert all(outcome.finished and outcome.success for outcome in outcomes)
+    # Every loose link is done before the profile's fourth video
+    last_link = max(downloader.order.index(task.url) for task in tasks[1:])
+    assert last_link < 6
+
+
+def test_shortest_first_batch_records_completion_curve():
+    downloader = _Downloader()
+    tasks = [BatchTask(url="https://www.tiktok.com/@big", task_type="profile")]
+    runner = BatchRunner(downloader, _Scraper(), _Config(), workers=1, order=ORDER_SHORTEST_FIRST)
+
+    runner.run(tasks, profile_limit=4, skip_existing=False)
+
+    # The listing is largest first; shortest-first reverses it
+    assert downloader.order[0].endswith("7300000000000000003")
+    assert [point[1] for point in runner.completion_curve] == [1, 2, 3, 4]
+    assert [point[2] for point in runner.completion_curve] == [mb * 1024 * 1024 for mb in (1, 3, 6, 10)]
+
+
+class _FlakyDownloader(_Downloader):
+    def download_video(self, url, **kwargs):
+        super().download_video(url, **kwargs)
+        if self.order.count(url) < 3:
+            return {"success": False, "error": "Read timed out", "error_class": "transient"}
+        return {"success": True, "path": url, "title": url}
+
+
+def test_transient_failures_are_retried_after_the_queue_drains():
+    downloader = _FlakyDownloader()
+    url = "https://www.tiktok.com/@user/video/7200000000000000001"
+    config = _Config(retry_base_delay=0.01, skip_known_failures=False)
+    tasks = [BatchTask(url=url, task_type="video")]
+
+    outcomes = BatchRunner(downloader, _Scraper(), config, workers=1).run(tasks)
+
+    assert downloader.order == [url, url, url]
+    assert outcomes[0].success and outcomes[0].retried == 2 and outcomes[0].finished
+
+
+class _BrokenExtractorDownloader(_Downloader):
+    def download_video(self, url, **kwargs):
+        super().download_video(url, **kwargs)
+        if len(self.order) <= 3:
+            return {"success": False, "error": "Unable to extract universal data", "error_class": "extractor"}
+        return {"success": True, "path": url, "title": url}
+
+
+def test_breaker_holds_the_queue_and_loses_no_items():
+    downloader = _BrokenExtractorDownloader()
+    config = _Config(breaker_threshold=3, breaker_probe_interval=0.05, retry_base_delay=0.01,
+                     skip_known_failures=False)
+    tasks = [BatchTask(url=f"https://www.tiktok.com/@user{i}/video/{7200000000000000000 + i}", task_type="video")
+             for i in range(6)]
+    events = []
+
+    outcomes = BatchRunner(downloader, _Scraper(), config, workers=1).run(
+        tasks, on_event=lambda event, outcome, result: events.append(event)
+    )
+
+    assert all(outcome.success for outcome in outcomes)
+    assert events.count("breaker_open") == 1 and events.count("breaker_closed") == 1
+
+
+class _KnownFailureRunner(BatchRunner):
+    known_failures = set()
+
+    def _known_failure(self, url, state):
+        if url in self.known_failures:
+            return {"error": "Video unavailable", "error_class": "removed"}
+        return None
+
+
+def test_skipped_probe_item_lets_the_next_item_probe():
+    downloader = _BrokenExtractorDownloader()
+    config = _Config(breaker_threshold=2, breaker_probe_interval=0.05, retry_base_delay=0.01,
+                     skip_known_failures=False)
+    tasks = [BatchTask(url=f"https://www.tiktok.com/@user{i}/video/{7200000000000000000 + i}", task_type="video")
+             for i in range(6)]
+    runner = _KnownFailureRunner(downloader, _Scraper(), config, workers=1)
+    # The first item handed out after the breaker opens is skipped instead of downloaded
+    runner.known_failures = {tasks[2].url}
+    outcomes = []
+
+    thread = threading.Thread(target=lambda: outcomes.extend(runner.run(tasks)), daemon=True)
+    thread.start()
+    thread.join(5)
+
+    assert not thread.is_alive(), f"batch hung with the breaker {runner.breaker.state}"
+    assert outcomes[2].skipped == 1
+    assert all(outcome.success for index, outcome in enumerate(outcomes) if index != 2)
+
+
+class _InfoRecordingDownloader(_Downloader):
+    def __init__(self):
+        super().__init__()
+        self.infos = {}
+
+    def download_video(self, url, **kwargs):
+        self.infos[url] = kwargs.get("info")
+        return super().download_video(url, **kwargs)
+
+
+def test_known_failures_do_not_use_up_the_prefetch_window():
+    downloader = _InfoRecordingDownloader()
+    tasks = [BatchTask(url=f"https://www.tiktok.com/@user{i}/video/{7200000000000000000 + i}", task_type="video")
+             for i in range(8)]
+    runner = _KnownFailureRunner(downloader, _Scraper(), _Config(prefetch_window=4), workers=1)
+    runner.known_failures = {task.url for task in tasks[:4]}
+
+    outcomes = runner.run(tasks)
+
+    assert [outcome.skipped for outcome in outcomes] == [1, 1, 1, 1, 0, 0, 0, 0]
+    # Every download after the skipped links still got its prefetched metadata
+    assert downloader.infos == {task.url: {"webpage_url": task.url} for task in tasks[4:]}
@@ -0,0 +1,43 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+# run() points the data directory at a scratch folder before config is
+# imported, so it gets a fresh interpreter instead of this test process.
+SCRIPT = """
+import json
+from benchmarks.run_benchmarks import build_parser, run
+args = build_parser().parse_args(["--items", "3", "--media-mb", "0.05", "--workers", "2", "--no-save"])
+print()
+print(json.dumps(run(args)))
+"""
+
+
+def test_all_scenarios_download_every_item_from_the_fake_server(tmp_path):
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    env.pop("TIKTOK_DL_DATA_DIR", None)
+    completed = subprocess.run(
+        [sys.executable, "-c", SCRIPT],
+        cwd=tmp_path,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert completed.returncode == 0, completed.stderr[-2000:]
+
+    report = json.loads(completed.stdout.splitlines()[-1])
+    assert [result["scenario"] for result in report["results"]] == ["single", "batch", "profile"]
+    for result in report["results"]:
+        assert (result["items"], result["succeeded"], result["failed"]) == (3, 3, 0)
+        assert result["items_per_s"] > 0
+        assert result["latency_s"]["p50"] <= result["latency_s"]["p95"] <= result["latency_s"]["p99"]
+    assert report["conditions"]["media_size"] == int(0.05 * 1024 * 1024)
+    # Nothing leaks into the working directory
+    assert list(tmp_path.iterdir()) == []
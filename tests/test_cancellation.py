@@ -0,0 +1,103 @@
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks.fake_server import FakeTikTokServer, ServerProfile
+from benchmarks.stub_extractor import make_stub_extractors
+from src.core.cancellation import CancellationToken, DownloadCancelled
+from src.core.downloader import TikTokDownloader
+from src.core.media_backend import create_backend
+from src.core.scheduler import get_scheduler
+
+
+def test_pause_blocks_until_resume_and_cancel_releases():
+    token = CancellationToken()
+    token.pause()
+    assert token.is_paused()
+
+    released = []
+    waiter = threading.Thread(target=lambda: released.append(token.wait_if_paused()))
+    waiter.start()
+    token.cancel()
+    waiter.join(1)
+    assert released == [False]
+    try:
+        token.progress_hook({"status": "downloading"})
+    except DownloadCancelled:
+        pass
+    else:
+        raise AssertionError("cancelled token must abort the transfer")
+
+
+def test_cancel_aborts_transfer_and_removes_partial_file(tmp_path):
+    profile = ServerProfile(media_size=8 * 1024 * 1024, bandwidth=2 * 1024 * 1024)
+    with FakeTikTokServer(profile) as server:
+        backend = create_backend("yt-dlp", info_extractors=make_stub_extractors(server.base_url))
+        downloader = TikTokDownloader(backend=backend)
+        token = CancellationToken()
+        threading.Timer(0.5, token.cancel).start()
+
+        started = time.monotonic()
+        result = downloader.download_video(
+            "https://www.tiktok.com/@someone/video/7300000000000000001",
+            output_path=str(tmp_path),
+            cancel_token=token,
+        )
+
+    assert result["error_class"] == "cancelled"
+    assert time.monotonic() - started < 3  # the full file would take 4s
+    assert not [name for name in os.listdir(tmp_path / "@someone") if not name.startswith(".")]
+
+
+class _HookedBackend:
+    """Backend whose fetch reports progress through the download's hooks"""
+
+    def __init__(self, on_progress):
+        self.on_progress = on_progress
+
+    def extract(self, url, options):
+        return {"id": "7300000000000000001", "title": "Clip"}
+
+    def fetch(self, info, options):
+        path = Path(options["outtmpl"].replace("%(ext)s", "mp4"))
+        path.write_bytes(b"video")
+        self.on_progress()
+        for hook in options["progress_hooks"]:
+            hook({"status": "downloading", "filename": str(path), "downloaded_bytes": 5, "total_bytes": 5})
+        return info, path
+
+    def postprocess(self, info, path, options):
+        return path
+
+
+def test_concurrency_controller_ignores_stops_and_paused_time(tmp_path, monkeypatch):
+    scheduler = get_scheduler()
+    observed = []
+    monkeypatch.setattr(scheduler, "observe", lambda latency, error=None: observed.append((latency, error)))
+    url = "https://www.tiktok.com/@someone/video/7300000000000000001"
+
+    # Paused for 0.5s mid-transfer: only the working time is reported
+    token = CancellationToken()
+
+    def pause_briefly():
+        token.pause()
+        threading.Timer(0.5, token.resume).start()
+
+    downloader = TikTokDownloader(backend=_HookedBackend(pause_briefly))
+    result = downloader.download_video(url, output_path=str(tmp_path), filename="paused", cancel_token=token)
+    assert result["success"], result
+    assert len(observed) == 1 and observed[0][1] is None
+    assert observed[0][0] < 0.3
+
+    # Stopped mid-transfer: not a failure as far as the controller is concerned
+    token = CancellationToken()
+    downloader = TikTokDownloader(backend=_HookedBackend(token.cancel))
+    result = downloader.download_video(url, output_path=str(tmp_path), filename="stopped", cancel_token=token)
+    assert result["error_class"] == "cancelled"
+    assert len(observed) == 1
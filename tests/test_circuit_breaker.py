@@ -0,0 +1,74 @@
+import sys
+import threading
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.core.circuit_breaker import STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN, CircuitBreaker
+
+BROKEN = "ERROR: [TikTok] {}: Unable to extract universal data for rehydration; please report this issue"
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _failure(video_id):
+    return {"success": False, "error": BROKEN.format(video_id), "error_class": "extractor"}
+
+
+def test_breaker_trips_on_identical_extractor_errors_and_probes_back():
+    clock = _Clock()
+    trips = []
+    breaker = CircuitBreaker(threshold=3, probe_interval=30, on_trip=trips.append, clock=clock)
+
+    breaker.record(_failure(7300000000000000001))
+    breaker.record({"success": False, "error": "HTTP Error 404: Not Found"})  # does not break the streak
+    breaker.record(_failure(7300000000000000002))
+    assert breaker.state == STATE_CLOSED
+    assert breaker.record(_failure(7300000000000000003))
+    assert breaker.state == STATE_OPEN and len(trips) == 1
+    assert not breaker.allow()
+
+    clock.now += 30
+    assert breaker.allow() and breaker.state == STATE_HALF_OPEN
+    assert not breaker.allow()  # only one probe at a time
+    breaker.record(_failure(7300000000000000004))
+    assert breaker.state == STATE_OPEN and len(trips) == 1
+
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record({"success": True})
+    assert breaker.state == STATE_CLOSED and breaker.allow()
+
+
+def test_different_extractor_errors_restart_the_streak():
+    breaker = CircuitBreaker(threshold=2)
+    breaker.record(_failure(1))
+    breaker.record({"success": False, "error": "Unsupported URL: https://example.com", "error_class": "extractor"})
+    assert breaker.state == STATE_CLOSED
+    assert breaker.wait_until_allowed(stop_check=lambda: True)
+
+
+def test_only_the_probe_thread_can_release_the_probe():
+    clock = _Clock()
+    breaker = CircuitBreaker(threshold=1, probe_interval=30, clock=clock)
+    breaker.record(_failure(1))
+    clock.now += 30
+    assert breaker.allow() and breaker.state == STATE_HALF_OPEN
+
+    other = threading.Thread(target=breaker.release_probe)
+    other.start()
+    other.join()
+    assert breaker.state == STATE_HALF_OPEN
+
+    breaker.release_probe()
+    # Back to open with the next probe due at once
+    assert breaker.state == STATE_OPEN
+    assert breaker.allow() and breaker.state == STATE_HALF_OPEN
@@ -0,0 +1,67 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.core.concurrency import AdaptiveConcurrency, is_congestion_error
+from src.core.scheduler import DownloadScheduler
+
+
+class _Config:
+    def __init__(self, **settings):
+        self.settings = settings
+
+    def get_setting(self, key, default=None):
+        return self.settings.get(key, default)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_limit_grows_per_healthy_round_and_halves_on_throttling():
+    clock = _Clock()
+    controller = AdaptiveConcurrency(_Config(concurrency_min=1, concurrency_max=4), initial=2, clock=clock)
+
+    for _ in range(2):
+        controller.observe(1.0)
+    assert controller.limit == 3
+    for _ in range(3):
+        controller.observe(1.0)
+    assert controller.limit == 4
+    for _ in range(4):
+        controller.observe(1.0)
+    assert controller.limit == 4  # capped by concurrency_max
+
+    controller.observe(0.5, "HTTP Error 429: Too Many Requests")
+    assert controller.limit == 2
+    # Throttling from items already in flight does not count twice
+    controller.observe(0.5, "HTTP Error 429: Too Many Requests")
+    assert controller.limit == 2
+    clock.now += 10
+    controller.observe(0.5, "Read timed out")
+    assert controller.limit == 1
+
+
+def test_slow_round_holds_the_limit():
+    controller = AdaptiveConcurrency(_Config(), initial=1)
+    controller.observe(1.0)
+    assert controller.limit == 2
+    controller.observe(3.0)
+    controller.observe(3.0)
+    assert controller.limit == 2
+
+
+def test_scheduler_follows_controller_only_when_enabled():
+    config = _Config(adaptive_concurrency=False, max_concurrent_downloads=2)
+    scheduler = DownloadScheduler(config, controller=AdaptiveConcurrency(config, initial=5))
+    assert scheduler.capacity() == 2
+    config.settings["adaptive_concurrency"] = True
+    assert scheduler.capacity() == 5
+    assert is_congestion_error("Connection timed out") and not is_congestion_error("Video unavailable")
@@ -0,0 +1,40 @@
+import json
+import sys
+import threading
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.utils.config_manager import ConfigManager
+
+
+def test_concurrent_history_appends_are_not_lost(tmp_path):
+    config = ConfigManager()
+    config.history_file = tmp_path / "history.json"
+    config.get_setting = lambda key, default=None: True if key == "save_history" else default
+
+    def worker(number):
+        for item in range(10):
+            config.add_to_history({"title": f"{number}-{item}", "url": "", "type": "video", "path": ""})
+
+    threads = [threading.Thread(target=worker, args=(number,)) for number in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    history = json.loads(config.history_file.read_text(encoding="utf-8"))
+    assert len(history) == 50
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_unreadable_history_is_not_overwritten(tmp_path):
+    config = ConfigManager()
+    config.history_file = tmp_path / "history.json"
+    config.history_file.write_text("[{\"title\": ", encoding="utf-8")
+
+    config.update_history(lambda history: history.append({"title": "new"}) or True)
+
+    assert config.history_file.read_text(encoding="utf-8") == "[{\"title\": "
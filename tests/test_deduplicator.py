@@ -0,0 +1,38 @@
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.core.deduplicator import Deduplicator
+
+
+def test_dedupe_hardlinks_identical_files_and_reports_reclaimed_bytes(tmp_path):
+    payload = os.urandom(200_000)
+    original = tmp_path / "clip.mp4"
+    original.write_bytes(payload)
+    profile_dir = tmp_path / "@sample_user"
+    profile_dir.mkdir()
+    copy = profile_dir / "clip.mp4"
+    copy.write_bytes(payload)
+    same_size_different = profile_dir / "other.mp4"
+    same_size_different.write_bytes(payload[:-1] + b"x")
+
+    deduplicator = Deduplicator(config=object())
+
+    preview = deduplicator.dedupe(tmp_path, dry_run=True)
+    assert preview.bytes_reclaimed == len(payload)
+    assert original.stat().st_ino != copy.stat().st_ino
+
+    result = deduplicator.dedupe(tmp_path)
+
+    assert result.duplicate_groups == 1
+    assert result.files_linked == 1
+    assert result.bytes_reclaimed == len(payload)
+    assert original.stat().st_ino == copy.stat().st_ino
+    assert copy.read_bytes() == payload
+    assert same_size_different.stat().st_ino != original.stat().st_ino
+
+    assert deduplicator.dedupe(tmp_path).files_linked == 0
@@ -0,0 +1,67 @@
+import errno
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.core.failures import (
+    ERROR_DISK_FULL,
+    ERROR_EXTRACTOR,
+    ERROR_LOCAL,
+    ERROR_POSTPROCESS,
+    ERROR_REMOVED,
+    ERROR_THROTTLED,
+    ERROR_TRANSIENT,
+    ERROR_UNAVAILABLE,
+    FailureStore,
+    classify_error,
+    retry_delay,
+)
+
+URL = "https://www.tiktok.com/@someone/video/7300000000000000001"
+
+
+def test_classify_error_recognises_common_failures():
+    assert classify_error("ERROR: Unable to download webpage: HTTP Error 429: Too Many Requests") == ERROR_THROTTLED
+    assert classify_error("ERROR: Unable to download webpage: <urlopen error timed out>") == ERROR_TRANSIENT
+    assert classify_error("HTTP Error 404: Not Found") == ERROR_REMOVED
+    assert classify_error("This video is private") == ERROR_UNAVAILABLE
+    assert classify_error("Unable to extract universal data for rehydration") == ERROR_EXTRACTOR
+    assert classify_error(OSError(errno.ENOSPC, "No space left on device")) == ERROR_DISK_FULL
+    # Local and post-processing problems never mark the video itself as gone
+    assert classify_error("ERROR: Postprocessing: ffprobe and ffmpeg not found") == ERROR_POSTPROCESS
+    assert classify_error(PermissionError(errno.EACCES, "Permission denied")) == ERROR_LOCAL
+    # An expired signed CDN URL is worth another extraction
+    assert classify_error("ERROR: unable to download video data: HTTP Error 403: Forbidden") == ERROR_TRANSIENT
+    assert classify_error("ERROR: [TikTok] 123: Video not available, status code 10204") == ERROR_REMOVED
+
+
+def test_retry_delay_grows_with_jitter_and_cap():
+    assert retry_delay(1, base=2, rand=lambda: 0.0) == 1.0
+    assert retry_delay(3, base=2, rand=lambda: 1.0) == 8.0
+    assert retry_delay(10, base=2, cap=30, rand=lambda: 1.0) == 30.0
+
+
+def test_failure_store_keeps_only_permanent_failures(tmp_path):
+    store = FailureStore(tmp_path / "failed.json")
+    assert not store.record(URL, ERROR_TRANSIENT, "timed out")
+    assert store.record(URL, ERROR_REMOVED, "HTTP Error 404")
+
+    reloaded = FailureStore(tmp_path / "failed.json")
+    assert reloaded.get(URL)["error_class"] == ERROR_REMOVED
+    reloaded.forget(URL)
+    assert FailureStore(tmp_path / "failed.json").get(URL) is None
+
+
+def test_failure_store_drops_entries_that_are_no_longer_permanent(tmp_path):
+    import json
+
+    store_file = tmp_path / "failed.json"
+    store_file.write_text(json.dumps({"version": 1, "entries": {
+        "1": {"url": URL, "error_class": ERROR_REMOVED, "error": "ffprobe and ffmpeg not found"},
+        "2": {"url": URL, "error_class": ERROR_REMOVED, "error": "HTTP Error 404: Not Found"},
+    }}))
+
+    assert list(FailureStore(store_file).entries) == ["2"]
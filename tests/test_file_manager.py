@@ -0,0 +1,117 @@
+import errno
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.utils.file_manager import FileManager
+
+
+def test_relocate_file_copies_across_devices_and_removes_source(tmp_path, monkeypatch):
+    source = tmp_path / "staging" / "clip.mp4"
+    source.parent.mkdir()
+    payload = os.urandom(3 * 1024 * 1024 + 17)
+    source.write_bytes(payload)
+    os.utime(source, (1_600_000_000, 1_600_000_000))
+    destination = tmp_path / "library" / "clip.mp4"
+    destination.parent.mkdir()
+
+    real_replace = os.replace
+
+    def cross_device_replace(src, dst):
+        if not str(src).endswith(".relocating"):
+            raise OSError(errno.EXDEV, "Invalid cross-device link")
+        return real_replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", cross_device_replace)
+
+    result = FileManager.relocate_file(source, destination)
+
+    assert result == destination
+    assert destination.read_bytes() == payload
+    assert int(destination.stat().st_mtime) == 1_600_000_000
+    assert not source.exists()
+    assert list(destination.parent.iterdir()) == [destination]
+
+
+def test_relocate_file_falls_back_to_a_buffered_copy_off_linux(tmp_path, monkeypatch):
+    source = tmp_path / "clip.mp4"
+    payload = os.urandom(256 * 1024)
+    source.write_bytes(payload)
+    destination = tmp_path / "library.mp4"
+
+    def sendfile(*args):
+        raise OSError(errno.ENOTSOCK, "Socket operation on non-socket")
+
+    # macOS: no copy_file_range, and sendfile only writes to sockets
+    monkeypatch.setattr(sys, "platform", "darwin")
+    monkeypatch.delattr(os, "copy_file_range", raising=False)
+    monkeypatch.setattr(os, "sendfile", sendfile, raising=False)
+
+    FileManager._copy_file_contents(source, destination)
+
+    assert destination.read_bytes() == payload
+
+
+def test_reserve_unique_filename_hands_out_distinct_names_concurrently(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    (tmp_path / "#fyp.mp4").write_bytes(b"existing")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        names = list(pool.map(lambda _: FileManager.reserve_unique_filename(tmp_path, "#fyp.mp4"), range(20)))
+
+    assert len(set(names)) == 20
+    assert "#fyp.mp4" not in names
+    assert all((tmp_path / name).exists() for name in names)
+
+    FileManager.release_filename(tmp_path, names[0])
+    assert not (tmp_path / names[0]).exists()
+
+
+def test_reserve_unique_filename_follows_the_filesystem(tmp_path, monkeypatch):
+    (tmp_path / "clip.mp4").write_bytes(b"existing")
+    for number in range(1, 38):
+        (tmp_path / f"clip_{number}.mp4").write_bytes(b"copy")
+
+    lookups = []
+    real_lexists = os.path.lexists
+    monkeypatch.setattr(os.path, "lexists", lambda path: lookups.append(path) or real_lexists(path))
+
+    assert FileManager.reserve_unique_filename(tmp_path, "clip.mp4") == "clip_38.mp4"
+    # Doubling to 64, then bisecting back to 38, instead of one lookup per copy
+    assert len(lookups) <= 14
+
+    # A name freed on disk is handed out again straight away
+    (tmp_path / "clip.mp4").unlink()
+    assert FileManager.reserve_unique_filename(tmp_path, "clip.mp4") == "clip.mp4"
+
+    # Released placeholders free their name; moved-in files are kept
+    (tmp_path / "clip_38.mp4").write_bytes(b"video")
+    FileManager.release_filename(tmp_path, "clip_38.mp4")
+    assert (tmp_path / "clip_38.mp4").read_bytes() == b"video"
+
+
+def test_release_filename_only_removes_our_own_placeholder(tmp_path):
+    # An empty download moved over the placeholder is real data
+    name = FileManager.reserve_unique_filename(tmp_path, "empty.mp4")
+    staged = tmp_path / "staged.mp4"
+    staged.write_bytes(b"")
+    FileManager.relocate_file(staged, tmp_path / name)
+    FileManager.release_filename(tmp_path, name)
+    assert (tmp_path / name).exists()
+
+    # So is an empty file that someone else put under a released name
+    name = FileManager.reserve_unique_filename(tmp_path, "other.mp4")
+    (tmp_path / name).unlink()
+    (tmp_path / name).write_bytes(b"")
+    FileManager.release_filename(tmp_path, name)
+    assert (tmp_path / name).exists()
+
+    # And a name that was never reserved here
+    (tmp_path / "theirs.mp4").write_bytes(b"")
+    FileManager.release_filename(tmp_path, "theirs.mp4")
+    assert (tmp_path / "theirs.mp4").exists()
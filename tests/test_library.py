@@ -0,0 +1,86 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.core.library import LibraryScanner, extract_video_id, extract_video_id_from_url
+
+
+def test_extract_video_id_from_templated_names_and_urls():
+    assert extract_video_id("20240102_7312345678901234567_My clip 🎉.mp4") == "7312345678901234567"
+    assert extract_video_id("20240102_My clip.mp4") is None
+    assert (
+        extract_video_id_from_url("https://www.tiktok.com/@sample_user/video/7312345678901234567?lang=en")
+        == "7312345678901234567"
+    )
+
+
+def test_scan_maps_ids_to_media_files_in_profile_folders(tmp_path):
+    profile_dir = tmp_path / "@sample_user"
+    profile_dir.mkdir()
+    video = profile_dir / "20240102_7312345678901234567_clip.mp4"
+    video.write_bytes(b"video")
+    (profile_dir / "20240102_7312345678901234568_notes.txt").write_text("not media")
+    (tmp_path / "legacy title.mp4").write_bytes(b"legacy")
+
+    library = LibraryScanner(config=object()).scan(tmp_path)
+
+    assert library == {"7312345678901234567": video}
+
+
+class _HistoryConfig:
+    def __init__(self, history):
+        self.history = history
+
+    def get_setting(self, key, default=None):
+        return default
+
+    def get_history(self):
+        return self.history
+
+    def save_history(self, history):
+        self.history = history
+
+    def update_history(self, update):
+        if update(self.history):
+            self.save_history(self.history)
+
+
+def test_rescan_skips_unchanged_directories_and_relinks_history(tmp_path):
+    import json
+
+    from src.core.library import LibraryIndex
+
+    library_root = tmp_path / "downloads"
+    profile_dir = library_root / "@sample_user"
+    profile_dir.mkdir(parents=True)
+    moved = profile_dir / "20240102_7312345678901234567_clip.mp4"
+    moved.write_bytes(b"video")
+    (profile_dir / "renamed by hand.mp4").write_bytes(b"other")
+    (profile_dir / "renamed by hand.info.json").write_text(json.dumps({"id": "7312345678901234999"}))
+
+    config = _HistoryConfig([
+        {"url": "https://www.tiktok.com/@sample_user/video/7312345678901234567", "path": str(library_root / "old.mp4")},
+        {"url": "https://www.tiktok.com/@sample_user/video/7000000000000000001", "path": str(library_root / "gone.mp4")},
+    ])
+    scanner = LibraryScanner(config)
+    index = LibraryIndex(tmp_path / "index.json")
+
+    first = scanner.rescan(library_root, index=index, workers=4)
+
+    assert first.directories_scanned == 2
+    assert first.added == 2
+    assert first.history_relinked == 1
+    assert first.history_missing == 1
+    assert config.history[0]["path"] == str(moved)
+    assert config.history[1]["missing"] is True
+    assert index.videos()["7312345678901234999"] == profile_dir / "renamed by hand.mp4"
+
+    moved.unlink()
+    second = scanner.rescan(library_root, index=LibraryIndex(tmp_path / "index.json"), workers=4)
+
+    assert second.directories_skipped == 1
+    assert second.directories_scanned == 1
+    assert second.removed == 1
@@ -0,0 +1,129 @@
+import contextvars
+import json
+import logging
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.utils import logger as logger_module
+from src.utils.logger import (
+    ROOT_LOGGER_NAME,
+    CorrelationFilter,
+    JsonLinesFormatter,
+    current_run_id,
+    get_logger,
+    run_context,
+    setup_logger,
+    shutdown_logger,
+)
+
+
+@pytest.fixture
+def log_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(logger_module, "LOG_FILE", tmp_path / "app.log")
+    monkeypatch.setattr(logger_module, "DATA_DIR", tmp_path)
+    yield tmp_path / "app.log"
+    shutdown_logger()
+    app_logger = logging.getLogger(ROOT_LOGGER_NAME)
+    app_logger.handlers.clear()
+    app_logger.setLevel(logging.NOTSET)
+
+
+def _record(message, *args, exc_info=None):
+    return logging.LogRecord("TikTokDownloader.BatchRunner", logging.ERROR, __file__, 1, message, args, exc_info)
+
+
+def test_json_lines_formatter_writes_one_object_with_run_id_and_traceback():
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = _record("failed %s after %d tries", "vidéo", 3, exc_info=sys.exc_info())
+    record.run_id = "abc12345"
+
+    line = JsonLinesFormatter().format(record)
+
+    assert "\n" not in line
+    entry = json.loads(line)
+    assert entry["level"] == "ERROR"
+    assert entry["logger"] == "TikTokDownloader.BatchRunner"
+    assert entry["run_id"] == "abc12345"
+    assert entry["message"] == "failed vidéo after 3 tries"
+    assert entry["exc"].startswith("Traceback") and "ValueError: boom" in entry["exc"]
+    # Records that never passed the filter still format
+    assert json.loads(JsonLinesFormatter().format(_record("plain")))["run_id"] == "-"
+
+
+def test_run_context_ids_nest_and_follow_copied_contexts():
+    stamp = CorrelationFilter()
+    seen = []
+
+    def worker():
+        record = _record("from worker")
+        stamp.filter(record)
+        seen.append(record.run_id)
+
+    assert current_run_id() == "-"
+    with run_context() as run_id:
+        assert len(run_id) == 8
+        with run_context() as nested:
+            assert nested == run_id
+        with run_context("profile1") as explicit:
+            assert current_run_id() == explicit == "profile1"
+        thread = threading.Thread(target=contextvars.copy_context().run, args=(worker,))
+        thread.start()
+        thread.join()
+        # A thread started without the run's context is not part of the run
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+    assert current_run_id() == "-"
+    assert seen == [run_id, "-"]
+
+
+def test_listener_writes_json_lines_rotates_and_flushes_on_shutdown(log_file):
+    setup_logger(json_format=True, max_bytes=2000, backup_count=2)
+    [file_handler, _console] = logger_module._listener.handlers
+    assert (file_handler.maxBytes, file_handler.backupCount) == (2000, 2)
+
+    component = get_logger("BatchRunner")
+    with run_context("run00001"):
+        for number in range(60):
+            component.info("finished item %d of 60", number)
+    shutdown_logger()
+    shutdown_logger()  # a second call is harmless
+    file_handler.close()
+
+    assert logger_module._listener is None
+    assert sorted(path.name for path in log_file.parent.iterdir()) == ["app.log", "app.log.1", "app.log.2"]
+    entries = [
+        json.loads(line)
+        for name in ("app.log.2", "app.log.1", "app.log")
+        for line in (log_file.parent / name).read_text(encoding="utf-8").splitlines()
+    ]
+    # Every record queued before shutdown reached the file; the oldest rotated away
+    assert entries[-1]["message"] == "finished item 59 of 60"
+    assert {entry["logger"] for entry in entries} == {"TikTokDownloader.BatchRunner"}
+    assert {entry["run_id"] for entry in entries} == {"run00001"}
+    assert all(path.stat().st_size <= 2000 for path in log_file.parent.iterdir())
+
+
+def test_component_loggers_follow_the_configured_level(log_file):
+    setup_logger(level=logging.WARNING)
+    component = get_logger("ProfileScraper")
+
+    assert component.name == "TikTokDownloader.ProfileScraper"
+    assert get_logger(component.name) is component
+    assert component.level == logging.NOTSET
+    component.info("not written")
+    component.warning("written")
+    shutdown_logger()
+
+    lines = log_file.read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 1
+    assert " - TikTokDownloader.ProfileScraper - WARNING - [-] - written" in lines[0]
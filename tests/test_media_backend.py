@@ -0,0 +1,65 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.core.downloader import TikTokDownloader
+from src.core.media_backend import MediaBackend, create_backend, resolve_backend
+
+
+class _Config:
+    def __init__(self, **settings):
+        self.settings = settings
+
+    def get_setting(self, key, default=None):
+        return self.settings.get(key, default)
+
+
+class _FakeBackend:
+    name = "fake"
+
+    def __init__(self):
+        self.calls = []
+
+    def enumerate_profile(self, profile_url):
+        return {"title": "bench", "entries": []}
+
+    def extract(self, url, options):
+        self.calls.append("extract")
+        return {"id": "7312345678901234567", "title": "clip", "uploader_id": "sample_user"}
+
+    def fetch(self, info, options):
+        self.calls.append("fetch")
+        path = Path(options["outtmpl"].replace("%(ext)s", "mp4").replace("%(id)s", info["id"]))
+        path.write_bytes(b"video")
+        return info, path
+
+    def postprocess(self, info, path, options):
+        self.calls.append("postprocess")
+        return path
+
+
+def test_resolve_backend_uses_setting_and_falls_back_on_unknown_names():
+    assert resolve_backend(config=_Config(media_backend="yt-dlp")).name == "yt-dlp"
+    assert resolve_backend(config=_Config(media_backend="missing")).name == "yt-dlp"
+    with pytest.raises(ValueError):
+        create_backend("missing")
+
+
+def test_downloader_runs_every_stage_through_the_backend(tmp_path):
+    backend = _FakeBackend()
+    assert isinstance(backend, MediaBackend)
+    downloader = TikTokDownloader(backend=backend)
+    downloader.config = _Config(filename_template="%(id)s.%(ext)s")
+
+    result = downloader.download_video(
+        "https://www.tiktok.com/@sample_user/video/7312345678901234567", output_path=str(tmp_path)
+    )
+
+    assert result["success"], result
+    assert backend.calls == ["extract", "fetch", "postprocess"]
+    assert Path(result["path"]) == tmp_path / "@sample_user" / "7312345678901234567.mp4"
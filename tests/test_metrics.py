@@ -0,0 +1,84 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from config import DEFAULT_SETTINGS
+from src.utils import metrics
+from src.utils.metrics import MetricsExporter, MetricsRegistry, metrics_export_session
+
+
+class _Config:
+    def __init__(self, **settings):
+        self.settings = settings
+
+    def get_setting(self, key, default=None):
+        return self.settings.get(key, default)
+
+
+STAGES = {"transfer": {"count": 4, "total": 2.5, "mean": 0.625, "p50": 0.5, "p95": 1.0, "p99": 1.25, "max": 1.25}}
+
+
+def test_prometheus_text_has_help_type_labels_and_stage_summary(monkeypatch):
+    monkeypatch.setattr(metrics, "get_stage_stats", lambda: STAGES)
+    registry = MetricsRegistry()
+    registry.inc("downloads_failed_total", error_class="network")
+    registry.inc("downloads_failed_total", 2, error_class='say "hi"\\now\n')
+    registry.set("rate_limit_bytes_per_second", 1024.5)
+    registry.inc("custom_thing")
+
+    lines = registry.to_prometheus().splitlines()
+
+    name = "tiktok_downloader_downloads_failed_total"
+    assert lines[lines.index(f"# TYPE {name} counter") - 1] == f"# HELP {name} Downloads that failed, by error class."
+    assert f'{name}{{error_class="network"}} 1' in lines
+    assert f'{name}{{error_class="say \\"hi\\"\\\\now\\n"}} 2' in lines
+    assert "tiktok_downloader_rate_limit_bytes_per_second 1024.5" in lines
+    # Metrics without a definition are still exported, as untyped
+    assert "# TYPE tiktok_downloader_custom_thing untyped" in lines
+
+    stage = "tiktok_downloader_stage_duration_seconds"
+    assert f"# TYPE {stage} summary" in lines
+    assert f'{stage}{{quantile="0.95",stage="transfer"}} 1.0' in lines
+    assert f'{stage}_sum{{stage="transfer"}} 2.5' in lines
+    assert f'{stage}_count{{stage="transfer"}} 4' in lines
+    # Every HELP is directly followed by its TYPE
+    for index, line in enumerate(lines):
+        if line.startswith("# HELP "):
+            assert lines[index + 1].startswith("# TYPE " + line.split()[2] + " ")
+
+
+def test_exporter_writes_json_snapshot_and_textfile_without_leftovers(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, "get_stage_stats", lambda: STAGES)
+    registry = MetricsRegistry()
+    registry.inc("prefetch_total", 3, result="hit")
+    exporter = MetricsExporter(registry, tmp_path / "out.prom", tmp_path / "out.json")
+
+    exporter.write()
+    registry.inc("prefetch_total", result="hit")
+    exporter.write()
+
+    snapshot = json.loads((tmp_path / "out.json").read_text(encoding="utf-8"))
+    assert snapshot["metrics"] == {"prefetch_total": [{"labels": {"result": "hit"}, "value": 4}]}
+    assert snapshot["stages"] == STAGES
+    assert 'tiktok_downloader_prefetch_total{result="hit"} 4' in (tmp_path / "out.prom").read_text(encoding="utf-8")
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["out.json", "out.prom"]
+    # Readable by node_exporter running as another user
+    if os.name == "posix":
+        assert (tmp_path / "out.prom").stat().st_mode & 0o777 == 0o666 & ~metrics._UMASK
+
+
+def test_export_is_opt_in(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_DIR", tmp_path)
+
+    with metrics_export_session(_Config(**DEFAULT_SETTINGS)):
+        pass
+    assert list(tmp_path.iterdir()) == []
+
+    with metrics_export_session(_Config(**dict(DEFAULT_SETTINGS, metrics_export=True))):
+        pass
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["metrics.json", "tiktok_downloader.prom"]
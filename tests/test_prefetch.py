@@ -0,0 +1,52 @@
+import sys
+import threading
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.core.batch_runner import FairQueue
+from src.core.prefetch import MetadataPrefetcher
+
+
+def test_prefetch_window_bounds_outstanding_results():
+    started = []
+    release = threading.Event()
+
+    def extract(url):
+        started.append(url)
+        release.wait(5)
+        if url == "bad":
+            raise RuntimeError("extractor failed")
+        return {"url": url}
+
+    with MetadataPrefetcher(extract, window=2, workers=2) as prefetcher:
+        prefetcher.schedule(["a", "bad", "c"])
+        release.set()
+        assert prefetcher.take("a") == {"url": "a"}
+        assert prefetcher.take("bad") is None
+        # "c" did not fit in the window, so it was never extracted
+        assert prefetcher.take("c") is None
+        assert "c" not in started
+
+
+def test_fair_queue_peek_interleaves_flows():
+    queue = FairQueue()
+    for index in range(3):
+        queue.put("profile:1", f"p{index}")
+    queue.put("links", "l0")
+    assert queue.peek(3) == ["p0", "l0", "p1"]
+    assert queue.get() == "p0"
+
+
+def test_discard_frees_the_window_slot():
+    with MetadataPrefetcher(lambda url: {"url": url}, window=1, workers=1) as prefetcher:
+        prefetcher.schedule(["skipped"])
+        prefetcher.schedule(["next"])
+        assert prefetcher.take("next") is None
+
+        prefetcher.discard("skipped")
+        prefetcher.discard("never scheduled")
+        prefetcher.schedule(["next"])
+        assert prefetcher.take("next") == {"url": "next"}
@@ -0,0 +1,88 @@
+import contextvars
+import pstats
+import sys
+import threading
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.utils import profiling
+from src.utils.profiling import profile_session, profile_thread
+
+
+class _Config:
+    def __init__(self, **settings):
+        self.settings = settings
+
+    def get_setting(self, key, default=None):
+        return self.settings.get(key, default)
+
+
+def _work_on_worker_thread():
+    return sum(range(10000))
+
+
+_kept = []
+
+
+def _allocate_on_main_thread():
+    _kept.append([str(number) for number in range(5000)])
+
+
+def test_worker_threads_are_merged_into_the_run_profile(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILES_DIR", tmp_path)
+    config = _Config(profile_runs=True, profile_snapshot_every=0)
+
+    def worker():
+        with profile_thread():
+            _work_on_worker_thread()
+
+    with profile_session(config, "batch"):
+        # Workers carry the run's context, as BatchRunner starts them
+        thread = threading.Thread(target=contextvars.copy_context().run, args=(worker,))
+        thread.start()
+        thread.join()
+
+    stats_file = next(tmp_path.glob("batch_*.pstats"))
+    functions = {name for _file, _line, name in pstats.Stats(str(stats_file)).stats}
+    assert "_work_on_worker_thread" in functions
+
+
+def test_run_writes_pstats_and_memory_growth_report(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILES_DIR", tmp_path)
+    was_tracing = tracemalloc.is_tracing()
+
+    with profile_session(_Config(profile_runs=True, profile_snapshot_every=2), "profile @someone") as profiler:
+        for _ in range(4):
+            _allocate_on_main_thread()
+            profiler.tick()
+    _kept.clear()
+
+    assert tracemalloc.is_tracing() == was_tracing
+    [stats_file] = list(tmp_path.glob("profile_someone_*.pstats"))
+    functions = {name for _file, _line, name in pstats.Stats(str(stats_file)).stats}
+    assert "_allocate_on_main_thread" in functions
+
+    memory_file = stats_file.with_name(stats_file.stem + "_memory.txt")
+    report = memory_file.read_text(encoding="utf-8").splitlines()
+    assert report[0] == "Memory profile for profile @someone (4 items)"
+    assert [line.split()[0] for line in report[2:6]] == ["start", "item", "item", "end"]
+    assert report[3].startswith("item 2") and report[4].startswith("item 4")
+    growth = report[report.index("Top 15 allocation sites by growth:") + 1:]
+    # The list comprehension that kept its strings is the top allocation site
+    assert "test_profiling.py" in growth[0] and "KiB (+" in growth[0]
+
+
+def test_nothing_is_written_when_profiling_is_off(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILES_DIR", tmp_path)
+    monkeypatch.delenv(profiling.PROFILE_ENV_VAR, raising=False)
+
+    with profile_session(_Config(profile_runs=False), "batch") as profiler:
+        profiler.tick()
+        with profile_thread():
+            _work_on_worker_thread()
+
+    assert list(tmp_path.iterdir()) == []
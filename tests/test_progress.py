@@ -0,0 +1,32 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.core.progress import ProgressTracker, STAGE_DOWNLOADING, STAGE_EXTRACTING, STAGE_FINISHED
+
+
+def test_tracker_rate_limits_byte_updates_but_always_reports_stages():
+    events = []
+    tracker = ProgressTracker(events.append, "task-1", min_interval=60)
+
+    tracker.stage(STAGE_EXTRACTING)
+    for done in range(0, 1000, 100):
+        tracker.hook({"status": "downloading", "downloaded_bytes": done, "total_bytes": 1000})
+    tracker.hook({"status": "finished", "downloaded_bytes": 1000, "total_bytes": 1000, "filename": "clip.mp4"})
+    tracker.finish("clip.mp4")
+
+    assert [event.stage for event in events] == [STAGE_EXTRACTING, STAGE_DOWNLOADING, STAGE_FINISHED]
+    assert events[1].bytes_done == 1000
+    assert events[-1].fraction == 1.0
+    assert all(event.task_id == "task-1" for event in events)
+
+
+def test_tracker_swallows_listener_errors():
+    def broken(_event):
+        raise RuntimeError("listener failed")
+
+    tracker = ProgressTracker(broken, "task-2", min_interval=0)
+    tracker.hook({"status": "downloading", "downloaded_bytes": 10, "total_bytes": 100})
@@ -0,0 +1,88 @@
+import sys
+import threading
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.gui.progress_bus import ProgressBus
+
+
+class _Widget:
+    """Stands in for a Tk widget: after() callbacks run when fire() is called."""
+
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, delay, callback):
+        self.scheduled.append(callback)
+        return len(self.scheduled)
+
+    def after_cancel(self, after_id):
+        self.scheduled.clear()
+
+    def fire(self):
+        callbacks, self.scheduled = self.scheduled, []
+        for callback in callbacks:
+            callback()
+
+
+def test_updates_coalesce_per_key_and_events_keep_order():
+    bus = ProgressBus()
+    seen = []
+
+    def worker(task):
+        for percent in range(100):
+            bus.update(("task", task), seen.append, (task, percent))
+
+    threads = [threading.Thread(target=worker, args=(task,)) for task in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    bus.emit(seen.append, "done")
+
+    widget = _Widget()
+    bus.attach(widget, interval_ms=33)
+    widget.fire()
+
+    assert sorted(seen[:-1]) == [(task, 99) for task in range(4)]
+    assert seen[-1] == "done"
+    # The tick re-arms itself until detached
+    assert len(widget.scheduled) == 1
+    bus.detach()
+    assert widget.scheduled == []
+
+
+def test_log_lines_are_bounded_and_failing_calls_do_not_stop_the_tick():
+    bus = ProgressBus(max_events=3)
+    seen = []
+
+    def broken():
+        raise RuntimeError("widget destroyed")
+
+    bus.emit(broken)
+    for line in range(5):
+        bus.log(seen.append, line)
+    bus.run_pending()
+
+    assert seen == [2, 3, 4]
+    assert bus.dropped == 2
+
+
+def test_emitted_calls_survive_a_flood_of_log_lines():
+    bus = ProgressBus(max_events=10)
+    seen = []
+
+    bus.emit(seen.append, "inputs disabled")
+    for line in range(1000):
+        bus.log(seen.append, line)
+    bus.emit(seen.append, "complete")
+    for line in range(1000, 2000):
+        bus.log(seen.append, line)
+    bus.emit(seen.append, "inputs enabled")
+    bus.run_pending()
+
+    assert seen == ["inputs disabled", "complete", *range(1990, 2000), "inputs enabled"]
+    assert bus.dropped == 1990
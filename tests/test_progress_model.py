@@ -0,0 +1,51 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.core.app_models import DownloadProgress
+from src.core.progress import STAGE_DOWNLOADING, STAGE_ERROR, STAGE_FINISHED, STAGE_QUEUED
+from src.core.progress_model import ProgressModel
+from src.gui.download_manager import format_row
+
+
+def test_tasks_move_from_queued_to_finished_and_totals_follow():
+    model = ProgressModel()
+    changes = []
+    unsubscribe = model.subscribe(lambda: changes.append(model.version))
+    model.enqueue_many([(f"video-{number}", "") for number in range(10000)])
+
+    model.apply(DownloadProgress("video-1", STAGE_DOWNLOADING, 512, 2048, speed=100.0, smoothed_speed=256.0, eta=6))
+    model.apply(DownloadProgress("video-2", STAGE_DOWNLOADING, 0, None, smoothed_speed=1024.0))
+    model.finish("video-2", {"success": False, "error": "HTTP Error 404"})
+    model.finish("video-3", {"success": True, "title": "Clip"})
+
+    totals = model.totals()
+    assert totals == {"total": 10000, "active": 1, "queued": 9997, "finished": 1, "failed": 1, "speed": 256.0}
+    # A view reads just the rows it shows
+    rows = model.rows(1, 3)
+    assert [row.stage for row in rows] == [STAGE_DOWNLOADING, STAGE_ERROR, STAGE_FINISHED]
+    assert rows[2].title == "Clip"
+    assert format_row(rows[0])["bytes"] == "512.0 B / 2.0 KB"
+    assert format_row(rows[0])["eta"] == "0:06"
+    assert changes and changes[-1] == model.version
+
+    # A retry starts over as queued; stopping the run withdraws what is still queued
+    model.enqueue("video-2")
+    assert model.rows(2, 1)[0].stage == STAGE_QUEUED
+    model.withdraw([f"video-{number}" for number in range(10000)])
+    assert [row.task_id for row in model.rows(0, 10)] == ["video-1", "video-3"]
+    unsubscribe()
+
+
+def test_only_the_newest_finished_rows_are_kept():
+    model = ProgressModel(keep_finished=2)
+    for number in range(5):
+        model.finish(f"video-{number}", {"success": True})
+    model.enqueue("queued")
+
+    assert [row.task_id for row in model.rows(0, 10)] == ["video-3", "video-4", "queued"]
+    model.clear_finished()
+    assert [row.task_id for row in model.rows(0, 10)] == ["queued"]
@@ -0,0 +1,55 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.core.scheduler import PRIORITY_BACKGROUND, PRIORITY_BATCH, PRIORITY_INTERACTIVE, DownloadScheduler
+
+
+def test_waiting_interactive_download_takes_the_next_free_slot():
+    scheduler = DownloadScheduler(slots=1)
+    order = []
+
+    def worker(priority, label):
+        with scheduler.slot(priority):
+            order.append(label)
+
+    scheduler.acquire(PRIORITY_BATCH)  # a batch item is running
+    threads = []
+    for priority, label in ((PRIORITY_BACKGROUND, "sync"), (PRIORITY_BATCH, "batch"), (PRIORITY_INTERACTIVE, "single")):
+        thread = threading.Thread(target=worker, args=(priority, label))
+        thread.start()
+        threads.append(thread)
+        time.sleep(0.05)
+
+    scheduler.release()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert order == ["single", "batch", "sync"]
+    stats = scheduler.wait_stats()
+    assert stats["interactive"]["count"] == 1
+    assert stats["background"]["max"] >= stats["interactive"]["max"]
+
+
+def test_yielded_slot_lets_another_download_run():
+    scheduler = DownloadScheduler(slots=1)
+    scheduler.acquire(PRIORITY_BATCH)
+    ran = threading.Event()
+
+    def single():
+        with scheduler.slot(PRIORITY_INTERACTIVE):
+            ran.set()
+
+    # A paused transfer gives its slot away until it resumes
+    with scheduler.yielded(PRIORITY_BATCH):
+        thread = threading.Thread(target=single)
+        thread.start()
+        assert ran.wait(timeout=5)
+        thread.join(timeout=5)
+    assert scheduler._active == 1
+    scheduler.release()
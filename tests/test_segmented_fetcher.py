@@ -0,0 +1,36 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks.fake_server import FakeTikTokServer, ServerProfile
+from src.core.segmented_fetcher import SegmentedFetcher
+
+MEDIA_SIZE = 1024 * 1024 + 17
+
+
+def test_probe_reports_size_and_fetch_writes_every_range(tmp_path):
+    events = []
+    with FakeTikTokServer(ServerProfile(media_size=MEDIA_SIZE)) as server:
+        url = f"{server.base_url}/media/7312345678901234567.mp4"
+        fetcher = SegmentedFetcher(connections=4, chunk_size=64 * 1024)
+
+        assert fetcher.probe(url) == MEDIA_SIZE
+        path = fetcher.fetch(url, tmp_path / "clip.mp4", MEDIA_SIZE, progress_hook=events.append)
+
+        assert path.read_bytes() == server.fixtures.get(MEDIA_SIZE)
+    assert events[-1]["status"] == "finished"
+    assert events[-1]["downloaded_bytes"] == MEDIA_SIZE
+
+
+def test_failed_segments_are_retried_on_their_own(tmp_path):
+    with FakeTikTokServer(ServerProfile(media_size=MEDIA_SIZE, error_rate=0.3, seed=7)) as server:
+        url = f"{server.base_url}/media/7312345678901234567.mp4"
+        fetcher = SegmentedFetcher(connections=4, chunk_size=64 * 1024, max_retries=20, retry_delay=0)
+
+        path = fetcher.fetch(url, tmp_path / "clip.mp4", MEDIA_SIZE)
+
+        assert path.read_bytes() == server.fixtures.get(MEDIA_SIZE)
+        assert server.stats["errors"] > 0
@@ -0,0 +1,128 @@
+import contextvars
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.core.downloader import TikTokDownloader
+from src.utils.timing import PostprocessTimer, StageTimer, collect_stages, record_stage, stage_span
+
+
+class _Config:
+    def __init__(self, **settings):
+        self.settings = settings
+
+    def get_setting(self, key, default=None):
+        return self.settings.get(key, default)
+
+
+class _PostprocessingBackend:
+    """Backend whose fetch spends most of its time in a postprocessor"""
+
+    def __init__(self, postprocess_seconds):
+        self.postprocess_seconds = postprocess_seconds
+
+    def extract(self, url, options):
+        return {"id": "7300000000000000001", "title": "Clip"}
+
+    def fetch(self, info, options):
+        path = Path(options["outtmpl"].replace("%(ext)s", "mp4"))
+        path.write_bytes(b"video")
+        for hook in options["postprocessor_hooks"]:
+            hook({"status": "started", "postprocessor": "FFmpegMerger"})
+        time.sleep(self.postprocess_seconds)
+        for hook in options["postprocessor_hooks"]:
+            hook({"status": "finished", "postprocessor": "FFmpegMerger"})
+        return info, path
+
+    def postprocess(self, info, path, options):
+        return path
+
+
+def test_percentiles_use_nearest_rank_and_drop_old_samples():
+    timer = StageTimer(max_samples=100)
+    for millis in range(1, 201):
+        timer.record("transfer", millis / 1000)
+
+    stats = timer.stats()["transfer"]
+    # Count and total cover every sample; percentiles only the newest 100
+    assert stats["count"] == 200
+    assert abs(stats["total"] - 20.1) < 1e-9
+    assert (stats["p50"], stats["p95"], stats["p99"], stats["max"]) == (0.15, 0.195, 0.199, 0.2)
+
+    timer.record("extract", 0.5)
+    report = timer.format_report("Run")
+    lines = report.splitlines()
+    assert lines[0] == "Run:"
+    assert lines[1].split() == ["stage", "count", "p50", "p95", "p99", "total"]
+    # Stages are listed by total time, largest first
+    assert lines[2].split() == ["transfer", "200", "150ms", "195ms", "199ms", "20.10s"]
+    assert lines[3].split() == ["extract", "1", "500ms", "500ms", "500ms", "0.50s"]
+
+    timer.reset()
+    assert timer.format_report("Run") == "Run: no samples"
+
+
+def test_run_collectors_see_spans_from_threads_started_with_the_run_context():
+    def worker():
+        with stage_span("extract"):
+            pass
+        record_stage("transfer", 0.25)
+
+    with collect_stages() as outer:
+        with collect_stages() as inner:
+            threads = [
+                threading.Thread(target=contextvars.copy_context().run, args=(worker,))
+                for _ in range(3)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        record_stage("transfer", 1.0)
+        # A thread without the copied context does not report into the run
+        stray = threading.Thread(target=record_stage, args=("transfer", 9.0))
+        stray.start()
+        stray.join()
+
+    assert inner.stats()["extract"]["count"] == 3
+    assert inner.stats()["transfer"]["total"] == 0.75
+    assert outer.stats()["transfer"]["count"] == 4
+    assert outer.stats()["transfer"]["total"] == 1.75
+
+    # Outside the run nothing is collected any more
+    record_stage("transfer", 2.0)
+    assert outer.stats()["transfer"]["count"] == 4
+
+
+def test_postprocess_timer_pairs_started_and_finished_hooks():
+    timer = PostprocessTimer()
+    with collect_stages() as stages:
+        timer.hook({"status": "finished", "postprocessor": "FFmpegMerger"})
+        timer.hook({"status": "started", "postprocessor": "FFmpegMerger"})
+        time.sleep(0.02)
+        timer.hook({"status": "finished", "postprocessor": "FFmpegMerger"})
+
+    assert stages.stats()["postprocess"]["count"] == 1
+    assert timer.total == stages.stats()["postprocess"]["total"] >= 0.02
+
+
+def test_transfer_time_excludes_postprocessing(tmp_path):
+    downloader = TikTokDownloader(backend=_PostprocessingBackend(postprocess_seconds=0.3))
+    downloader.config = _Config(save_history=False, create_profile_folders=False)
+
+    with collect_stages() as stages:
+        result = downloader.download_video(
+            "https://www.tiktok.com/@someone/video/7300000000000000001",
+            output_path=str(tmp_path),
+            filename="clip",
+        )
+
+    assert result["success"], result
+    stats = stages.stats()
+    assert stats["postprocess"]["total"] >= 0.3
+    assert stats["transfer"]["total"] < 0.15
@@ -0,0 +1,79 @@
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.utils import tracing
+from src.utils.timing import stage_span
+from src.utils.tracing import TRACE_ENV_VAR, get_active_tracer, trace_session, trace_span
+
+
+class _Config:
+    def __init__(self, **settings):
+        self.settings = settings
+
+    def get_setting(self, key, default=None):
+        return self.settings.get(key, default)
+
+
+def _download(name):
+    with trace_span(name, url=f"https://example.com/{name}"):
+        with stage_span("extract"):
+            time.sleep(0.01)
+        with stage_span("transfer"):
+            time.sleep(0.02)
+
+
+def test_nested_spans_from_two_threads_are_written_as_chrome_trace(tmp_path, monkeypatch):
+    monkeypatch.setattr(tracing, "TRACES_DIR", tmp_path)
+    monkeypatch.delenv(TRACE_ENV_VAR, raising=False)
+
+    with trace_session(_Config(trace_runs=True), "batch run") as tracer:
+        assert get_active_tracer() is tracer
+        threads = [threading.Thread(target=_download, args=(f"video-{n}",), name=f"worker-{n}") for n in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert get_active_tracer() is None
+
+    [trace_file] = list(tmp_path.iterdir())
+    assert trace_file.name.startswith("batch_run_") and trace_file.suffix == ".json"
+    trace = json.loads(trace_file.read_text(encoding="utf-8"))
+    events = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+    thread_names = {
+        event["tid"]: event["args"]["name"] for event in trace["traceEvents"] if event["ph"] == "M"
+    }
+
+    assert all(event["ts"] >= 0 and event["dur"] > 0 for event in events)
+    assert [event["cat"] for event in events].count("run") == 1
+    for n in range(2):
+        [task] = [event for event in events if event["name"] == f"video-{n}"]
+        assert task["cat"] == "task"
+        assert task["args"] == {"url": f"https://example.com/video-{n}"}
+        assert thread_names[task["tid"]] == f"worker-{n}"
+        stages = [event for event in events if event["cat"] == "stage" and event["tid"] == task["tid"]]
+        assert [event["name"] for event in stages] == ["extract", "transfer"]
+        # Stages sit inside their task on the same thread
+        for stage in stages:
+            assert task["ts"] <= stage["ts"]
+            assert stage["ts"] + stage["dur"] <= task["ts"] + task["dur"]
+        assert stages[1]["dur"] >= 20_000  # microseconds
+    assert len({event["tid"] for event in events if event["cat"] == "task"}) == 2
+
+
+def test_nothing_is_recorded_or_written_when_tracing_is_off(tmp_path, monkeypatch):
+    monkeypatch.setattr(tracing, "TRACES_DIR", tmp_path)
+    monkeypatch.delenv(TRACE_ENV_VAR, raising=False)
+
+    with trace_session(_Config(trace_runs=False), "batch") as tracer:
+        assert tracer is None
+        _download("video")
+
+    assert get_active_tracer() is None
+    assert list(tmp_path.iterdir()) == []